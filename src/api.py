@@ -1,6 +1,7 @@
 from flask import Flask, request
 from flask_restx import Api, Resource, fields, reqparse
-from controllers.spend_controller import SpendController
+from controllers.spend_controller import SpendController, DEFAULT_PAGE_SIZE
+from models.columnar_ledger import AmbiguousIdError
 from datetime import datetime
 import traceback
 
@@ -49,7 +50,8 @@ expense_update_model = api.model('TransactionUpdate', {
 
 expense_list_model = api.model('TransactionCollection', {
     'expenses': fields.List(fields.Nested(expense_model)),
-    'count': fields.Integer(description='Total transaction count')
+    'count': fields.Integer(description='Total transaction count'),
+    'next_cursor': fields.String(description='Cursor for the next page (paginated requests only, null on the last page)')
 })
 
 message_model = api.model('OperationResponse', {
@@ -76,6 +78,8 @@ transaction_filter_parser.add_argument('category', type=str, help='Filter transa
 transaction_filter_parser.add_argument('date_from', type=str, help='Start date for filtering (YYYY-MM-DD)')
 transaction_filter_parser.add_argument('date_to', type=str, help='End date for filtering (YYYY-MM-DD)')
 transaction_filter_parser.add_argument('tag', type=str, help='Filter transactions by tag')
+transaction_filter_parser.add_argument('limit', type=int, help='Page size; enables pagination ordered by date, then ID')
+transaction_filter_parser.add_argument('cursor', type=str, help='next_cursor from the previous page')
 
 @ns_health.route('')
 class ServiceHealthCheck(Resource):
@@ -100,8 +104,22 @@ class TransactionCollection(Resource):
         start_date = filter_args['date_from']
         end_date = filter_args['date_to']
         tag_filter = filter_args['tag']
+        page_limit = filter_args['limit']
+        page_cursor = filter_args['cursor']
         
         try:
+            # Return a single keyset page when pagination is requested
+            if page_limit is not None or page_cursor:
+                transaction_list, next_cursor = spend_controller.page_expenses(
+                    page_limit if page_limit is not None else DEFAULT_PAGE_SIZE, page_cursor,
+                    category_filter, start_date, end_date
+                )
+                return {
+                    'expenses': [txn.to_dict() for txn in transaction_list],
+                    'count': len(transaction_list),
+                    'next_cursor': next_cursor
+                }
+            
             # Apply filters if any are specified
             if any([category_filter, start_date, end_date, tag_filter]):
                 transaction_list = spend_controller.filter_expenses(category_filter, start_date, end_date, tag_filter)
@@ -112,6 +130,8 @@ class TransactionCollection(Resource):
                 'expenses': [txn.to_dict() for txn in transaction_list],
                 'count': len(transaction_list)
             }
+        except ValueError as e:
+            api.abort(400, str(e))
         except Exception as e:
             api.abort(500, f'Server error occurred: {str(e)}')
 
@@ -156,6 +176,8 @@ class TransactionResource(Resource):
                 return transaction.to_dict()
             else:
                 api.abort(404, 'Transaction record not found')
+        except AmbiguousIdError as e:
+            api.abort(409, str(e))
         except Exception as e:
             api.abort(500, f'Retrieval failed: {str(e)}')
 
@@ -181,6 +203,8 @@ class TransactionResource(Resource):
                 return modified_transaction.to_dict()
             else:
                 api.abort(404, 'Transaction record not found')
+        except AmbiguousIdError as e:
+            api.abort(409, str(e))
         except ValueError as e:
             api.abort(400, 'Amount must be a valid numeric value')
         except Exception as e:
@@ -195,6 +219,8 @@ class TransactionResource(Resource):
                 return {'message': 'Transaction removed successfully'}
             else:
                 api.abort(404, 'Transaction record not found')
+        except AmbiguousIdError as e:
+            api.abort(409, str(e))
         except Exception as e:
             api.abort(500, f'Deletion failed: {str(e)}')
 
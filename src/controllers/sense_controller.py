@@ -1,15 +1,49 @@
 from models.budget_plan import BudgetPlan
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime
+import threading
 
 class SenseController:
     """
     Controller for managing budget awareness and financial planning.
     Tracks budgets by month and category, providing insights into spending patterns.
+    
+    The registry is keyed three ways: by (month, category), by ID and by month,
+    so lookups are constant time and month listings touch only that month.
+    When a budget store is supplied, the registry is loaded from it at start-up
+    and every change is written through to it.
     """
     
-    def __init__(self):
-        self._budget_registry: List[BudgetPlan] = []
+    def __init__(self, store=None):
+        """
+        Create a controller, optionally backed by durable budget storage.
+        
+        Args:
+            store: Budget store providing load_all/save/delete (in-memory only if not provided)
+        """
+        self._budget_registry: Dict[str, BudgetPlan] = {}
+        self._budgets_by_criteria: Dict[Tuple[str, Optional[str]], BudgetPlan] = {}
+        self._budgets_by_month: Dict[str, Dict[str, BudgetPlan]] = {}
+        self._store = store
+        self._version = 0
+        self._version_lock = threading.Lock()
+        
+        if store is not None:
+            for budget in store.load_all():
+                self._register_budget(budget)
+    
+    @property
+    def version(self) -> int:
+        """
+        Get the budget version, which increases by one after every budget change.
+        Readers can compare versions to tell whether anything changed since they last looked.
+        """
+        return self._version
+    
+    def _bump_version(self):
+        """Internal helper to record that the budgets changed."""
+        with self._version_lock:
+            self._version += 1
     
     def set_budget(self, amount: float, month: str, category: Optional[str] = None) -> BudgetPlan:
         """
@@ -27,12 +61,27 @@ class SenseController:
         
         if existing_budget:
             existing_budget.amount = amount
+            self._persist_budget(existing_budget)
+            self._bump_version()
             return existing_budget
         
         new_budget = BudgetPlan(amount, month, category)
-        self._budget_registry.append(new_budget)
+        self._persist_budget(new_budget)
+        self._register_budget(new_budget)
+        self._bump_version()
         return new_budget
     
+    def _persist_budget(self, budget: BudgetPlan):
+        """Internal helper to write a budget through to the store, if any."""
+        if self._store is not None:
+            self._store.save(budget)
+    
+    def _register_budget(self, budget: BudgetPlan):
+        """Internal helper to add a budget to every registry index."""
+        self._budget_registry[budget.id] = budget
+        self._budgets_by_criteria[(budget.month, budget.category)] = budget
+        self._budgets_by_month.setdefault(budget.month, {})[budget.id] = budget
+    
     def get_budget(self, month: str, category: Optional[str] = None) -> Optional[BudgetPlan]:
         """
         Retrieve a specific budget by month and optional category.
@@ -48,7 +97,7 @@ class SenseController:
     
     def get_all_budgets(self) -> List[BudgetPlan]:
         """Retrieve complete list of all registered budgets."""
-        return list(self._budget_registry)
+        return list(self._budget_registry.values())
     
     def get_budgets_by_month(self, month: str) -> List[BudgetPlan]:
         """
@@ -60,7 +109,7 @@ class SenseController:
         Returns:
             List of BudgetPlan instances for the specified month
         """
-        return [budget for budget in self._budget_registry if budget.month == month]
+        return list(self._budgets_by_month.get(month, {}).values())
     
     def delete_budget(self, budget_id: str) -> bool:
         """
@@ -72,25 +121,29 @@ class SenseController:
         Returns:
             True if budget was deleted, False if not found
         """
-        matching_budget = self._find_budget_by_id(budget_id)
-        if matching_budget:
-            self._budget_registry.remove(matching_budget)
-            return True
-        return False
+        matching_budget = self._budget_registry.get(budget_id)
+        if not matching_budget:
+            return False
+        
+        # Delete from the store first, so a failed delete leaves every index intact
+        if self._store is not None:
+            self._store.delete(budget_id)
+        del self._budget_registry[budget_id]
+        del self._budgets_by_criteria[(matching_budget.month, matching_budget.category)]
+        month_bucket = self._budgets_by_month[matching_budget.month]
+        del month_bucket[budget_id]
+        if not month_bucket:
+            del self._budgets_by_month[matching_budget.month]
+        self._bump_version()
+        return True
     
     def _find_budget_by_criteria(self, month: str, category: Optional[str] = None) -> Optional[BudgetPlan]:
         """Internal helper to locate budget by month and category."""
-        for budget in self._budget_registry:
-            if budget.month == month and budget.category == category:
-                return budget
-        return None
+        return self._budgets_by_criteria.get((month, category))
     
     def _find_budget_by_id(self, budget_id: str) -> Optional[BudgetPlan]:
         """Internal helper to locate budget by ID."""
-        for budget in self._budget_registry:
-            if budget.id == budget_id:
-                return budget
-        return None
+        return self._budget_registry.get(budget_id)
     
     def calculate_spending_vs_budget(self, expenses: List, month: str) -> Dict:
         """
@@ -107,12 +160,26 @@ class SenseController:
         # Extract expenses for target month
         filtered_expenses = [exp for exp in expenses if exp.date.startswith(month)]
         
-        # Aggregate spending totals
-        total_expenditure = sum(exp.amount for exp in filtered_expenses)
-        
         # Build category-wise spending map
         category_spending = self._aggregate_by_category(filtered_expenses)
         
+        return self.analyze_category_spending(category_spending, month)
+    
+    def analyze_category_spending(self, category_spending: Dict[str, float], month: str) -> Dict:
+        """
+        Analyze pre-aggregated category spending against budget allocations.
+        Lets callers that already keep running totals skip the per-expense scan.
+        
+        Args:
+            category_spending: Total spent per category within the month
+            month: Target month in YYYY-MM format
+            
+        Returns:
+            Dictionary containing detailed budget analysis metrics
+        """
+        # Aggregate spending totals
+        total_expenditure = sum(category_spending.values())
+        
         # Retrieve month's budget allocations
         monthly_budgets = self.get_budgets_by_month(month)
         
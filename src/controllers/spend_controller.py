@@ -1,8 +1,29 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Iterator, Callable, Set
+import calendar
+import codecs
 import csv
 import io
+import math
+import threading
+from collections import deque
 from datetime import datetime
 from models.transaction import Transaction
+from models.columnar_ledger import ColumnarLedger, AmbiguousIdError, parse_day
+from utils.cursors import encode_cursor, decode_cursor
+from utils.data_validator import validate_amount, validate_category, validate_date, validate_description
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Rows fetched per ledger page while streaming an export
+EXPORT_PAGE_SIZE = 1000
+# Rows validated and committed together while importing a CSV file
+IMPORT_CHUNK_SIZE = 5000
+# Rejected rows reported back from one import; the rest are only counted
+MAX_IMPORT_ERRORS = 1000
+# Months of spending history included in a dashboard snapshot
+DASHBOARD_HISTORY_MONTHS = 6
+# Most rows listed in one change event; larger batches only report their count
+MAX_EVENT_ROWS = 100
 
 class SpendController:
     """
@@ -10,8 +31,90 @@ class SpendController:
     Handles CRUD operations, filtering, and data export for spending analysis.
     """
     
-    def __init__(self):
-        self._expense_ledger: List[Transaction] = []
+    def __init__(self, ledger: Optional[ColumnarLedger] = None):
+        """
+        Create a controller backed by the given ledger storage.
+        
+        Args:
+            ledger: Storage engine for expense rows, such as ColumnarLedger or SQLiteLedger
+                (in-memory columnar ledger if not provided)
+        """
+        self._expense_ledger = ledger if ledger is not None else ColumnarLedger()
+        self._version = 0
+        # Held across each write and its version bump so snapshots never see a half-applied change
+        self._write_lock = threading.RLock()
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # Change events queued under the write lock and delivered in order once it is released
+        self._pending_events = deque()
+        self._notify_lock = threading.Lock()
+    
+    @property
+    def version(self) -> int:
+        """
+        Get the ledger version, which increases by one after every change made through this controller.
+        Readers can compare versions to tell whether anything changed since they last looked.
+        """
+        return self._version
+    
+    def _bump_version(self):
+        """Internal helper to record that the expenses changed."""
+        with self._write_lock:
+            self._version += 1
+    
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback that receives a change event after every mutation.
+        Events are delivered in version order after the write lock is released;
+        their month rollups are read at delivery time, so they may already include
+        a later change.
+        
+        Args:
+            listener: Callable taking an event with the new version, op ('add', 'update',
+                'delete' or 'delete_where'), count, the affected ids or rows, changed
+                fields or delete filters, and the new rollup values of every affected month
+        """
+        self._listeners.append(listener)
+    
+    def _record_change(self, op: str, months: Set[str], rows: List[Transaction] = (), ids: List[str] = (),
+                       details: Optional[Dict[str, Any]] = None, count: Optional[int] = None):
+        """Internal helper to bump the version and queue a change event; called with the write lock held."""
+        self._bump_version()
+        if not self._listeners:
+            return
+        
+        event = {'version': self._version, 'op': op, 'count': (len(rows) or len(ids)) if count is None else count}
+        if ids:
+            event['ids'] = list(ids)
+        if rows and len(rows) <= MAX_EVENT_ROWS:
+            event['expenses'] = [row.to_dict() for row in rows]
+        if details:
+            event.update(details)
+        self._pending_events.append((event, months))
+    
+    def _deliver_events(self):
+        """
+        Internal helper to hand queued change events to listeners; called after releasing the write lock.
+        Rollups are looked up only for each event's affected months, so a change never pays for a
+        scan over every month and readers are not blocked while the summaries are built.
+        """
+        with self._notify_lock:
+            while self._pending_events:
+                event, months = self._pending_events.popleft()
+                # Absolute values rather than deltas, so applying an event twice is harmless
+                rollup = self._expense_ledger.rollup
+                event['rollups'] = {
+                    'total': rollup.total,
+                    'count': rollup.count,
+                    'months': [self._month_summary(rollup, month) for month in sorted(months)]
+                }
+                for listener in self._listeners:
+                    listener(event)
+    
+    @staticmethod
+    def _month_summary(rollup, month: str) -> Dict[str, Any]:
+        """Helper to describe one month's rollup buckets."""
+        return {'month': month, 'total': rollup.monthly_total(month), 'count': rollup.monthly_count(month),
+                'categories': rollup.category_totals(month)}
     
     def add_expense(self, amount: float = None, category: str = None, date: str = None, 
                    description: str = None) -> Optional[Transaction]:
@@ -36,11 +139,158 @@ class SpendController:
             amount, category, date, description = expense_data
         
         # Create and register new expense
-        new_expense = Transaction(amount, category, date, description)
-        self._expense_ledger.append(new_expense)
-        
+        with self._write_lock:
+            new_expense = self._expense_ledger.add(amount, category, date, description)
+            self._record_change('add', {new_expense.date[:7]}, rows=[new_expense])
+        self._deliver_events()
         return new_expense
     
+    def add_expenses(self, rows: Iterable[Any]) -> Tuple[List[Transaction], List[Dict[str, Any]]]:
+        """
+        Validate and record many expenses at once.
+        All rows are validated in one pass; the valid ones are then inserted together
+        in a single ledger batch, and invalid ones are reported without stopping the rest.
+        
+        Args:
+            rows: Expense dictionaries with amount and category, and optional date and description
+            
+        Returns:
+            Tuple of (created Transactions in input order, list of {'index', 'error'} for rejected rows)
+        """
+        valid_rows, row_errors = [], []
+        for index, row in enumerate(rows):
+            try:
+                valid_rows.append(self._validate_expense_row(row))
+            except ValueError as error:
+                row_errors.append({'index': index, 'error': str(error)})
+        
+        if not valid_rows:
+            return [], row_errors
+        with self._write_lock:
+            with self.batch():
+                created = self._expense_ledger.add_many(valid_rows)
+            self._record_change('add', {expense.date[:7] for expense in created}, rows=created)
+        self._deliver_events()
+        return created, row_errors
+    
+    def _validate_expense_row(self, row: Any) -> tuple:
+        """
+        Helper to check one bulk expense row.
+        
+        Returns:
+            Tuple of (amount, category, date, description) ready for the ledger
+            
+        Raises:
+            ValueError: Describing the first problem found
+        """
+        if not isinstance(row, dict):
+            raise ValueError("Row must be a JSON object.")
+        for field in ('amount', 'category'):
+            if field not in row:
+                raise ValueError(f"Required field missing: '{field}'")
+        
+        amount, category, description = row['amount'], row['category'], row.get('description', '')
+        date = row.get('date') or datetime.now().strftime("%Y-%m-%d")
+        if isinstance(amount, bool) or (isinstance(amount, float) and not math.isfinite(amount)):
+            raise ValueError("Amount must be a positive number.")
+        validate_amount(amount)
+        validate_category(category)
+        validate_date(date)
+        parse_day(date)
+        validate_description(description)
+        return (float(amount), category, date, description)
+    
+    def import_csv(self, fileobj, chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Import expenses from a CSV file, parsing it incrementally.
+        The header must name at least Amount and Category columns (case-insensitive);
+        Date and Description are optional and other columns such as ID are ignored,
+        so a file from export_to_csv can be imported as-is. Rows are validated and
+        committed chunk_size at a time, so only one chunk is ever held in memory and
+        a failure part way through keeps the chunks already committed.
+        
+        Args:
+            fileobj: Binary (UTF-8) or text file object positioned at the header
+            chunk_size: Number of rows committed per ledger batch
+            
+        Returns:
+            Report with row, inserted, failed and chunk counts, plus up to
+            MAX_IMPORT_ERRORS {'line', 'error'} entries for rejected rows
+            
+        Raises:
+            ValueError: If the header lacks a required column or the file is not valid CSV/UTF-8
+        """
+        if chunk_size < 1:
+            raise ValueError("Import chunk size must be at least 1")
+        lines = fileobj if isinstance(fileobj, io.TextIOBase) else codecs.iterdecode(fileobj, 'utf-8-sig')
+        reader = csv.reader(lines)
+        
+        try:
+            header = next(reader, None)
+            if header is None:
+                raise ValueError("CSV file is empty")
+            columns = {name.strip().lower().replace(' ', '_'): position for position, name in enumerate(header)}
+            missing = [field for field in ('amount', 'category') if field not in columns]
+            if missing:
+                raise ValueError(f"CSV header missing column(s): {', '.join(missing)}")
+            
+            report = {'rows': 0, 'inserted': 0, 'failed': 0, 'chunks': 0, 'errors': []}
+            chunk = []
+            for record in reader:
+                if not any(record):
+                    continue
+                report['rows'] += 1
+                try:
+                    chunk.append(self._validate_expense_row(self._csv_record_to_row(record, columns)))
+                except ValueError as error:
+                    report['failed'] += 1
+                    if len(report['errors']) < MAX_IMPORT_ERRORS:
+                        report['errors'].append({'line': reader.line_num, 'error': str(error)})
+                if len(chunk) >= chunk_size:
+                    self._commit_import_chunk(chunk, report)
+                    chunk = []
+            if chunk:
+                self._commit_import_chunk(chunk, report)
+        except csv.Error as error:
+            raise ValueError(f"Malformed CSV at line {reader.line_num}: {error}")
+        
+        report['errors_truncated'] = report['failed'] > len(report['errors'])
+        return report
+    
+    @staticmethod
+    def _csv_record_to_row(record: List[str], columns: Dict[str, int]) -> Dict[str, Any]:
+        """Helper to turn a CSV record into a row for _validate_expense_row."""
+        row = {field: record[columns[field]].strip()
+               for field in ('amount', 'category', 'date', 'description')
+               if field in columns and columns[field] < len(record)}
+        for field in ('amount', 'category'):
+            if not row.get(field):
+                raise ValueError(f"Required field missing: '{field}'")
+        try:
+            row['amount'] = float(row['amount'])
+        except ValueError:
+            raise ValueError(f"Invalid amount '{row['amount']}'")
+        return row
+    
+    def _commit_import_chunk(self, chunk: List[tuple], report: Dict[str, Any]):
+        """Helper to insert one validated chunk of imported rows in a single batch."""
+        with self._write_lock:
+            with self.batch():
+                created = self._expense_ledger.add_many(chunk)
+            self._record_change('add', {expense.date[:7] for expense in created}, rows=created)
+        self._deliver_events()
+        report['inserted'] += len(chunk)
+        report['chunks'] += 1
+    
+    def batch(self):
+        """
+        Group several writes so durable storage commits them together.
+        
+        Returns:
+            Context manager wrapping the ledger's batch
+        """
+        return self._expense_ledger.batch()
+    
     def _gather_expense_from_cli(self) -> Optional[tuple]:
         """
         Interactive CLI helper to gather expense details from user input.
@@ -74,16 +324,16 @@ class SpendController:
         Returns:
             List of all Transaction instances
         """
-        return list(self._expense_ledger)
+        return list(self._expense_ledger.rows())
     
     def list_expenses(self):
         """Display all expenses in CLI-friendly format."""
-        if not self._expense_ledger:
+        if len(self._expense_ledger) == 0:
             print("No expenses found.")
             return
         
         print("\n--- All Transactions ---")
-        for record in self._expense_ledger:
+        for record in self._expense_ledger.rows():
             print(f"ID: {record.id[:8]}... | Amount: ${record.amount} | "
                   f"Category: {record.category} | Date: {record.date} | "
                   f"Description: {record.description}")
@@ -98,15 +348,15 @@ class SpendController:
             
         Returns:
             Matching Transaction instance or None if not found
+            
+        Raises:
+            AmbiguousIdError: If a partial ID matches more than one expense
         """
         return self._search_expense_by_id(expense_id)
     
     def _search_expense_by_id(self, expense_id: str) -> Optional[Transaction]:
         """Internal helper for ID-based expense lookup."""
-        for record in self._expense_ledger:
-            if record.id == expense_id or record.id.startswith(expense_id):
-                return record
-        return None
+        return self._expense_ledger.get(expense_id)
     
     def edit_expense(self):
         """
@@ -114,7 +364,11 @@ class SpendController:
         Prompts user for expense ID and new values for each field.
         """
         expense_id = input("Enter expense ID to edit: ")
-        target_expense = self._search_expense_by_id(expense_id)
+        try:
+            target_expense = self._search_expense_by_id(expense_id)
+        except AmbiguousIdError as error:
+            print(f"{error}. Please enter more characters of the ID.")
+            return
         
         if not target_expense:
             print("Transaction not found.")
@@ -172,23 +426,25 @@ class SpendController:
             
         Returns:
             Updated Transaction instance or None if not found
+            
+        Raises:
+            AmbiguousIdError: If a partial ID matches more than one expense
         """
-        target_expense = self._search_expense_by_id(expense_id)
-        
-        if not target_expense:
-            return None
-        
         # Apply updates only for provided fields
-        if amount is not None:
-            target_expense.amount = amount
-        if category is not None:
-            target_expense.category = category
-        if date is not None:
-            target_expense.date = date
-        if description is not None:
-            target_expense.description = description
-            
-        return target_expense
+        with self._write_lock:
+            # The prior values are only needed to describe the change to listeners
+            previous = self._expense_ledger.get(expense_id) if self._listeners else None
+            updated_expense = self._expense_ledger.update(expense_id, amount, category, date, description)
+            if updated_expense is not None:
+                months, details = {updated_expense.date[:7]}, None
+                if previous is not None:
+                    months.add(previous.date[:7])
+                    before = previous.to_dict()
+                    details = {'changes': {field: value for field, value in updated_expense.to_dict().items()
+                                           if before.get(field) != value}}
+                self._record_change('update', months, ids=[updated_expense.id], details=details)
+        self._deliver_events()
+        return updated_expense
     
     def delete_expense(self, expense_id: str = None) -> bool:
         """
@@ -200,16 +456,32 @@ class SpendController:
             
         Returns:
             True if deletion successful, False if expense not found
+            
+        Raises:
+            AmbiguousIdError: If a partial ID matches more than one expense (programmatic mode)
         """
         # CLI mode when no ID provided
         cli_mode = expense_id is None
         if cli_mode:
             expense_id = input("Enter expense ID to delete: ")
         
-        target_expense = self._search_expense_by_id(expense_id)
+        try:
+            with self._write_lock:
+                previous = self._expense_ledger.get(expense_id) if self._listeners else None
+                deleted = self._expense_ledger.delete(expense_id)
+                if deleted:
+                    if previous is None:
+                        self._record_change('delete', set(), count=1)
+                    else:
+                        self._record_change('delete', {previous.date[:7]}, ids=[previous.id])
+            self._deliver_events()
+        except AmbiguousIdError as error:
+            if not cli_mode:
+                raise
+            print(f"{error}. Please enter more characters of the ID.")
+            return False
         
-        if target_expense:
-            self._expense_ledger.remove(target_expense)
+        if deleted:
             if cli_mode:
                 print("Transaction deleted successfully!")
             return True
@@ -218,6 +490,54 @@ class SpendController:
                 print("Transaction not found.")
             return False
     
+    def delete_where(self, month: str = None, category: str = None, date_from: str = None,
+                     date_to: str = None) -> int:
+        """
+        Remove every expense matching the given criteria in one ledger operation.
+        At least one criterion is required so an empty request can never wipe the ledger.
+        
+        Args:
+            month: YYYY-MM month to clear (cannot be combined with date bounds)
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+            
+        Returns:
+            Number of expenses deleted
+            
+        Raises:
+            ValueError: If no criterion is given, the month is malformed or it is combined with dates
+        """
+        if month:
+            if date_from or date_to:
+                raise ValueError("Use either month or date_from/date_to, not both")
+            date_from, date_to = self._month_range(month)
+        if not any([category, date_from, date_to]):
+            raise ValueError("At least one of month, category, date_from or date_to is required")
+        
+        with self._write_lock:
+            # Only the months holding matching rows change; finding them costs no more than the delete
+            months = ({row.date[:7] for row in self._expense_ledger.select(category, date_from, date_to)}
+                      if self._listeners else set())
+            with self.batch():
+                deleted_count = self._expense_ledger.delete_where(category, date_from, date_to)
+            if deleted_count:
+                self._record_change('delete_where', months, count=deleted_count,
+                                    details={'filters': {'category': category, 'date_from': date_from,
+                                                         'date_to': date_to}})
+        self._deliver_events()
+        return deleted_count
+    
+    @staticmethod
+    def _month_range(month: str) -> Tuple[str, str]:
+        """Helper to turn a YYYY-MM month into its first and last dates."""
+        try:
+            year, month_number = (int(part) for part in month.split('-'))
+            last_day = calendar.monthrange(year, month_number)[1]
+        except ValueError:
+            raise ValueError(f"Invalid month '{month}', expected YYYY-MM")
+        return f"{year:04d}-{month_number:02d}-01", f"{year:04d}-{month_number:02d}-{last_day:02d}"
+    
     def filter_expenses(self, category: str = None, date_from: str = None, 
                        date_to: str = None, tag: str = None) -> List[Transaction]:
         """
@@ -226,24 +546,30 @@ class SpendController:
         
         Args:
             category: Filter by category name
-            date_from: Filter by start date
-            date_to: Filter by end date
+            date_from: Filter by start date (YYYY-MM-DD, inclusive)
+            date_to: Filter by end date (YYYY-MM-DD, inclusive)
             tag: Filter by tag (deprecated, kept for compatibility)
             
         Returns:
             List of expenses matching the filter criteria
+            
+        Raises:
+            ValueError: If a date bound is not a valid YYYY-MM-DD date
         """
         # Check if CLI mode (all parameters are None)
         cli_mode = all(param is None for param in [category, date_from, date_to, tag])
         
         if cli_mode:
-            category, _ = self._gather_filter_criteria()
-        
-        # Start with full ledger and apply filters
-        filtered_results = list(self._expense_ledger)
+            category, date_from, date_to = self._gather_filter_criteria()
         
-        if category:
-            filtered_results = self._filter_by_category(filtered_results, category)
+        # Resolve criteria through the ledger indexes and materialize only the matches
+        try:
+            filtered_results = self._expense_ledger.select(category or None, date_from or None, date_to or None)
+        except ValueError as error:
+            if not cli_mode:
+                raise
+            print(f"Invalid filter: {error}")
+            return []
         
         # Display results in CLI mode
         if cli_mode:
@@ -251,15 +577,158 @@ class SpendController:
         
         return filtered_results
     
+    def page_expenses(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None, category: str = None,
+                      date_from: str = None, date_to: str = None) -> Tuple[List[Transaction], Optional[str]]:
+        """
+        Retrieve one page of expenses ordered by date, then ID.
+        Pages are keyset-based, so fetching a deep page costs the same as the first.
+        
+        Args:
+            limit: Maximum number of expenses per page (capped at MAX_PAGE_SIZE)
+            cursor: Opaque cursor returned with the previous page (None for the first page)
+            category: Filter by category name
+            date_from: Filter by start date (YYYY-MM-DD, inclusive)
+            date_to: Filter by end date (YYYY-MM-DD, inclusive)
+            
+        Returns:
+            Tuple of (expenses on this page, cursor for the next page or None on the last page)
+            
+        Raises:
+            ValueError: If the limit, cursor or a date bound is invalid
+        """
+        if limit < 1:
+            raise ValueError("Page limit must be at least 1")
+        limit = min(limit, MAX_PAGE_SIZE)
+        after = decode_cursor(cursor) if cursor else None
+        
+        # Fetch one extra row to learn whether another page follows
+        page = self._expense_ledger.page(limit + 1, after, category or None, date_from or None, date_to or None)
+        if len(page) <= limit:
+            return page, None
+        last = page[limit - 1]
+        return page[:limit], encode_cursor(last.date, last.id)
+    
+    def get_category_counts(self) -> List[Dict[str, Any]]:
+        """
+        List the distinct expense categories with the number of expenses in each.
+        Categories are matched case-insensitively, as in filter_expenses.
+        
+        Returns:
+            List of {'category', 'count'} dictionaries ordered by category name
+        """
+        return [{'category': label, 'count': count}
+                for label, count in self._expense_ledger.category_counts()]
+    
+    def get_spending_statistics(self) -> Dict[str, Any]:
+        """
+        Summarize all spending from the ledger's running totals.
+        
+        Returns:
+            Dictionary with overall total, expense count, per-category totals
+            and chronologically ordered per-day totals
+        """
+        rollup = self._expense_ledger.rollup
+        return {
+            'total': rollup.total,
+            'count': rollup.count,
+            'by_category': rollup.category_totals(),
+            'by_date': rollup.daily_totals()
+        }
+    
+    def get_dashboard(self, month: str, limit: int = DEFAULT_PAGE_SIZE,
+                      history_months: int = DASHBOARD_HISTORY_MONTHS) -> Dict[str, Any]:
+        """
+        Gather everything the dashboard shows for a month from one consistent snapshot.
+        Writes are held off while the snapshot is taken, so the transactions page,
+        totals and history all reflect the same ledger version.
+        
+        Args:
+            month: YYYY-MM month to summarize
+            limit: Maximum number of the month's transactions to include (capped at MAX_PAGE_SIZE)
+            history_months: Number of months of history ending with the given month
+            
+        Returns:
+            Dictionary with the ledger version, the month's first page of transactions
+            and its next_cursor, month stats, per-category totals ordered by amount,
+            and per-month history with totals, counts and category totals
+            
+        Raises:
+            ValueError: If the month is malformed or the limit is below 1
+        """
+        date_from, date_to = self._month_range(month)
+        month = date_from[:7]
+        year, month_number = int(date_from[:4]), int(date_from[5:7])
+        history_keys = []
+        for offset in range(history_months - 1, -1, -1):
+            history_year, history_index = divmod(year * 12 + month_number - 1 - offset, 12)
+            history_keys.append(f"{history_year:04d}-{history_index + 1:02d}")
+        
+        with self._write_lock:
+            expenses, next_cursor = self.page_expenses(limit=limit, date_from=date_from, date_to=date_to)
+            rollup = self._expense_ledger.rollup
+            history = [self._month_summary(rollup, key) for key in history_keys]
+            category_totals = rollup.category_totals(month)
+            month_count = rollup.monthly_count(month)
+            month_total = rollup.monthly_total(month)
+            previous_year, previous_index = divmod(year * 12 + month_number - 2, 12)
+            previous_total = rollup.monthly_total(f"{previous_year:04d}-{previous_index + 1:02d}")
+            version = self._version
+        
+        return {
+            'version': version,
+            'month': month,
+            'expenses': expenses,
+            'next_cursor': next_cursor,
+            'stats': {
+                'total': month_total,
+                'count': month_count,
+                'days_in_month': int(date_to[8:]),
+                'previous_total': previous_total
+            },
+            'categories': dict(sorted(category_totals.items(), key=lambda item: item[1], reverse=True)),
+            'history': history
+        }
+    
+    def get_monthly_totals(self) -> Dict[str, float]:
+        """
+        Retrieve total spending per month.
+        
+        Returns:
+            Dictionary mapping YYYY-MM to total spent, in chronological order
+        """
+        return self._expense_ledger.rollup.monthly_totals()
+    
+    def get_category_totals(self, month: str = None) -> Dict[str, float]:
+        """
+        Retrieve total spending per category.
+        
+        Args:
+            month: Optional YYYY-MM month to restrict totals to
+            
+        Returns:
+            Dictionary mapping category to total spent
+        """
+        return self._expense_ledger.rollup.category_totals(month)
+    
+    def get_daily_totals(self, month: str = None) -> Dict[str, float]:
+        """
+        Retrieve total spending per day.
+        
+        Args:
+            month: Optional YYYY-MM month to restrict totals to
+            
+        Returns:
+            Dictionary mapping YYYY-MM-DD to total spent, in chronological order
+        """
+        return self._expense_ledger.rollup.daily_totals(month)
+    
     def _gather_filter_criteria(self) -> tuple:
         """Helper to collect filter criteria from CLI."""
         print("Filter options:")
         category = input("Enter category (or press Enter to skip): ") or None
-        return category, None
-    
-    def _filter_by_category(self, expenses: List[Transaction], category: str) -> List[Transaction]:
-        """Helper to filter expenses by category (case-insensitive)."""
-        return [exp for exp in expenses if exp.category.lower() == category.lower()]
+        date_from = input("Enter start date YYYY-MM-DD (or press Enter to skip): ") or None
+        date_to = input("Enter end date YYYY-MM-DD (or press Enter to skip): ") or None
+        return category, date_from, date_to
     
     def _display_filtered_results(self, filtered: List[Transaction]):
         """Helper to display filtered results in CLI mode."""
@@ -272,38 +741,62 @@ class SpendController:
             print(f"ID: {record.id[:8]}... | Amount: ${record.amount} | "
                   f"Category: {record.category} | Date: {record.date}")
     
-    def export_to_csv(self) -> str:
+    def export_to_csv(self, category: str = None, date_from: str = None, date_to: str = None) -> str:
         """
-        Generate CSV export of all expenses.
+        Generate CSV export of expenses, ordered by date, then ID.
+        
+        Args:
+            category: Filter by category name
+            date_from: Filter by start date (YYYY-MM-DD, inclusive)
+            date_to: Filter by end date (YYYY-MM-DD, inclusive)
         
         Returns:
             String containing CSV-formatted expense data
         """
-        return self._generate_csv_output()
+        return b''.join(self.iter_csv(category, date_from, date_to)).decode('utf-8')
+    
+    def iter_csv(self, category: str = None, date_from: str = None, date_to: str = None) -> Iterator[bytes]:
+        """
+        Stream a CSV export of expenses as UTF-8 chunks, ordered by date, then ID.
+        The header is yielded straight away and rows follow one keyset page at a time,
+        so memory use stays flat however large the ledger is.
+        
+        Args:
+            category: Filter by category name
+            date_from: Filter by start date (YYYY-MM-DD, inclusive)
+            date_to: Filter by end date (YYYY-MM-DD, inclusive)
+        
+        Returns:
+            Iterator of encoded CSV chunks
+        
+        Raises:
+            ValueError: If a date bound is invalid (raised here, before streaming starts)
+        """
+        for bound in (date_from, date_to):
+            if bound:
+                parse_day(bound)
+        return self._generate_csv_chunks(category or None, date_from or None, date_to or None)
     
-    def _generate_csv_output(self) -> str:
-        """Internal helper to create CSV export."""
+    def _generate_csv_chunks(self, category: Optional[str], date_from: Optional[str],
+                             date_to: Optional[str]) -> Iterator[bytes]:
+        """Internal helper to write CSV pages into a reused buffer and yield them encoded."""
         buffer = io.StringIO()
         csv_writer = csv.writer(buffer)
         
         # Write header row
         header_columns = ['ID', 'Amount', 'Category', 'Date', 'Description', 'Created At']
         csv_writer.writerow(header_columns)
+        yield buffer.getvalue().encode('utf-8')
         
-        # Write expense records
-        for record in self._expense_ledger:
-            row_data = [
-                record.id,
-                record.amount,
-                record.category,
-                record.date,
-                record.description,
-                record.created_at
-            ]
-            csv_writer.writerow(row_data)
-        
-        # Extract CSV content and cleanup
-        csv_content = buffer.getvalue()
-        buffer.close()
-        
-        return csv_content
+        # Write expense records a page at a time
+        after = None
+        while True:
+            page = self._expense_ledger.page(EXPORT_PAGE_SIZE, after, category, date_from, date_to)
+            if not page:
+                return
+            buffer.seek(0)
+            buffer.truncate()
+            csv_writer.writerows([record.id, record.amount, record.category, record.date,
+                                  record.description, record.created_at] for record in page)
+            yield buffer.getvalue().encode('utf-8')
+            after = (page[-1].date, page[-1].id)
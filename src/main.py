@@ -169,8 +169,9 @@ if __name__ == '__main__':
     print("🚀 Starting Spending Sense Application")
     print("=" * 70)
     
-    # Initialize sample data
-    initialize_sample_data()
+    # Initialize sample data, committed as a single storage batch
+    with spend_controller.batch():
+        initialize_sample_data()
     
     print(f"\n📱 Web Interface:")
     print(f"   http://localhost:5000")
@@ -1,16 +1,24 @@
-from datetime import datetime
-from typing import Optional
-import uuid
+from typing import Optional, Union
+import time
+
+from utils.identifiers import new_raw_id, format_raw_id, format_timestamp
 
 
 class BudgetPlan:
     """
     Represents a financial budget allocation for tracking spending limits.
     Supports both overall monthly budgets and category-specific allocations.
+    
+    Uses __slots__, lazily rendered IDs and timestamps, and a cached serialized
+    form in the same way as Transaction.
     """
     
-    def __init__(self, amount: float, month: str, category: Optional[str] = None, 
-                 budget_id: Optional[str] = None):
+    __slots__ = ('_raw_id', '_id', '_amount', '_month', '_category',
+                 '_created', '_timestamp', '_serialized')
+    
+    def __init__(self, amount: float, month: str, category: Optional[str] = None,
+                 budget_id: Optional[Union[str, bytes]] = None,
+                 created_at: Optional[Union[str, float]] = None):
         """
         Create a new budget plan instance.
         
@@ -18,17 +26,32 @@ class BudgetPlan:
             amount: Budget allocation amount
             month: Target month in YYYY-MM format
             category: Specific category (None for overall monthly budget)
-            budget_id: Custom identifier (auto-generated if not provided)
+            budget_id: Custom identifier, as text or 16 raw UUID bytes (auto-generated if not provided)
+            created_at: Existing creation time, as ISO text or epoch seconds (defaults to now)
         """
-        self._id = budget_id or str(uuid.uuid4())
+        if isinstance(budget_id, bytes):
+            self._raw_id, self._id = budget_id, None
+        elif budget_id:
+            self._raw_id, self._id = None, budget_id
+        else:
+            self._raw_id, self._id = new_raw_id(), None
+        
+        if isinstance(created_at, str):
+            self._created, self._timestamp = None, created_at
+        else:
+            self._created = time.time() if created_at is None else created_at
+            self._timestamp = None
+        
         self._amount = amount
         self._month = month
         self._category = category
-        self._timestamp = datetime.now().isoformat()
+        self._serialized = None
     
     @property
     def id(self) -> str:
         """Get the unique budget identifier."""
+        if self._id is None:
+            self._id = format_raw_id(self._raw_id)
         return self._id
     
     @property
@@ -40,6 +63,7 @@ class BudgetPlan:
     def amount(self, value: float):
         """Set the budget amount."""
         self._amount = value
+        self._serialized = None
     
     @property
     def month(self) -> str:
@@ -54,6 +78,8 @@ class BudgetPlan:
     @property
     def created_at(self) -> str:
         """Get the creation timestamp."""
+        if self._timestamp is None:
+            self._timestamp = format_timestamp(self._created)
         return self._timestamp
     
     def to_dict(self) -> dict:
@@ -63,13 +89,16 @@ class BudgetPlan:
         Returns:
             Dictionary containing all budget attributes
         """
-        return {
-            'id': self._id,
-            'amount': self._amount,
-            'month': self._month,
-            'category': self._category,
-            'created_at': self._timestamp
-        }
+        if self._serialized is None:
+            self._serialized = {
+                'id': self.id,
+                'amount': self._amount,
+                'month': self._month,
+                'category': self._category,
+                'created_at': self.created_at
+            }
+        # Hand out a copy so callers cannot corrupt the cached form
+        return dict(self._serialized)
     
     def __repr__(self) -> str:
         """String representation of budget plan."""
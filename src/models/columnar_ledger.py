@@ -0,0 +1,812 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from datetime import date as calendar_date
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import time
+import uuid
+
+from models.transaction import Transaction
+from models.spending_rollup import SpendingRollup
+from utils.identifiers import new_raw_id, format_raw_id
+
+ID_WIDTH = 16
+UUID_DASH_POSITIONS = (8, 13, 18, 23)
+HEX_DIGITS = frozenset('0123456789abcdef')
+
+# Compaction runs once tombstones make up a quarter of the physical rows
+COMPACTION_MIN_TOMBSTONES = 256
+COMPACTION_RATIO = 4
+# The ID hash table doubles once more than two thirds of its buckets are taken
+ID_TABLE_MIN_SIZE = 8
+
+
+class AmbiguousIdError(LookupError):
+    """Raised when a partial ID matches more than one record."""
+    
+    def __init__(self, prefix: str, matches: List[str]):
+        self.prefix = prefix
+        self.matches = matches
+        super().__init__(f"ID prefix '{prefix}' matches multiple transactions: {', '.join(matches)}")
+
+
+def parse_day(value: Optional[str]) -> int:
+    """
+    Convert a YYYY-MM-DD string into a proleptic Gregorian day ordinal.
+    
+    Args:
+        value: Date string (None means today)
+    
+    Returns:
+        Day ordinal suitable for an int32 column
+    """
+    if value is None:
+        return calendar_date.today().toordinal()
+    try:
+        return calendar_date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
+@lru_cache(maxsize=4096)
+def format_day(ordinal: int) -> str:
+    """
+    Render a day ordinal back into YYYY-MM-DD format.
+    Cached because a ledger spans far fewer distinct days than rows.
+    """
+    return calendar_date.fromordinal(ordinal).isoformat()
+
+
+def category_key(category: Optional[str]) -> str:
+    """Normalize a category label for case-insensitive matching."""
+    return (category or '').lower()
+
+
+def encode_id(transaction_id: str) -> bytes:
+    """Convert a canonical UUID string into its 16-byte form."""
+    return uuid.UUID(transaction_id).bytes
+
+
+def decode_id(raw_id: bytes) -> str:
+    """Render a 16-byte identifier as a canonical UUID string."""
+    return format_raw_id(bytes(raw_id))
+
+
+def id_prefix_range(prefix: str) -> Optional[tuple]:
+    """
+    Translate a canonical UUID string prefix into an inclusive range of 16-byte IDs.
+    
+    Args:
+        prefix: Leading characters of a lowercase, dash-separated UUID
+    
+    Returns:
+        (low, high) byte bounds, or None if no UUID can start with the prefix
+    """
+    if len(prefix) > 36:
+        return None
+    for position, char in enumerate(prefix):
+        if position in UUID_DASH_POSITIONS:
+            if char != '-':
+                return None
+        elif char not in HEX_DIGITS:
+            return None
+    
+    hex_prefix = prefix.replace('-', '')
+    padding = 32 - len(hex_prefix)
+    return bytes.fromhex(hex_prefix + '0' * padding), bytes.fromhex(hex_prefix + 'f' * padding)
+
+
+class StringPool:
+    """
+    Dictionary encoder that maps repeated strings to small integer codes.
+    Each distinct value is stored once no matter how many rows reference it.
+    """
+    
+    def __init__(self):
+        self._values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+    
+    def intern(self, value: Any) -> int:
+        """Return the code for a value, registering it on first use."""
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+    
+    def lookup(self, code: int) -> Any:
+        """Return the value stored under a code."""
+        return self._values[code]
+    
+    def items(self) -> Iterator[tuple]:
+        """Iterate over (code, value) pairs."""
+        return enumerate(self._values)
+    
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class ColumnarLedger:
+    """
+    Column-oriented storage engine for expense records.
+    Amounts, dates and timestamps live in contiguous typed arrays, categories and
+    descriptions are dictionary-coded, and Transaction objects are only built
+    when a row is handed back to a caller.
+    
+    Rows are addressed by physical slot. An open-addressing hash table of slots
+    maps full IDs to rows and an array of slots ordered by ID serves partial-ID
+    lookups, both at 4 bytes per bucket or row instead of a Python object per row.
+    Deletes only tombstone a slot, leaving its ID entries in place to be skipped;
+    dead slots are reclaimed by periodic compaction, which renumbers the live rows.
+    The date index is an array of slots ordered by (day, ID) that answers date
+    range queries and keyset pages by bisection; it too keeps dead slots until
+    compaction maps it onto the new slot numbers. Category posting lists, keyed by
+    the lowercased label, are arrays holding the slots of each category in slot
+    order, so category filters cost time proportional to the number of matches;
+    deleted slots likewise stay in them until compaction, and a per-category live
+    count keeps category listings exact. A SpendingRollup receives a delta on
+    every write so aggregates are available without scanning rows.
+    """
+    
+    def __init__(self):
+        self._ids = bytearray()
+        self._amounts = array('d')
+        self._days = array('i')
+        self._category_codes = array('I')
+        self._description_codes = array('I')
+        self._created = array('d')
+        self._categories = StringPool()
+        self._descriptions = StringPool()
+        self._live = bytearray()
+        self._tombstones = 0
+        # Buckets hold slot + 1, so zero marks an empty bucket
+        self._id_table = array('I', bytes(4 * ID_TABLE_MIN_SIZE))
+        self._id_entries = 0
+        self._id_order = array('I')
+        self._date_order = array('I')
+        self._category_postings: Dict[str, array] = {}
+        self._category_labels: Dict[str, str] = {}
+        self._category_counts: Dict[str, int] = {}
+        self._rollup = SpendingRollup()
+    
+    def __len__(self) -> int:
+        return len(self._amounts) - self._tombstones
+    
+    def add(self, amount: float, category: str, date: Optional[str], description: str,
+            transaction_id: Optional[str] = None, created_at: Optional[float] = None) -> Transaction:
+        """
+        Append a new row to the ledger.
+        
+        Args:
+            amount: Transaction amount
+            category: Spending category
+            date: Transaction date in YYYY-MM-DD format (None for today)
+            description: Transaction description
+            transaction_id: Existing identifier to preserve (auto-generated if not provided)
+            created_at: Creation time as an epoch timestamp (defaults to now)
+        
+        Returns:
+            Materialized Transaction for the new row
+        """
+        # Convert everything up front so a bad value never leaves a partial row behind
+        raw_id = encode_id(transaction_id) if transaction_id else new_raw_id()
+        amount_value = float(amount)
+        day = parse_day(date)
+        created = time.time() if created_at is None else float(created_at)
+        if self._id_slot(raw_id) is not None:
+            raise ValueError(f"Duplicate transaction ID '{decode_id(raw_id)}'")
+        
+        slot = len(self._amounts)
+        self._ids += raw_id
+        self._amounts.append(amount_value)
+        self._days.append(day)
+        self._category_codes.append(self._categories.intern(category))
+        self._description_codes.append(self._descriptions.intern(description))
+        self._created.append(created)
+        self._live.append(1)
+        self._index_id(raw_id, slot)
+        insort(self._id_order, slot, key=self._raw_id_at)
+        insort(self._date_order, slot, key=self._date_sort_key)
+        self._post_category(category, slot)
+        self._rollup.add(day, category, amount_value)
+        
+        return self.row(slot)
+    
+    def add_many(self, rows: Iterable[Tuple[float, str, Optional[str], str]]) -> List[Transaction]:
+        """
+        Append a batch of new rows with generated IDs.
+        Every value is converted before any column changes, so a bad row leaves the
+        ledger untouched. Small batches are inserted into the sorted indexes one by
+        one; large ones are sorted and spliced in with one pass over each index. The
+        rollup absorbs the batch in one pass.
+        
+        Args:
+            rows: (amount, category, date, description) tuples; a None date means today
+        
+        Returns:
+            Materialized Transactions for the new rows, in input order
+        """
+        created = time.time()
+        prepared = [(new_raw_id(), float(amount), parse_day(date), category, description, created)
+                    for amount, category, date, description in rows]
+        return [self.row(slot) for slot in self._append_rows(prepared)]
+    
+    def restore_many(self, records: Iterable[Tuple[bytes, float, int, str, str, float]]) -> int:
+        """
+        Append a batch of rows in their stored form, such as rows recovered from disk.
+        Nothing is parsed or materialized, and the indexes absorb the batch the same
+        way as add_many, so loading n rows does not cost n insertions.
+        
+        Args:
+            records: (16-byte ID, amount, day ordinal, category, description, created_at epoch seconds) tuples
+        
+        Returns:
+            Number of rows appended
+        """
+        prepared = [(bytes(raw_id), float(amount), int(day), category, description, float(created))
+                    for raw_id, amount, day, category, description, created in records]
+        seen = set()
+        for raw_id, *_ in prepared:
+            if raw_id in seen or self._id_slot(raw_id) is not None:
+                raise ValueError(f"Duplicate transaction ID '{decode_id(raw_id)}'")
+            seen.add(raw_id)
+        return len(self._append_rows(prepared))
+    
+    def _append_rows(self, prepared: List[Tuple[bytes, float, int, str, str, float]]) -> range:
+        """
+        Internal helper to append converted rows and add them to every index and the rollup.
+        
+        Args:
+            prepared: (raw ID, amount, day, category, description, created) tuples
+        
+        Returns:
+            Slots of the new rows
+        """
+        if (self._id_entries + len(prepared)) * 3 > len(self._id_table) * 2:
+            self._rebuild_id_table(len(self._id_table), len(prepared))
+        first_slot = len(self._amounts)
+        for slot, (raw_id, amount, day, category, description, created) in enumerate(prepared, first_slot):
+            self._ids += raw_id
+            self._amounts.append(amount)
+            self._days.append(day)
+            self._category_codes.append(self._categories.intern(category))
+            self._description_codes.append(self._descriptions.intern(description))
+            self._created.append(created)
+            self._live.append(1)
+            self._index_id(raw_id, slot)
+            self._post_category(category, slot)
+        
+        new_slots = range(first_slot, len(self._amounts))
+        self._id_order = self._merge_slots(self._id_order, new_slots, self._raw_id_at)
+        self._date_order = self._merge_slots(self._date_order, new_slots, self._date_sort_key)
+        self._rollup.add_many((day, category, amount) for _, amount, day, category, _, _ in prepared)
+        return new_slots
+    
+    def row(self, slot: int) -> Transaction:
+        """
+        Materialize the row stored at a slot into a Transaction.
+        
+        Args:
+            slot: Physical row position
+        
+        Returns:
+            Detached Transaction snapshot of the row
+        """
+        return Transaction(
+            self._amounts[slot],
+            self._categories.lookup(self._category_codes[slot]),
+            format_day(self._days[slot]),
+            self._descriptions.lookup(self._description_codes[slot]),
+            transaction_id=self._raw_id_at(slot),
+            created_at=self._created[slot]
+        )
+    
+    def rows(self) -> Iterator[Transaction]:
+        """Iterate over all live rows in insertion order."""
+        for slot in self.live_slots():
+            yield self.row(slot)
+    
+    def detached_rows(self) -> Iterator[Transaction]:
+        """
+        Copy the columns and return an iterator over the live rows of the copy.
+        The copy is taken before this returns and costs a few buffer copies, so a caller
+        can hold a lock for the copy alone and materialize the rows after releasing it.
+        """
+        ids, live = bytes(self._ids), bytes(self._live)
+        amounts, days, created = self._amounts[:], self._days[:], self._created[:]
+        category_codes, description_codes = self._category_codes[:], self._description_codes[:]
+        categories = [label for _, label in self._categories.items()]
+        descriptions = [text for _, text in self._descriptions.items()]
+        
+        def materialize() -> Iterator[Transaction]:
+            for slot, flag in enumerate(live):
+                if flag:
+                    yield Transaction(amounts[slot], categories[category_codes[slot]], format_day(days[slot]),
+                                      descriptions[description_codes[slot]],
+                                      transaction_id=ids[slot * ID_WIDTH:(slot + 1) * ID_WIDTH],
+                                      created_at=created[slot])
+        
+        return materialize()
+    
+    def live_slots(self) -> Iterator[int]:
+        """Iterate over the slots of live rows in insertion order."""
+        live = self._live
+        if not self._tombstones:
+            return iter(range(len(live)))
+        return (slot for slot in range(len(live)) if live[slot])
+    
+    def id_at(self, slot: int) -> str:
+        """Return the canonical identifier of the row at a slot."""
+        return decode_id(self._raw_id_at(slot))
+    
+    def _raw_id_at(self, slot: int) -> bytes:
+        """Return the 16-byte identifier of the row at a slot."""
+        offset = slot * ID_WIDTH
+        return bytes(self._ids[offset:offset + ID_WIDTH])
+    
+    def _date_sort_key(self, slot: int) -> Tuple[int, bytes]:
+        """Return the (day, ID) key the date index is ordered by."""
+        return self._days[slot], self._raw_id_at(slot)
+    
+    def _id_slot(self, raw_id: bytes) -> Optional[int]:
+        """Probe the ID hash table for the live slot holding a 16-byte identifier."""
+        table, live = self._id_table, self._live
+        mask = len(table) - 1
+        bucket = hash(raw_id) & mask
+        while table[bucket]:
+            slot = table[bucket] - 1
+            if live[slot] and self._raw_id_at(slot) == raw_id:
+                return slot
+            bucket = (bucket + 1) & mask
+        return None
+    
+    def _index_id(self, raw_id: bytes, slot: int) -> None:
+        """Add a slot to the ID hash table, doubling the table when it gets too full."""
+        if (self._id_entries + 1) * 3 > len(self._id_table) * 2:
+            self._rebuild_id_table(2 * len(self._id_table))
+        self._place_id(raw_id, slot)
+    
+    def _place_id(self, raw_id: bytes, slot: int) -> None:
+        """Internal helper to store a slot in the first free bucket of its probe sequence."""
+        table = self._id_table
+        mask = len(table) - 1
+        bucket = hash(raw_id) & mask
+        while table[bucket]:
+            bucket = (bucket + 1) & mask
+        table[bucket] = slot + 1
+        self._id_entries += 1
+    
+    def _rebuild_id_table(self, size: int, extra: int = 0) -> None:
+        """
+        Rehash the live slots into a table of at least the given power-of-two size, dropping dead entries.
+        The table is sized to take extra more entries without growing again.
+        """
+        live = self._live
+        needed = (len(self) + extra + 1) * 3 // 2 + 1
+        while size < needed:
+            size *= 2
+        self._id_table = array('I', bytes(4 * size))
+        self._id_entries = 0
+        for slot in range(len(live)):
+            if live[slot]:
+                self._place_id(self._raw_id_at(slot), slot)
+    
+    def find_slot(self, expense_id: str) -> Optional[int]:
+        """
+        Locate the slot of a row by full identifier or unambiguous identifier prefix.
+        
+        Args:
+            expense_id: Full or partial expense ID
+        
+        Returns:
+            Slot of the matching row or None if not found
+        
+        Raises:
+            AmbiguousIdError: If a partial ID matches more than one row
+        """
+        # Full IDs resolve through the hash table
+        if len(expense_id) == 36:
+            try:
+                return self._id_slot(encode_id(expense_id))
+            except ValueError:
+                return None
+        
+        # Partial IDs resolve through a range scan over the ID-ordered slots, skipping dead ones
+        id_range = id_prefix_range(expense_id)
+        if id_range is None:
+            return None
+        low, high = id_range
+        order, live = self._id_order, self._live
+        position = bisect_left(order, low, key=self._raw_id_at)
+        matches = []
+        while position < len(order) and self._raw_id_at(order[position]) <= high and len(matches) < 3:
+            if live[order[position]]:
+                matches.append(order[position])
+            position += 1
+        
+        if not matches:
+            return None
+        if len(matches) > 1:
+            raise AmbiguousIdError(expense_id, [self.id_at(slot)[:13] for slot in matches])
+        return matches[0]
+    
+    def get(self, expense_id: str) -> Optional[Transaction]:
+        """
+        Fetch a row by full ID or unambiguous ID prefix.
+        
+        Returns:
+            Materialized Transaction or None if not found
+            
+        Raises:
+            AmbiguousIdError: If a partial ID matches more than one row
+        """
+        slot = self.find_slot(expense_id)
+        return None if slot is None else self.row(slot)
+    
+    def update(self, expense_id: str, amount: float = None, category: str = None,
+               date: str = None, description: str = None) -> Optional[Transaction]:
+        """
+        Update a row located by full ID or unambiguous ID prefix.
+        
+        Returns:
+            Materialized Transaction with the new values or None if not found
+        """
+        slot = self.find_slot(expense_id)
+        if slot is None:
+            return None
+        return self.update_slot(slot, amount, category, date, description)
+    
+    def delete(self, expense_id: str) -> bool:
+        """
+        Delete a row located by full ID or unambiguous ID prefix.
+        
+        Returns:
+            True if a row was deleted, False if not found
+        """
+        slot = self.find_slot(expense_id)
+        if slot is None:
+            return False
+        self.delete_slot(slot)
+        return True
+    
+    def delete_where(self, category: Optional[str] = None, date_from: Optional[str] = None,
+                     date_to: Optional[str] = None) -> int:
+        """
+        Delete every row matching the given filters in one pass.
+        The sorted indexes are filtered once and the rollup receives one batched delta,
+        instead of paying a bisect-and-shift per row as repeated delete_slot calls would.
+        
+        Args:
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+            
+        Returns:
+            Number of rows deleted
+        """
+        slots = self.find_slots(category, date_from, date_to)
+        if not slots:
+            return 0
+        
+        withdrawn = []
+        for slot in slots:
+            category_label = self._categories.lookup(self._category_codes[slot])
+            self._live[slot] = 0
+            self._unpost_category(category_label)
+            withdrawn.append((self._days[slot], category_label, self._amounts[slot]))
+        self._tombstones += len(slots)
+        self._rollup.remove_many(withdrawn)
+        
+        if (self._tombstones >= COMPACTION_MIN_TOMBSTONES
+                and self._tombstones * COMPACTION_RATIO >= len(self._live)):
+            self.compact()
+        return len(slots)
+    
+    def select(self, category: Optional[str] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None) -> List[Transaction]:
+        """
+        Materialize the rows matching the given filters, in insertion order.
+        
+        Args:
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+            
+        Returns:
+            List of matching Transactions
+        """
+        return [self.row(slot) for slot in self.find_slots(category, date_from, date_to)]
+    
+    def page(self, limit: int, after: Optional[Tuple[str, str]] = None, category: Optional[str] = None,
+             date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Transaction]:
+        """
+        Fetch up to limit matching rows ordered by (date, ID), starting after a keyset position.
+        Walks the date index from the bisected start, so deep pages cost the same as the first.
+        
+        Args:
+            limit: Maximum number of rows to return
+            after: (date, full ID) of the last row of the previous page
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+            
+        Returns:
+            List of Transactions in (date, ID) order
+        """
+        order, live = self._date_order, self._live
+        start, end = self._date_bounds(date_from, date_to)
+        if after is not None:
+            start = max(start, bisect_right(order, (parse_day(after[0]), encode_id(after[1])),
+                                            key=self._date_sort_key))
+        codes = self._category_codes_for(category) if category else None
+        category_codes = self._category_codes
+        
+        results = []
+        position = start
+        while position < end and len(results) < limit:
+            slot = order[position]
+            if live[slot] and (codes is None or category_codes[slot] in codes):
+                results.append(self.row(slot))
+            position += 1
+        return results
+    
+    def update_slot(self, slot: int, amount: float = None, category: str = None,
+                    date: str = None, description: str = None) -> Transaction:
+        """
+        Overwrite selected columns of an existing row.
+        Only fields that are explicitly provided (not None) are changed.
+        
+        Returns:
+            Materialized Transaction reflecting the new values
+        """
+        # Validate before touching any column
+        amount_value = float(amount) if amount is not None else None
+        day = parse_day(date) if date is not None else None
+        
+        self._rollup.remove(self._days[slot], self._categories.lookup(self._category_codes[slot]),
+                            self._amounts[slot])
+        if amount_value is not None:
+            self._amounts[slot] = amount_value
+        if category is not None:
+            self._unpost_category(self._categories.lookup(self._category_codes[slot]), slot)
+            self._category_codes[slot] = self._categories.intern(category)
+            self._post_category(category, slot)
+        if day is not None and day != self._days[slot]:
+            self._remove_sorted(self._date_order, slot, self._date_sort_key)
+            self._days[slot] = day
+            insort(self._date_order, slot, key=self._date_sort_key)
+        if description is not None:
+            self._description_codes[slot] = self._descriptions.intern(description)
+        self._rollup.add(self._days[slot], self._categories.lookup(self._category_codes[slot]),
+                         self._amounts[slot])
+        
+        return self.row(slot)
+    
+    def delete_slot(self, slot: int) -> None:
+        """Tombstone the row at a slot, compacting once enough dead rows accumulate."""
+        self._live[slot] = 0
+        self._tombstones += 1
+        category = self._categories.lookup(self._category_codes[slot])
+        self._unpost_category(category)
+        self._rollup.remove(self._days[slot], category, self._amounts[slot])
+        
+        if (self._tombstones >= COMPACTION_MIN_TOMBSTONES
+                and self._tombstones * COMPACTION_RATIO >= len(self._live)):
+            self.compact()
+    
+    def compact(self) -> None:
+        """
+        Drop tombstoned rows from every column and renumber the live slots.
+        Row order is preserved, so insertion order survives compaction.
+        """
+        if not self._tombstones:
+            return
+        
+        live = self._live
+        survivors = [slot for slot in range(len(live)) if live[slot]]
+        ids = bytearray()
+        renumbered = array('I', bytes(4 * len(live)))
+        for new_slot, slot in enumerate(survivors):
+            offset = slot * ID_WIDTH
+            ids += self._ids[offset:offset + ID_WIDTH]
+            renumbered[slot] = new_slot
+        
+        self._ids = ids
+        self._amounts = array('d', (self._amounts[slot] for slot in survivors))
+        self._days = array('i', (self._days[slot] for slot in survivors))
+        self._category_codes = array('I', (self._category_codes[slot] for slot in survivors))
+        self._description_codes = array('I', (self._description_codes[slot] for slot in survivors))
+        self._created = array('d', (self._created[slot] for slot in survivors))
+        self._live = bytearray(b'\x01') * len(survivors)
+        self._tombstones = 0
+        self._rebuild_indexes(live, renumbered)
+    
+    @staticmethod
+    def _remove_sorted(order: array, slot: int, key: Callable[[int], Any]) -> None:
+        """Remove a slot known to be present from an index of slots ordered by the given key."""
+        del order[bisect_left(order, key(slot), key=key)]
+    
+    @staticmethod
+    def _merge_slots(order: array, slots: Iterable[int], key: Callable[[int], Any]) -> array:
+        """
+        Add a batch of slots to an index of slots ordered by the given key.
+        Batches smaller than the square root of the index are inserted one at a time.
+        Larger ones are sorted and their insertion points bisected, so existing entries
+        are copied in slices without a key call each.
+        
+        Args:
+            order: Index of slots sorted by key
+            slots: Slots to add
+            key: Sort key of a slot
+        
+        Returns:
+            The index holding the added slots, which may be a new array
+        """
+        batch = sorted(slots, key=key)
+        if len(batch) * len(batch) < len(order):
+            for slot in batch:
+                insort(order, slot, key=key)
+            return order
+        
+        merged = array('I')
+        start = 0
+        for slot in batch:
+            stop = bisect_right(order, key(slot), start, key=key)
+            merged.extend(order[start:stop])
+            merged.append(slot)
+            start = stop
+        merged.extend(order[start:])
+        return merged
+    
+    def _rebuild_indexes(self, live: bytearray, renumbered: array) -> None:
+        """
+        Recompute slot-based indexes after slots have been renumbered.
+        
+        Args:
+            live: Live flags of the old slots
+            renumbered: New slot of every surviving old slot, indexed by old slot
+        """
+        self._rebuild_id_table(ID_TABLE_MIN_SIZE)
+        # Renumbering keeps slot order, so the ordered indexes stay sorted once dead slots are dropped
+        self._id_order = array('I', (renumbered[slot] for slot in self._id_order if live[slot]))
+        self._date_order = array('I', (renumbered[slot] for slot in self._date_order if live[slot]))
+        
+        self._category_postings = {key: array('I', (renumbered[slot] for slot in postings if live[slot]))
+                                   for key, postings in self._category_postings.items()}
+    
+    def _post_category(self, category: str, slot: int) -> None:
+        """Add a slot to the posting list of its category."""
+        key = category_key(category)
+        postings = self._category_postings.get(key)
+        if postings is None:
+            postings = self._category_postings[key] = array('I')
+            self._category_labels[key] = category
+            self._category_counts[key] = 0
+        if not postings or slot > postings[-1]:
+            postings.append(slot)
+        else:
+            insort(postings, slot)
+        self._category_counts[key] += 1
+    
+    def _unpost_category(self, category: str, slot: Optional[int] = None) -> None:
+        """
+        Take a row out of its category's live count, dropping emptied categories.
+        A given slot is also removed from the posting list; deletes leave it there to be skipped.
+        """
+        key = category_key(category)
+        if slot is not None:
+            postings = self._category_postings[key]
+            del postings[bisect_left(postings, slot)]
+        self._category_counts[key] -= 1
+        if not self._category_counts[key]:
+            del self._category_postings[key]
+            del self._category_labels[key]
+            del self._category_counts[key]
+    
+    def find_slots(self, category: Optional[str] = None, date_from: Optional[str] = None,
+                   date_to: Optional[str] = None) -> List[int]:
+        """
+        Resolve filter criteria to the matching live slots in insertion order.
+        
+        Args:
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+        
+        Returns:
+            Slots of matching rows
+        """
+        if date_from is None and date_to is None:
+            if category:
+                return self.slots_for_category(category)
+            return list(self.live_slots())
+        if not category:
+            return self.slots_in_date_range(date_from, date_to)
+        
+        # Drive the intersection from whichever index yields fewer candidates
+        postings = self._category_postings.get(category_key(category), ())
+        start, end = self._date_bounds(date_from, date_to)
+        if len(postings) <= end - start:
+            first_day = parse_day(date_from) if date_from else None
+            last_day = parse_day(date_to) if date_to else None
+            days, live = self._days, self._live
+            return [slot for slot in postings
+                    if live[slot]
+                    and (first_day is None or days[slot] >= first_day)
+                    and (last_day is None or days[slot] <= last_day)]
+        
+        codes, category_codes, live = self._category_codes_for(category), self._category_codes, self._live
+        return sorted(slot for slot in self._date_order[start:end]
+                      if live[slot] and category_codes[slot] in codes)
+    
+    def slots_in_date_range(self, date_from: Optional[str] = None,
+                            date_to: Optional[str] = None) -> List[int]:
+        """
+        Bisect the date index to find rows dated within an inclusive range.
+        Either bound may be omitted for an open-ended range.
+        
+        Returns:
+            Matching slots in insertion order
+        """
+        start, end = self._date_bounds(date_from, date_to)
+        if start >= end:
+            return []
+        
+        live = self._live
+        return sorted(slot for slot in self._date_order[start:end] if live[slot])
+    
+    def _date_bounds(self, date_from: Optional[str], date_to: Optional[str]) -> Tuple[int, int]:
+        """Bisect the date index to the [start, end) positions of an inclusive date range."""
+        order, day_at = self._date_order, self._days.__getitem__
+        start = bisect_left(order, parse_day(date_from), key=day_at) if date_from else 0
+        end = bisect_left(order, parse_day(date_to) + 1, key=day_at) if date_to else len(order)
+        return start, end
+    
+    def slots_for_category(self, category: str) -> List[int]:
+        """
+        Find all slots whose category matches case-insensitively.
+        Reads the category posting list, so cost tracks the number of matches.
+        """
+        live = self._live
+        return [slot for slot in self._category_postings.get(category_key(category), ()) if live[slot]]
+    
+    def _category_codes_for(self, category: str) -> Set[int]:
+        """Return the string pool codes of every label matching a category case-insensitively."""
+        key = category_key(category)
+        return {code for code, label in self._categories.items() if category_key(label) == key}
+    
+    def category_counts(self) -> List[Tuple[str, int]]:
+        """
+        List distinct categories with their live row counts.
+        Spellings that differ only in case are reported once, under the first label seen.
+        
+        Returns:
+            (category, count) pairs ordered by category name
+        """
+        return sorted(((self._category_labels[key], count) for key, count in self._category_counts.items()),
+                      key=lambda pair: category_key(pair[0]))
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group several writes together.
+        In-memory writes need no commit, so this only exists for parity with durable ledgers.
+        """
+        yield self
+    
+    @property
+    def rollup(self) -> SpendingRollup:
+        """Get the running spending totals for the live rows."""
+        return self._rollup
+    
+    def memory_usage(self) -> int:
+        """
+        Approximate number of bytes held by the fixed-width columns and the slot indexes.
+        The string pools and the rollup grow with distinct values rather than rows and are left out.
+        """
+        arrays = [self._amounts, self._days, self._category_codes, self._description_codes,
+                  self._created, self._id_table, self._id_order, self._date_order]
+        arrays.extend(self._category_postings.values())
+        return len(self._ids) + len(self._live) + sum(column.itemsize * len(column) for column in arrays)
@@ -0,0 +1,177 @@
+from datetime import date as calendar_date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def month_of_day(ordinal: int) -> str:
+    """Return the YYYY-MM month containing a day ordinal."""
+    day = calendar_date.fromordinal(ordinal)
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+class SpendingRollup:
+    """
+    Running spending totals maintained incrementally as expenses change.
+    Keeps a [total, count] pair per month, per (month, category), per category
+    and per day so aggregate queries never have to revisit individual rows.
+    Buckets whose count drops to zero are removed, which also discards any
+    floating point residue left behind by the subtractions.
+    """
+    
+    def __init__(self):
+        self._total = 0.0
+        self._count = 0
+        self._months: Dict[str, List] = {}
+        self._month_categories: Dict[str, Dict[str, List]] = {}
+        self._categories: Dict[str, List] = {}
+        self._days: Dict[int, List] = {}
+    
+    def add(self, day: int, category: str, amount: float):
+        """Account for a new expense row."""
+        self._apply(day, category, amount, 1)
+    
+    def add_many(self, rows: Iterable[Tuple[int, str, float]]):
+        """
+        Account for a batch of new expense rows.
+        Rows are summed per (day, category) first, so each bucket is touched once per batch.
+        
+        Args:
+            rows: (day, category, amount) triples
+        """
+        self._apply_many(rows, 1)
+    
+    def add_totals(self, buckets: Iterable[Tuple[int, str, float, int]]):
+        """
+        Account for expense rows already summed per (day, category), such as totals
+        stored alongside the rows, without seeing the rows themselves.
+        
+        Args:
+            buckets: (day, category, total amount, row count) tuples
+        """
+        for day, category, amount, count in buckets:
+            self._apply(day, category, amount, count)
+    
+    def remove(self, day: int, category: str, amount: float):
+        """Withdraw an expense row that was previously added."""
+        self._apply(day, category, -amount, -1)
+    
+    def remove_many(self, rows: Iterable[Tuple[int, str, float]]):
+        """
+        Withdraw a batch of expense rows that were previously added.
+        
+        Args:
+            rows: (day, category, amount) triples
+        """
+        self._apply_many(rows, -1)
+    
+    def _apply_many(self, rows: Iterable[Tuple[int, str, float]], sign: int):
+        """Internal helper to sum rows per (day, category) so each bucket is touched once."""
+        deltas: Dict[Tuple[int, str], List] = {}
+        for day, category, amount in rows:
+            delta = deltas.get((day, category))
+            if delta is None:
+                deltas[(day, category)] = [amount, 1]
+            else:
+                delta[0] += amount
+                delta[1] += 1
+        for (day, category), (amount, count) in deltas.items():
+            self._apply(day, category, sign * amount, sign * count)
+    
+    def _apply(self, day: int, category: str, amount: float, count: int):
+        """Internal helper to push a delta into every bucket."""
+        month = month_of_day(day)
+        self._total += amount
+        self._count += count
+        if self._count == 0:
+            self._total = 0.0
+        
+        self._bump(self._months, month, amount, count)
+        self._bump(self._categories, category, amount, count)
+        self._bump(self._days, day, amount, count)
+        
+        month_bucket = self._month_categories.setdefault(month, {})
+        self._bump(month_bucket, category, amount, count)
+        if not month_bucket:
+            del self._month_categories[month]
+    
+    @staticmethod
+    def _bump(buckets: Dict, key, amount: float, count: int):
+        """Internal helper to adjust one [total, count] bucket, dropping it when emptied."""
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [amount, count]
+            return
+        bucket[0] += amount
+        bucket[1] += count
+        if bucket[1] == 0:
+            del buckets[key]
+    
+    @property
+    def total(self) -> float:
+        """Get the total amount across all expenses."""
+        return self._total
+    
+    @property
+    def count(self) -> int:
+        """Get the number of expenses accounted for."""
+        return self._count
+    
+    def monthly_totals(self) -> Dict[str, float]:
+        """
+        Spending per month in chronological order.
+        
+        Returns:
+            Dictionary mapping YYYY-MM to total spent
+        """
+        return {month: self._months[month][0] for month in sorted(self._months)}
+    
+    def category_counts(self) -> Dict[str, int]:
+        """
+        Number of expenses per category, in the order categories were first seen.
+        
+        Returns:
+            Dictionary mapping category to expense count
+        """
+        return {category: bucket[1] for category, bucket in self._categories.items()}
+    
+    def monthly_total(self, month: str) -> float:
+        """Get the amount spent in a month."""
+        bucket = self._months.get(month)
+        return bucket[0] if bucket else 0.0
+    
+    def monthly_count(self, month: str) -> int:
+        """Get the number of expenses recorded in a month."""
+        bucket = self._months.get(month)
+        return bucket[1] if bucket else 0
+    
+    def category_totals(self, month: Optional[str] = None) -> Dict[str, float]:
+        """
+        Spending per category, either for one month or across all time.
+        
+        Args:
+            month: Optional YYYY-MM month to restrict to
+        
+        Returns:
+            Dictionary mapping category to total spent
+        """
+        buckets = self._categories if month is None else self._month_categories.get(month, {})
+        return {category: bucket[0] for category, bucket in buckets.items()}
+    
+    def daily_totals(self, month: Optional[str] = None) -> Dict[str, float]:
+        """
+        Spending per day in chronological order.
+        
+        Args:
+            month: Optional YYYY-MM month to restrict to
+        
+        Returns:
+            Dictionary mapping YYYY-MM-DD to total spent
+        """
+        if month is None:
+            days = sorted(self._days)
+        else:
+            year, month_number = (int(part) for part in month.split('-'))
+            first_day = calendar_date(year, month_number, 1).toordinal()
+            following = calendar_date(year + month_number // 12, month_number % 12 + 1, 1).toordinal()
+            days = [day for day in range(first_day, following) if day in self._days]
+        
+        return {calendar_date.fromordinal(day).isoformat(): self._days[day][0] for day in days}
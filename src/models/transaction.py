@@ -1,16 +1,25 @@
-from datetime import datetime
-from typing import Optional
-import uuid
+from typing import Optional, Union
+import time
+
+from utils.identifiers import new_raw_id, format_raw_id, format_timestamp, parse_timestamp
 
 
 class Transaction:
     """
     Represents a financial transaction/expense record.
     Tracks spending with amount, category, date, and description.
+    
+    Instances use __slots__ to avoid a per-object dictionary. Generated IDs are
+    kept as 16 raw bytes and creation times as epoch floats; both are rendered
+    to text only when first read.
     """
     
-    def __init__(self, amount: float, category: str, date: str, 
-                 description: str, transaction_id: Optional[str] = None):
+    __slots__ = ('_raw_id', '_id', '_amount', '_category', '_date', '_description',
+                 '_created', '_timestamp')
+    
+    def __init__(self, amount: float, category: str, date: str,
+                 description: str, transaction_id: Optional[Union[str, bytes]] = None,
+                 created_at: Optional[Union[str, float]] = None):
         """
         Create a new transaction record.
         
@@ -19,18 +28,32 @@ class Transaction:
             category: Spending category
             date: Transaction date in YYYY-MM-DD format
             description: Transaction description/notes
-            transaction_id: Custom identifier (auto-generated if not provided)
+            transaction_id: Custom identifier, as text or 16 raw UUID bytes (auto-generated if not provided)
+            created_at: Existing creation time, as ISO text or epoch seconds (defaults to now)
         """
-        self._id = transaction_id or str(uuid.uuid4())
+        if isinstance(transaction_id, bytes):
+            self._raw_id, self._id = transaction_id, None
+        elif transaction_id:
+            self._raw_id, self._id = None, transaction_id
+        else:
+            self._raw_id, self._id = new_raw_id(), None
+        
+        if isinstance(created_at, str):
+            self._created, self._timestamp = None, created_at
+        else:
+            self._created = time.time() if created_at is None else created_at
+            self._timestamp = None
+        
         self._amount = amount
         self._category = category
         self._date = date
         self._description = description
-        self._timestamp = datetime.now().isoformat()
     
     @property
     def id(self) -> str:
         """Get the unique transaction identifier."""
+        if self._id is None:
+            self._id = format_raw_id(self._raw_id)
         return self._id
     
     @property
@@ -76,8 +99,17 @@ class Transaction:
     @property
     def created_at(self) -> str:
         """Get the creation timestamp."""
+        if self._timestamp is None:
+            self._timestamp = format_timestamp(self._created)
         return self._timestamp
     
+    @property
+    def created_epoch(self) -> float:
+        """Get the creation time as epoch seconds, exactly as stored when the record holds it that way."""
+        if self._created is None:
+            self._created = parse_timestamp(self._timestamp)
+        return self._created
+    
     def to_dict(self) -> dict:
         """
         Serialize transaction to dictionary format.
@@ -86,17 +118,17 @@ class Transaction:
             Dictionary containing all transaction attributes
         """
         return {
-            'id': self._id,
+            'id': self.id,
             'amount': self._amount,
             'category': self._category,
             'date': self._date,
             'description': self._description,
-            'created_at': self._timestamp
+            'created_at': self.created_at
         }
     
     def __repr__(self) -> str:
         """String representation of transaction."""
-        return f"Transaction(id={self._id[:8]}, amount=${self._amount:.2f}, category={self._category}, date={self._date})"
+        return f"Transaction(id={self.id[:8]}, amount=${self._amount:.2f}, category={self._category}, date={self._date})"
     
     def __str__(self) -> str:
         """User-friendly string representation."""
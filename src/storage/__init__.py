@@ -0,0 +1 @@
+# This file is an initializer for the storage package.
\ No newline at end of file
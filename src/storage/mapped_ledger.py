@@ -0,0 +1,790 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from itertools import islice
+import heapq
+import mmap
+import os
+import struct
+import sys
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where the journal is left unlocked
+    fcntl = None
+
+from models.transaction import Transaction
+from models.columnar_ledger import (
+    ColumnarLedger, StringPool, AmbiguousIdError, ID_WIDTH, parse_day, format_day,
+    category_key, encode_id, decode_id, id_prefix_range
+)
+from models.spending_rollup import SpendingRollup
+from storage.operation_log import (
+    OP_ADD_EXPENSE, OP_UPDATE_EXPENSE, OP_DELETE_EXPENSE, OP_DELETE_WHERE,
+    frame, read_records, encode_expense, decode_expense, pack_text, unpack_text
+)
+
+LEDGER_MAGIC = b'SSLEDG01'
+LEDGER_VERSION = 2
+# Header: magic, format version, row count, category count, totals count
+HEADER = struct.Struct('<8sIQII')
+# Category table entry: label offset and length in the heap, start and length of its posting run
+CATEGORY_ENTRY = struct.Struct('<QQQQ')
+# Totals entry: day ordinal, category code, summed amount and row count of one (day, category) pair
+TOTALS_ENTRY = struct.Struct('<iIdQ')
+SECTION_ALIGNMENT = 8
+
+JOURNAL_MAGIC = b'SSJRNL01'
+# Journal header: magic, device and inode of the ledger file its records apply to
+JOURNAL_HEADER = struct.Struct('<8sQQ')
+JOURNAL_SUFFIX = '.journal'
+
+
+def section_layout(rows: int, categories: int, totals: int) -> Dict[str, Tuple[int, int]]:
+    """
+    Compute where each section of a ledger file starts and how long it is.
+    The layout depends only on the counts in the header, so it is not stored.
+    
+    Args:
+        rows: Number of expense rows
+        categories: Number of distinct category labels
+        totals: Number of distinct (day, category) pairs
+    
+    Returns:
+        Dictionary mapping section name to (offset, length); the heap runs to end of file
+    """
+    sections = (
+        ('ids', ID_WIDTH * rows),
+        ('amounts', 8 * rows),
+        ('created', 8 * rows),
+        ('days', 4 * rows),
+        ('category_codes', 4 * rows),
+        ('id_order', 4 * rows),
+        ('date_order', 4 * rows),
+        ('category_order', 4 * rows),
+        ('description_offsets', 8 * (rows + 1)),
+        ('categories', CATEGORY_ENTRY.size * categories),
+        ('totals', TOTALS_ENTRY.size * totals),
+    )
+    layout = {}
+    offset = HEADER.size
+    for name, length in sections:
+        offset += -offset % SECTION_ALIGNMENT
+        layout[name] = (offset, length)
+        offset += length
+    layout['heap'] = (offset, 0)
+    return layout
+
+
+def write_ledger_file(path: str, records: Iterable[Transaction]):
+    """
+    Write expense records to a memory-mappable ledger file.
+    
+    Every column is stored as a fixed-width little-endian array, descriptions and
+    category labels go to a trailing string heap, and three permutation columns
+    order the rows by ID, by (date, ID) and by category so lookups can bisect the file
+    without building indexes first. Amounts are also summed per (day, category) into
+    a totals section, so opening the file never reads every row to build spending
+    totals. The file is written beside the target and
+    renamed into place, so processes that still map the old file are unaffected.
+    
+    Args:
+        path: Destination file path
+        records: Transactions in insertion order
+    """
+    ids = bytearray()
+    amounts = array('d')
+    created = array('d')
+    days = array('i')
+    category_codes = array('I')
+    description_offsets = array('Q', [0])
+    heap = bytearray()
+    labels = StringPool()
+    sums: Dict[Tuple[int, int], List] = {}
+    
+    for record in records:
+        ids += encode_id(record.id)
+        amounts.append(record.amount)
+        created.append(record.created_epoch)
+        day, code = parse_day(record.date), labels.intern(record.category)
+        days.append(day)
+        category_codes.append(code)
+        heap += record.description.encode('utf-8')
+        description_offsets.append(len(heap))
+        bucket = sums.get((day, code))
+        if bucket is None:
+            sums[(day, code)] = [record.amount, 1]
+        else:
+            bucket[0] += record.amount
+            bucket[1] += 1
+    
+    rows = len(amounts)
+    id_order = array('I', sorted(range(rows), key=lambda slot: ids[slot * ID_WIDTH:(slot + 1) * ID_WIDTH]))
+    date_order = array('I', sorted(range(rows), key=lambda slot: (days[slot], ids[slot * ID_WIDTH:(slot + 1) * ID_WIDTH])))
+    category_order = array('I', sorted(range(rows), key=category_codes.__getitem__))
+    
+    # Each category owns a contiguous run of category_order
+    category_table = bytearray()
+    run_start = 0
+    run_lengths = [0] * len(labels)
+    for code in category_codes:
+        run_lengths[code] += 1
+    for code, label in labels.items():
+        encoded = label.encode('utf-8')
+        category_table += CATEGORY_ENTRY.pack(len(heap), len(encoded), run_start, run_lengths[code])
+        heap += encoded
+        run_start += run_lengths[code]
+    totals_table = b''.join(TOTALS_ENTRY.pack(day, code, amount, count)
+                            for (day, code), (amount, count) in sums.items())
+    
+    sections = {
+        'ids': ids,
+        'amounts': amounts,
+        'created': created,
+        'days': days,
+        'category_codes': category_codes,
+        'id_order': id_order,
+        'date_order': date_order,
+        'category_order': category_order,
+        'description_offsets': description_offsets,
+        'categories': category_table,
+        'totals': totals_table,
+    }
+    layout = section_layout(rows, len(labels), len(sums))
+    
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as ledger_file:
+        ledger_file.write(HEADER.pack(LEDGER_MAGIC, LEDGER_VERSION, rows, len(labels), len(sums)))
+        for name, data in sections.items():
+            ledger_file.write(b'\0' * (layout[name][0] - ledger_file.tell()))
+            ledger_file.write(data)
+        ledger_file.write(b'\0' * (layout['heap'][0] - ledger_file.tell()))
+        ledger_file.write(heap)
+        ledger_file.flush()
+        os.fsync(ledger_file.fileno())
+    os.replace(temporary_path, path)
+
+
+class MappedLedger:
+    """
+    Read-mostly expense ledger served from a memory-mapped ledger file.
+    
+    Opening maps the file and builds no indexes, since the file carries its own
+    permutation columns, and processes mapping the same file share its pages through
+    the page cache. Columns are exposed as typed memoryviews over the mapping and
+    rows are decoded into Transactions only when handed to a caller.
+    
+    The file itself is never modified in place. New rows go to an in-memory
+    ColumnarLedger overlay, updates to mapped rows are kept as per-slot overrides
+    and deletes clear a live flag. Every change is also appended to a journal beside
+    the file and fsynced before the call returns, so a crash loses nothing: the
+    journal is replayed on the next open. save() folds all of that into a fresh file
+    and empties the journal.
+    
+    Opening takes no lock, so any number of processes can read a ledger file. Each
+    write locks the journal only while it runs and first catches up with whatever
+    other processes journaled or saved since, so writers in several processes never
+    overwrite each other's changes. A process sees those changes from its next write on.
+    
+    Spending totals are loaded at open from the file's totals section, at a cost
+    proportional to the number of distinct (day, category) pairs rather than rows,
+    and then maintained incrementally, so neither opening nor the first write scans rows.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Map the ledger file at the given path, creating an empty one if missing,
+        and replay any changes journaled since it was last saved.
+        
+        Args:
+            path: Ledger file path
+        """
+        if sys.byteorder != 'little':
+            raise NotImplementedError("Mapped ledger files require a little-endian host")
+        
+        self.path = path
+        self._batch_depth = 0
+        self._replaying = False
+        if not os.path.exists(path):
+            write_ledger_file(path, [])
+        self._journal = open(path + JOURNAL_SUFFIX, 'a+b')
+        try:
+            self._load()
+        except Exception:
+            self._journal.close()
+            raise
+    
+    @staticmethod
+    def _identity(status: os.stat_result) -> bytes:
+        """Internal helper to build the journal header naming a ledger file."""
+        return JOURNAL_HEADER.pack(JOURNAL_MAGIC, status.st_dev, status.st_ino)
+    
+    def _load(self):
+        """Internal helper to map the file on disk and apply the journaled changes on top of it."""
+        self._overlay = ColumnarLedger()
+        self._overrides: Dict[int, Transaction] = {}
+        self._map()
+        self._replay_journal(0)
+    
+    def _replay_journal(self, start: int):
+        """
+        Internal helper to apply the journal records found from the given offset on.
+        A journal whose header names another file, which save() had already folded in,
+        is ignored, as is a torn record at its end; only a writer repairs either.
+        """
+        self._journal.seek(start)
+        data = self._journal.read()
+        end = 0
+        if start:
+            offset = 0
+        elif data.startswith(self._file_identity):
+            offset = end = len(self._file_identity)
+        else:
+            self._journal_end = 0
+            return
+        
+        self._replaying = True
+        try:
+            for opcode, payload, end in read_records(data, offset):
+                self._replay(opcode, payload)
+        finally:
+            self._replaying = False
+        self._journal_end = start + end
+    
+    def _acquire(self):
+        """
+        Internal helper to lock the journal for a write, then catch up with whatever
+        other processes saved or journaled since this one last looked.
+        """
+        if fcntl is not None:
+            fcntl.flock(self._journal.fileno(), fcntl.LOCK_EX)
+        try:
+            if self._identity(os.stat(self.path)) != self._file_identity:
+                self._unmap()
+                self._load()
+            elif os.fstat(self._journal.fileno()).st_size != self._journal_end:
+                self._replay_journal(self._journal_end)
+            self._repair_journal()
+        except BaseException:
+            self._release()
+            raise
+    
+    def _release(self):
+        """Internal helper to unlock the journal after a write."""
+        if fcntl is not None:
+            fcntl.flock(self._journal.fileno(), fcntl.LOCK_UN)
+    
+    def _repair_journal(self):
+        """Internal helper to restart a stale journal or cut off a torn record, with the lock held."""
+        if not self._journal_end:
+            self._reset_journal(self._journal, self._file_identity)
+            self._journal_end = len(self._file_identity)
+        elif os.fstat(self._journal.fileno()).st_size > self._journal_end:
+            self._journal.truncate(self._journal_end)
+            self._sync_journal()
+    
+    @staticmethod
+    def _reset_journal(journal, contents: bytes):
+        """Internal helper to durably replace the journal's contents."""
+        journal.truncate(0)
+        journal.write(contents)
+        journal.flush()
+        os.fsync(journal.fileno())
+    
+    def _replay(self, opcode: int, payload: bytes):
+        """Internal helper to apply one journaled change."""
+        if opcode == OP_ADD_EXPENSE:
+            expense_id, amount, date, category, description, created = decode_expense(payload)
+            self.add(amount, category, date, description, transaction_id=expense_id, created_at=created)
+        elif opcode == OP_UPDATE_EXPENSE:
+            expense_id, amount, date, category, description, _ = decode_expense(payload)
+            self.update(expense_id, amount, category, date, description)
+        elif opcode == OP_DELETE_EXPENSE:
+            self.delete(decode_id(payload))
+        elif opcode == OP_DELETE_WHERE:
+            category, offset = unpack_text(payload, 0)
+            date_from, offset = unpack_text(payload, offset)
+            date_to, _ = unpack_text(payload, offset)
+            self.delete_where(category, date_from, date_to)
+    
+    def _log(self, opcode: int, payload: bytes):
+        """
+        Internal helper to journal one change. Writes run inside a batch, which
+        syncs once when it ends. Nothing is written while the journal itself is being replayed.
+        """
+        if self._replaying:
+            return
+        record = frame(opcode, payload)
+        self._journal.write(record)
+        self._journal_end += len(record)
+    
+    def _sync_journal(self):
+        """Internal helper to flush and fsync the journal."""
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+    
+    def _map(self):
+        """Internal helper to map the file and expose its sections as typed views."""
+        self._file = open(self.path, 'rb')
+        self._file_identity = self._identity(os.fstat(self._file.fileno()))
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self._unmap()
+            raise ValueError(f"'{self.path}' is not a SpendSense ledger file")
+        magic, version, rows, categories, totals = HEADER.unpack_from(self._mmap)
+        if magic != LEDGER_MAGIC or version != LEDGER_VERSION:
+            self._unmap()
+            raise ValueError(f"'{self.path}' is not a SpendSense ledger file")
+        
+        layout = section_layout(rows, categories, totals)
+        self._rows = rows
+        self._ids_offset = layout['ids'][0]
+        self._views = [memoryview(self._mmap)]
+        
+        def column(name: str, typecode: str) -> memoryview:
+            offset, length = layout[name]
+            view = self._views[0][offset:offset + length].cast(typecode)
+            self._views.append(view)
+            return view
+        
+        self._amounts = column('amounts', 'd')
+        self._created = column('created', 'd')
+        self._days = column('days', 'i')
+        self._category_codes = column('category_codes', 'I')
+        self._id_order = column('id_order', 'I')
+        self._date_order = column('date_order', 'I')
+        self._category_order = column('category_order', 'I')
+        self._description_offsets = column('description_offsets', 'Q')
+        self._heap = self._views[0][layout['heap'][0]:]
+        self._views.append(self._heap)
+        
+        # The category table is tiny, so decode it eagerly
+        self._labels: List[str] = []
+        self._category_runs: List[Tuple[int, int]] = []
+        table_offset = layout['categories'][0]
+        for code in range(categories):
+            label_offset, label_length, run_start, run_length = CATEGORY_ENTRY.unpack_from(
+                self._mmap, table_offset + code * CATEGORY_ENTRY.size)
+            self._labels.append(str(self._heap[label_offset:label_offset + label_length], 'utf-8'))
+            self._category_runs.append((run_start, run_length))
+        
+        self._live = bytearray(b'\x01') * rows
+        self._dead = 0
+        
+        # Loaded from the stored (day, category) sums, so no row is read
+        self._rollup = SpendingRollup()
+        offset, length = layout['totals']
+        labels = self._labels
+        self._rollup.add_totals((day, labels[code], amount, count) for day, code, amount, count
+                                in TOTALS_ENTRY.iter_unpack(self._mmap[offset:offset + length]))
+    
+    def _unmap(self):
+        """Internal helper to release the typed views, the mapping and the file."""
+        for view in reversed(getattr(self, '_views', [])):
+            view.release()
+        self._views = []
+        self._mmap.close()
+        self._file.close()
+    
+    def close(self):
+        """
+        Unmap the ledger file and close the journal.
+        Changes not yet saved stay in the journal and are replayed on the next open.
+        """
+        if self._journal.closed:
+            return
+        self._unmap()
+        self._journal.close()
+    
+    def __len__(self) -> int:
+        return self._rows - self._dead + len(self._overlay)
+    
+    def _mapped_row(self, slot: int) -> Transaction:
+        """Internal helper to decode the current state of a mapped slot."""
+        override = self._overrides.get(slot)
+        if override is not None:
+            return override
+        start, end = self._description_offsets[slot], self._description_offsets[slot + 1]
+        return Transaction(
+            self._amounts[slot],
+            self._labels[self._category_codes[slot]],
+            format_day(self._days[slot]),
+            str(self._heap[start:end], 'utf-8'),
+            transaction_id=self._raw_id_at(slot),
+            created_at=self._created[slot]
+        )
+    
+    def _raw_id_at(self, slot: int) -> bytes:
+        """Internal helper to read the 16-byte identifier of a mapped slot."""
+        offset = self._ids_offset + slot * ID_WIDTH
+        return self._mmap[offset:offset + ID_WIDTH]
+    
+    def _mapped_matches(self, expense_id: str) -> List[int]:
+        """
+        Internal helper to find live mapped slots whose ID equals or starts with the given text.
+        Bisects the ID-ordered permutation column and stops after three matches.
+        """
+        if len(expense_id) == 36:
+            try:
+                low = high = encode_id(expense_id)
+            except ValueError:
+                return []
+        else:
+            id_range = id_prefix_range(expense_id)
+            if id_range is None:
+                return []
+            low, high = id_range
+        
+        order = self._id_order
+        position = bisect_left(order, low, key=self._raw_id_at)
+        matches = []
+        while position < len(order) and len(matches) < 3:
+            slot = order[position]
+            if self._raw_id_at(slot) > high:
+                break
+            if self._live[slot]:
+                matches.append(slot)
+            position += 1
+        return matches
+    
+    def _locate(self, expense_id: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Internal helper to resolve an ID across the mapped rows and the overlay.
+        
+        Returns:
+            (mapped slot, overlay slot), at most one of which is set
+        
+        Raises:
+            AmbiguousIdError: If the ID matches more than one row
+        """
+        mapped = self._mapped_matches(expense_id)
+        try:
+            overlay_slot = self._overlay.find_slot(expense_id)
+        except AmbiguousIdError as error:
+            overlay_matches = error.matches
+            overlay_slot = None
+        else:
+            overlay_matches = [] if overlay_slot is None else [self._overlay.id_at(overlay_slot)[:13]]
+        
+        if len(mapped) + len(overlay_matches) > 1:
+            raise AmbiguousIdError(expense_id, [decode_id(self._raw_id_at(slot))[:13] for slot in mapped]
+                                   + overlay_matches)
+        return (mapped[0] if mapped else None), overlay_slot
+    
+    def add(self, amount: float, category: str, date: Optional[str], description: str,
+            transaction_id: Optional[str] = None, created_at: Optional[float] = None) -> Transaction:
+        """Append a row to the in-memory overlay and journal it. See ColumnarLedger.add."""
+        with self._writing():
+            if transaction_id and len(transaction_id) == 36 and self._mapped_matches(transaction_id):
+                raise ValueError(f"Duplicate transaction ID '{transaction_id}'")
+            record = self._overlay.add(amount, category, date, description, transaction_id, created_at)
+            self._track(None, record)
+            self._log(OP_ADD_EXPENSE, encode_expense(record))
+            return record
+    
+    def add_many(self, rows: Iterable[Tuple[float, str, Optional[str], str]]) -> List[Transaction]:
+        """Append a batch of rows to the in-memory overlay and journal them. See ColumnarLedger.add_many."""
+        with self._writing():
+            records = self._overlay.add_many(rows)
+            self._rollup.add_many((parse_day(record.date), record.category, record.amount) for record in records)
+            for record in records:
+                self._log(OP_ADD_EXPENSE, encode_expense(record))
+            return records
+    
+    def get(self, expense_id: str) -> Optional[Transaction]:
+        """
+        Fetch a row by full ID or unambiguous ID prefix.
+        
+        Returns:
+            Transaction or None if not found
+        
+        Raises:
+            AmbiguousIdError: If a partial ID matches more than one row
+        """
+        mapped_slot, overlay_slot = self._locate(expense_id)
+        if mapped_slot is not None:
+            return self._mapped_row(mapped_slot)
+        if overlay_slot is not None:
+            return self._overlay.row(overlay_slot)
+        return None
+    
+    def update(self, expense_id: str, amount: float = None, category: str = None,
+               date: str = None, description: str = None) -> Optional[Transaction]:
+        """
+        Update a row located by full ID or unambiguous ID prefix.
+        Mapped rows are overridden in memory and the change is journaled; the file is untouched until save().
+        
+        Returns:
+            Transaction with the new values or None if not found
+        """
+        with self._writing():
+            mapped_slot, overlay_slot = self._locate(expense_id)
+            if overlay_slot is not None:
+                previous = self._overlay.row(overlay_slot)
+                record = self._overlay.update_slot(overlay_slot, amount, category, date, description)
+            elif mapped_slot is not None:
+                previous = self._mapped_row(mapped_slot)
+                record = Transaction(
+                    float(amount) if amount is not None else previous.amount,
+                    category if category is not None else previous.category,
+                    format_day(parse_day(date)) if date is not None else previous.date,
+                    description if description is not None else previous.description,
+                    transaction_id=self._raw_id_at(mapped_slot),
+                    created_at=self._created[mapped_slot]
+                )
+                self._overrides[mapped_slot] = record
+            else:
+                return None
+            
+            self._track(previous, record)
+            self._log(OP_UPDATE_EXPENSE, encode_expense(record))
+            return record
+    
+    def delete(self, expense_id: str) -> bool:
+        """
+        Delete a row located by full ID or unambiguous ID prefix.
+        
+        Returns:
+            True if a row was deleted, False if not found
+        """
+        with self._writing():
+            mapped_slot, overlay_slot = self._locate(expense_id)
+            if overlay_slot is not None:
+                previous = self._overlay.row(overlay_slot)
+                self._overlay.delete_slot(overlay_slot)
+            elif mapped_slot is not None:
+                previous = self._mapped_row(mapped_slot)
+                self._overrides.pop(mapped_slot, None)
+                self._live[mapped_slot] = 0
+                self._dead += 1
+            else:
+                return False
+            
+            self._track(previous, None)
+            self._log(OP_DELETE_EXPENSE, encode_id(previous.id))
+            return True
+    
+    def select(self, category: Optional[str] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None) -> List[Transaction]:
+        """
+        Fetch the rows matching the given filters, mapped rows first, each part in insertion order.
+        
+        Args:
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+        
+        Returns:
+            List of matching Transactions
+        """
+        key = category_key(category) if category else None
+        first_day = parse_day(date_from) if date_from else None
+        last_day = parse_day(date_to) if date_to else None
+        
+        slots = self._matching_slots(key, first_day, last_day)
+        results = [self._mapped_row(slot) for slot in slots]
+        results.extend(self._overlay.select(category, date_from, date_to))
+        return results
+    
+    def delete_where(self, category: Optional[str] = None, date_from: Optional[str] = None,
+                     date_to: Optional[str] = None) -> int:
+        """
+        Delete every row matching the given filters in one pass.
+        Mapped rows only have their live flag cleared; the overlay deletes its own rows.
+        
+        Args:
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+        
+        Returns:
+            Number of rows deleted
+        """
+        with self._writing():
+            key = category_key(category) if category else None
+            first_day = parse_day(date_from) if date_from else None
+            last_day = parse_day(date_to) if date_to else None
+            
+            slots = self._matching_slots(key, first_day, last_day)
+            removed = [self._mapped_row(slot) for slot in slots]
+            removed.extend(self._overlay.select(category, date_from, date_to))
+            self._rollup.remove_many((parse_day(record.date), record.category, record.amount)
+                                     for record in removed)
+            for slot in slots:
+                self._overrides.pop(slot, None)
+                self._live[slot] = 0
+            self._dead += len(slots)
+            deleted = len(slots) + self._overlay.delete_where(category, date_from, date_to)
+            if deleted:
+                self._log(OP_DELETE_WHERE, pack_text(category) + pack_text(date_from) + pack_text(date_to))
+            return deleted
+    
+    def _matching_slots(self, key: Optional[str], first_day: Optional[int],
+                        last_day: Optional[int]) -> List[int]:
+        """Internal helper to find matching live mapped slots, overridden ones included, in slot order."""
+        slots = self._mapped_candidates(key, first_day, last_day)
+        # Overridden rows may no longer match what the file's indexes say about them
+        slots.extend(slot for slot, record in self._overrides.items()
+                     if (key is None or category_key(record.category) == key)
+                     and (first_day is None or parse_day(record.date) >= first_day)
+                     and (last_day is None or parse_day(record.date) <= last_day))
+        slots.sort()
+        return slots
+    
+    def page(self, limit: int, after: Optional[Tuple[str, str]] = None, category: Optional[str] = None,
+             date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Transaction]:
+        """
+        Fetch up to limit matching rows ordered by (date, ID), starting after a keyset position.
+        Mapped rows are read in order from the (date, ID) permutation column and merged
+        with the overlay and any overridden rows.
+        
+        Args:
+            limit: Maximum number of rows to return
+            after: (date, full ID) of the last row of the previous page
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+        
+        Returns:
+            List of Transactions in (date, ID) order
+        """
+        key = category_key(category) if category else None
+        first_day = parse_day(date_from) if date_from else None
+        last_day = parse_day(date_to) if date_to else None
+        after_key = (parse_day(after[0]), encode_id(after[1])) if after is not None else None
+        
+        days, order = self._days, self._date_order
+        sort_key = lambda slot: (days[slot], self._raw_id_at(slot))
+        start = bisect_left(order, (first_day, b''), key=sort_key) if first_day is not None else 0
+        end = bisect_left(order, (last_day + 1, b''), key=sort_key) if last_day is not None else len(order)
+        if after_key is not None:
+            start = max(start, bisect_right(order, after_key, key=sort_key))
+        codes = {code for code, label in enumerate(self._labels) if key is None or category_key(label) == key}
+        
+        mapped = []
+        position = start
+        while position < end and len(mapped) < limit:
+            slot = order[position]
+            if self._live[slot] and slot not in self._overrides and self._category_codes[slot] in codes:
+                mapped.append(self._mapped_row(slot))
+            position += 1
+        
+        overridden = sorted((record for record in self._overrides.values()
+                             if (key is None or category_key(record.category) == key)
+                             and (first_day is None or parse_day(record.date) >= first_day)
+                             and (last_day is None or parse_day(record.date) <= last_day)
+                             and (after_key is None or (parse_day(record.date), encode_id(record.id)) > after_key)),
+                            key=self._page_key)
+        added = self._overlay.page(limit, after, category, date_from, date_to)
+        return list(islice(heapq.merge(mapped, overridden, added, key=self._page_key), limit))
+    
+    @staticmethod
+    def _page_key(record: Transaction) -> Tuple[str, bytes]:
+        """Internal helper giving the (date, ID) ordering used by keyset pages."""
+        return record.date, encode_id(record.id)
+    
+    def _mapped_candidates(self, key: Optional[str], first_day: Optional[int],
+                           last_day: Optional[int]) -> List[int]:
+        """
+        Internal helper to filter mapped slots through the permutation columns.
+        Overridden and deleted slots are left out.
+        """
+        days = self._days
+        if key is not None:
+            runs = [self._category_order[start:start + length]
+                    for code, (start, length) in enumerate(self._category_runs)
+                    if category_key(self._labels[code]) == key]
+            candidates = heapq.merge(*runs)
+            if first_day is not None or last_day is not None:
+                candidates = (slot for slot in candidates
+                              if (first_day is None or days[slot] >= first_day)
+                              and (last_day is None or days[slot] <= last_day))
+        elif first_day is not None or last_day is not None:
+            order = self._date_order
+            start = bisect_left(order, first_day, key=days.__getitem__) if first_day is not None else 0
+            end = bisect_right(order, last_day, key=days.__getitem__) if last_day is not None else len(order)
+            candidates = sorted(order[start:end])
+        else:
+            candidates = range(self._rows)
+        
+        live, overrides = self._live, self._overrides
+        return [slot for slot in candidates if live[slot] and slot not in overrides]
+    
+    def rows(self) -> Iterator[Transaction]:
+        """Iterate over all rows, mapped rows first, each part in insertion order."""
+        live = self._live
+        for slot in range(self._rows):
+            if live[slot]:
+                yield self._mapped_row(slot)
+        yield from self._overlay.rows()
+    
+    def category_counts(self) -> List[Tuple[str, int]]:
+        """
+        List distinct categories with their row counts.
+        Spellings that differ only in case are reported once, under the first label seen.
+        
+        Returns:
+            (category, count) pairs ordered by category name
+        """
+        folded: Dict[str, List] = {}
+        for label, count in self.rollup.category_counts().items():
+            entry = folded.setdefault(category_key(label), [label, 0])
+            entry[1] += count
+        return sorted(((label, count) for label, count in folded.values()),
+                      key=lambda pair: category_key(pair[0]))
+    
+    @contextmanager
+    def batch(self):
+        """Group several writes so they hold the journal lock once and their records share one fsync."""
+        if not self._batch_depth:
+            self._acquire()
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                try:
+                    self._sync_journal()
+                finally:
+                    self._release()
+    
+    @contextmanager
+    def _writing(self):
+        """Internal helper to run a write as a batch of its own, unless it is being replayed."""
+        if self._replaying:
+            yield
+        else:
+            with self.batch():
+                yield
+    
+    @property
+    def rollup(self) -> SpendingRollup:
+        """Get the running spending totals."""
+        return self._rollup
+    
+    def _track(self, previous: Optional[Transaction], current: Optional[Transaction]):
+        """Internal helper to apply a row change to the totals."""
+        if previous is not None:
+            self._rollup.remove(parse_day(previous.date), previous.category, previous.amount)
+        if current is not None:
+            self._rollup.add(parse_day(current.date), current.category, current.amount)
+    
+    def save(self):
+        """
+        Rewrite the ledger file with every pending change folded in, map the new file
+        and empty the journal. Until the journal is emptied its header still names the
+        old file, so a crash in between never replays changes the new file already holds.
+        Nothing is rewritten when the journal holds no changes, from this process or any other.
+        """
+        with self.batch():
+            if self._journal_end <= len(self._file_identity):
+                return
+            write_ledger_file(self.path, list(self.rows()))
+            self._unmap()
+            self._overlay = ColumnarLedger()
+            self._overrides = {}
+            self._map()
+            self._reset_journal(self._journal, self._file_identity)
+            self._journal_end = len(self._file_identity)
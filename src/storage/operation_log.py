@@ -0,0 +1,546 @@
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+import re
+import struct
+import threading
+import zlib
+
+from models.transaction import Transaction
+from models.budget_plan import BudgetPlan
+from models.columnar_ledger import ColumnarLedger, parse_day, format_day, encode_id, decode_id
+
+# Every record is framed as (opcode, payload length, CRC32 of payload)
+FRAME = struct.Struct('<BII')
+EXPENSE_FIELDS = struct.Struct('<16sdid')
+TEXT_LENGTH = struct.Struct('<I')
+AMOUNT = struct.Struct('<d')
+NO_TEXT = 0xFFFFFFFF
+
+OP_ADD_EXPENSE = 1
+OP_UPDATE_EXPENSE = 2
+OP_DELETE_EXPENSE = 3
+OP_SET_BUDGET = 4
+OP_DELETE_BUDGET = 5
+OP_DELETE_WHERE = 6
+
+SNAPSHOT_MAGIC = b'SSNAP001'
+SNAPSHOT_HEADER = struct.Struct('<8sQ')
+SNAPSHOT_NAME = 'snapshot.bin'
+SEGMENT_PATTERN = re.compile(r'^ops-(\d{8})\.log$')
+
+
+def segment_name(number: int) -> str:
+    """Return the file name of a numbered log segment."""
+    return f"ops-{number:08d}.log"
+
+
+def pack_text(value: Optional[str]) -> bytes:
+    """Encode optional text as a length prefix followed by UTF-8 bytes."""
+    if value is None:
+        return TEXT_LENGTH.pack(NO_TEXT)
+    data = value.encode('utf-8')
+    return TEXT_LENGTH.pack(len(data)) + data
+
+
+def unpack_text(payload: bytes, offset: int) -> Tuple[Optional[str], int]:
+    """
+    Decode text written by pack_text.
+    
+    Returns:
+        (text, offset just past it)
+    """
+    (length,) = TEXT_LENGTH.unpack_from(payload, offset)
+    offset += TEXT_LENGTH.size
+    if length == NO_TEXT:
+        return None, offset
+    return payload[offset:offset + length].decode('utf-8'), offset + length
+
+
+def frame(opcode: int, payload: bytes) -> bytes:
+    """Wrap a payload in a checksummed record frame."""
+    return FRAME.pack(opcode, len(payload), zlib.crc32(payload)) + payload
+
+
+def encode_expense(record: Transaction) -> bytes:
+    """
+    Encode the full state of an expense row as a record payload.
+    The creation time is packed as the ledger's epoch float, never round-tripped
+    through local ISO text, which drops precision and is ambiguous across DST changes.
+    """
+    fields = EXPENSE_FIELDS.pack(encode_id(record.id), record.amount, parse_day(record.date),
+                                 record.created_epoch)
+    return fields + pack_text(record.category) + pack_text(record.description)
+
+
+def decode_expense(payload: bytes) -> Tuple[str, float, str, str, str, float]:
+    """
+    Decode an expense payload.
+    
+    Returns:
+        (id, amount, date, category, description, created_at epoch seconds)
+    """
+    raw_id, amount, day, category, description, created = decode_stored_expense(payload)
+    return decode_id(raw_id), amount, format_day(day), category, description, created
+
+
+def decode_stored_expense(payload: bytes) -> Tuple[bytes, float, int, str, str, float]:
+    """
+    Decode an expense payload into the ledger's stored form, as taken by ColumnarLedger.restore_many.
+    
+    Returns:
+        (16-byte ID, amount, day ordinal, category, description, created_at epoch seconds)
+    """
+    raw_id, amount, day, created = EXPENSE_FIELDS.unpack_from(payload)
+    category, offset = unpack_text(payload, EXPENSE_FIELDS.size)
+    description, _ = unpack_text(payload, offset)
+    return raw_id, amount, day, category, description, created
+
+
+def encode_budget(budget: BudgetPlan) -> bytes:
+    """Encode the full state of a budget plan as a record payload."""
+    return (AMOUNT.pack(budget.amount) + pack_text(budget.id) + pack_text(budget.month)
+            + pack_text(budget.category) + pack_text(budget.created_at))
+
+
+def decode_budget(payload: bytes) -> BudgetPlan:
+    """Rebuild a budget plan from a record payload."""
+    (amount,) = AMOUNT.unpack_from(payload)
+    budget_id, offset = unpack_text(payload, AMOUNT.size)
+    month, offset = unpack_text(payload, offset)
+    category, offset = unpack_text(payload, offset)
+    created, _ = unpack_text(payload, offset)
+    return BudgetPlan(amount, month, category, budget_id=budget_id, created_at=created)
+
+
+def read_records(data: bytes, offset: int = 0) -> Iterator[Tuple[int, bytes, int]]:
+    """
+    Iterate over the intact records in a buffer.
+    Stops at the first truncated or corrupt frame, which marks a torn write.
+    
+    Returns:
+        Iterator of (opcode, payload, offset of the next record)
+    """
+    while offset + FRAME.size <= len(data):
+        opcode, length, checksum = FRAME.unpack_from(data, offset)
+        start = offset + FRAME.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return
+        offset = start + length
+        yield opcode, payload, offset
+
+
+class OperationLog:
+    """
+    Durable storage for the in-memory ledger built from an append-only operation log.
+    
+    Each write is applied to a ColumnarLedger (or the budget map) and then appended
+    to the current log segment as a compact checksummed binary record. Writers wait
+    for their record to be fsynced using group commit: the first waiter flushes and
+    syncs everything written so far while later arrivals wait for that sync, so one
+    fsync covers every write that raced in behind it.
+    
+    snapshot() rotates to a fresh segment and writes the live rows and budgets to a
+    snapshot file, after which older segments are deleted. A background thread takes
+    snapshots at a fixed interval, so recovery loads the snapshot and replays only
+    the operations logged since.
+    """
+    
+    def __init__(self, directory: str, snapshot_interval: Optional[float] = 300.0, fsync: bool = True):
+        """
+        Recover state from the given directory and open the log for appending.
+        
+        Args:
+            directory: Directory holding the snapshot and log segments (created if missing)
+            snapshot_interval: Seconds between background snapshots (None disables them)
+            fsync: Whether writers wait for their records to reach stable storage
+        """
+        self.directory = directory
+        self._fsync = fsync
+        self._lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+        self._sync_condition = threading.Condition()
+        self._syncing = False
+        self._written = 0
+        self._synced = 0
+        self._batch = threading.local()
+        self._memory = ColumnarLedger()
+        self._budgets: Dict[str, bytes] = {}
+        
+        os.makedirs(directory, exist_ok=True)
+        self._segment = self._recover()
+        self._file = open(self._segment_path(self._segment), 'ab')
+        
+        self.ledger = LoggedLedger(self, self._memory)
+        self.budgets = LoggedBudgetStore(self)
+        
+        self._stopped = threading.Event()
+        self._snapshot_thread = None
+        if snapshot_interval:
+            self._snapshot_thread = threading.Thread(target=self._snapshot_loop, args=(snapshot_interval,),
+                                                     name='operation-log-snapshot', daemon=True)
+            self._snapshot_thread.start()
+    
+    def _segment_path(self, number: int) -> str:
+        """Internal helper to build the path of a log segment."""
+        return os.path.join(self.directory, segment_name(number))
+    
+    def _segments(self) -> List[int]:
+        """Internal helper to list the numbers of the segments on disk, oldest first."""
+        numbers = []
+        for name in os.listdir(self.directory):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+    
+    def _recover(self) -> int:
+        """
+        Load the latest snapshot, then replay the log segments written after it.
+        A torn record at the end of the newest segment is truncated away.
+        
+        Returns:
+            Number of the segment to keep appending to
+        """
+        first_segment = 1
+        pending: List[tuple] = []
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_NAME)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'rb') as snapshot_file:
+                data = snapshot_file.read()
+            magic, first_segment = SNAPSHOT_HEADER.unpack_from(data)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"'{snapshot_path}' is not a SpendSense snapshot")
+            for opcode, payload, _ in read_records(data, SNAPSHOT_HEADER.size):
+                self._replay(opcode, payload, pending)
+        
+        segments = [number for number in self._segments() if number >= first_segment]
+        for number in segments:
+            path = self._segment_path(number)
+            with open(path, 'rb') as segment_file:
+                data = segment_file.read()
+            end = 0
+            for opcode, payload, end in read_records(data):
+                self._replay(opcode, payload, pending)
+            if end < len(data):
+                with open(path, 'r+b') as segment_file:
+                    segment_file.truncate(end)
+        self._restore(pending)
+        
+        return segments[-1] if segments else first_segment
+    
+    def _replay(self, opcode: int, payload: bytes, pending: List[tuple]):
+        """
+        Internal helper to apply one recovered record to the in-memory state.
+        Added expenses are collected in pending and loaded in bulk before any other
+        record touches the ledger, since a snapshot is almost entirely adds.
+        """
+        if opcode == OP_ADD_EXPENSE:
+            pending.append(decode_stored_expense(payload))
+            return
+        self._restore(pending)
+        if opcode == OP_UPDATE_EXPENSE:
+            expense_id, amount, date, category, description, _ = decode_expense(payload)
+            self._memory.update(expense_id, amount, category, date, description)
+        elif opcode == OP_DELETE_EXPENSE:
+            self._memory.delete(decode_id(payload))
+        elif opcode == OP_DELETE_WHERE:
+            category, offset = unpack_text(payload, 0)
+            date_from, offset = unpack_text(payload, offset)
+            date_to, _ = unpack_text(payload, offset)
+            self._memory.delete_where(category, date_from, date_to)
+        elif opcode == OP_SET_BUDGET:
+            self._budgets[decode_budget(payload).id] = payload
+        elif opcode == OP_DELETE_BUDGET:
+            self._budgets.pop(unpack_text(payload, 0)[0], None)
+    
+    def _restore(self, pending: List[tuple]):
+        """Internal helper to load the collected added expenses into the ledger in one batch."""
+        if pending:
+            self._memory.restore_many(pending)
+            pending.clear()
+    
+    def append(self, opcode: int, payload: bytes) -> int:
+        """
+        Append a record to the current segment. Callers hold the log lock so the
+        order of records matches the order in which changes were applied.
+        
+        Returns:
+            Sequence number to pass to wait_durable
+        """
+        with self._lock:
+            self._file.write(frame(opcode, payload))
+            self._written += 1
+            return self._written
+    
+    def wait_durable(self, sequence: int):
+        """
+        Block until the record with the given sequence number is on stable storage.
+        Inside batch() the wait is deferred until the batch ends.
+        """
+        if getattr(self._batch, 'depth', 0):
+            self._batch.sequence = sequence
+            return
+        if not self._fsync:
+            with self._lock:
+                self._file.flush()
+            return
+        
+        with self._sync_condition:
+            while self._synced < sequence:
+                if not self._syncing:
+                    self._syncing = True
+                    break
+                self._sync_condition.wait()
+            else:
+                return
+        
+        # This thread leads the group commit for everything written so far
+        target = self._synced
+        try:
+            with self._lock:
+                self._file.flush()
+                target = self._written
+                descriptor = os.dup(self._file.fileno())
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+        finally:
+            with self._sync_condition:
+                self._syncing = False
+                self._synced = max(self._synced, target)
+                self._sync_condition.notify_all()
+    
+    @contextmanager
+    def batch(self):
+        """Defer durability waits so a group of writes shares a single fsync."""
+        depth = getattr(self._batch, 'depth', 0)
+        self._batch.depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._batch.depth = depth
+        if depth == 0:
+            sequence = getattr(self._batch, 'sequence', 0)
+            self._batch.sequence = 0
+            if sequence:
+                self.wait_durable(sequence)
+    
+    @property
+    def lock(self) -> threading.RLock:
+        """Get the lock that orders state changes with their log records."""
+        return self._lock
+    
+    def budget_payloads(self) -> Dict[str, bytes]:
+        """Get the encoded budget plans, keyed by budget ID."""
+        return self._budgets
+    
+    def snapshot(self):
+        """
+        Write a compacted snapshot of the current state and drop the log segments it covers.
+        Only copying the columns and rotating the segment hold the log lock; building
+        the rows, encoding and writing the snapshot happen while other writers carry on.
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                expenses = self._memory.detached_rows()
+                budgets = list(self._budgets.values())
+                self._rotate()
+                first_segment = self._segment
+            
+            temporary_path = os.path.join(self.directory, SNAPSHOT_NAME + '.tmp')
+            with open(temporary_path, 'wb') as snapshot_file:
+                snapshot_file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, first_segment))
+                for record in expenses:
+                    snapshot_file.write(frame(OP_ADD_EXPENSE, encode_expense(record)))
+                for payload in budgets:
+                    snapshot_file.write(frame(OP_SET_BUDGET, payload))
+                snapshot_file.flush()
+                os.fsync(snapshot_file.fileno())
+            os.replace(temporary_path, os.path.join(self.directory, SNAPSHOT_NAME))
+            self._sync_directory()
+            
+            for number in self._segments():
+                if number < first_segment:
+                    os.remove(self._segment_path(number))
+    
+    def _rotate(self):
+        """Internal helper to seal the current segment and start appending to a new one."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        with self._sync_condition:
+            self._synced = max(self._synced, self._written)
+            self._sync_condition.notify_all()
+        
+        self._segment += 1
+        self._file = open(self._segment_path(self._segment), 'ab')
+    
+    def _sync_directory(self):
+        """Internal helper to make renames in the log directory durable where supported."""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        descriptor = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+    
+    def _snapshot_loop(self, interval: float):
+        """Background task that snapshots at a fixed interval until the log is closed."""
+        last_snapshot = self._written
+        while not self._stopped.wait(interval):
+            # Skip idle intervals so an unchanged ledger is not rewritten
+            if self._written != last_snapshot:
+                last_snapshot = self._written
+                self.snapshot()
+    
+    def close(self):
+        """Stop background snapshots and sync and close the current segment."""
+        self._stopped.set()
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+
+class LoggedLedger:
+    """
+    ColumnarLedger wrapper that records every write in an OperationLog.
+    Reads go straight to the in-memory ledger.
+    """
+    
+    def __init__(self, log: OperationLog, ledger: ColumnarLedger):
+        self._log = log
+        self._ledger = ledger
+    
+    def __len__(self) -> int:
+        return len(self._ledger)
+    
+    def add(self, amount: float, category: str, date: Optional[str], description: str,
+            transaction_id: Optional[str] = None, created_at: Optional[float] = None) -> Transaction:
+        """Append a row and log it. See ColumnarLedger.add."""
+        with self._log.lock:
+            record = self._ledger.add(amount, category, date, description, transaction_id, created_at)
+            sequence = self._log.append(OP_ADD_EXPENSE, encode_expense(record))
+        self._log.wait_durable(sequence)
+        return record
+    
+    def add_many(self, rows: Iterable[Tuple[float, str, Optional[str], str]]) -> List[Transaction]:
+        """Append a batch of rows and log them behind a single fsync. See ColumnarLedger.add_many."""
+        with self._log.lock:
+            records = self._ledger.add_many(rows)
+            sequence = 0
+            for record in records:
+                sequence = self._log.append(OP_ADD_EXPENSE, encode_expense(record))
+        if sequence:
+            self._log.wait_durable(sequence)
+        return records
+    
+    def update(self, expense_id: str, amount: float = None, category: str = None,
+               date: str = None, description: str = None) -> Optional[Transaction]:
+        """Update a row and log its new state. See ColumnarLedger.update."""
+        with self._log.lock:
+            record = self._ledger.update(expense_id, amount, category, date, description)
+            if record is None:
+                return None
+            sequence = self._log.append(OP_UPDATE_EXPENSE, encode_expense(record))
+        self._log.wait_durable(sequence)
+        return record
+    
+    def delete(self, expense_id: str) -> bool:
+        """Delete a row and log it. See ColumnarLedger.delete."""
+        with self._log.lock:
+            record = self._ledger.get(expense_id)
+            if record is None:
+                return False
+            self._ledger.delete(record.id)
+            sequence = self._log.append(OP_DELETE_EXPENSE, encode_id(record.id))
+        self._log.wait_durable(sequence)
+        return True
+    
+    def delete_where(self, category: Optional[str] = None, date_from: Optional[str] = None,
+                     date_to: Optional[str] = None) -> int:
+        """
+        Delete every row matching the filters and log the filters as a single record.
+        Replay applies the same filters at the same point in the log, so it removes the same rows.
+        See ColumnarLedger.delete_where.
+        """
+        with self._log.lock:
+            deleted = self._ledger.delete_where(category, date_from, date_to)
+            if not deleted:
+                return 0
+            sequence = self._log.append(OP_DELETE_WHERE,
+                                        pack_text(category) + pack_text(date_from) + pack_text(date_to))
+        self._log.wait_durable(sequence)
+        return deleted
+    
+    def get(self, expense_id: str) -> Optional[Transaction]:
+        """Fetch a row by full or partial ID. See ColumnarLedger.get."""
+        return self._ledger.get(expense_id)
+    
+    def select(self, category: Optional[str] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None) -> List[Transaction]:
+        """Fetch the rows matching the given filters. See ColumnarLedger.select."""
+        return self._ledger.select(category, date_from, date_to)
+    
+    def page(self, limit: int, after: Optional[Tuple[str, str]] = None, category: Optional[str] = None,
+             date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Transaction]:
+        """Fetch one keyset page ordered by (date, ID). See ColumnarLedger.page."""
+        return self._ledger.page(limit, after, category, date_from, date_to)
+    
+    def rows(self) -> Iterator[Transaction]:
+        """Iterate over all rows in insertion order."""
+        return self._ledger.rows()
+    
+    def category_counts(self) -> List[Tuple[str, int]]:
+        """List distinct categories with their row counts. See ColumnarLedger.category_counts."""
+        return self._ledger.category_counts()
+    
+    def batch(self):
+        """Group several writes so they share one fsync."""
+        return self._log.batch()
+    
+    @property
+    def rollup(self):
+        """Get the running spending totals of the in-memory ledger."""
+        return self._ledger.rollup
+
+
+class LoggedBudgetStore:
+    """
+    Budget store for SenseController that records every change in an OperationLog.
+    """
+    
+    def __init__(self, log: OperationLog):
+        self._log = log
+    
+    def load_all(self) -> List[BudgetPlan]:
+        """Rebuild every recovered budget plan."""
+        return [decode_budget(payload) for payload in self._log.budget_payloads().values()]
+    
+    def save(self, budget: BudgetPlan):
+        """Log the current state of a budget plan."""
+        payload = encode_budget(budget)
+        with self._log.lock:
+            self._log.budget_payloads()[budget.id] = payload
+            sequence = self._log.append(OP_SET_BUDGET, payload)
+        self._log.wait_durable(sequence)
+    
+    def delete(self, budget_id: str) -> bool:
+        """
+        Log the removal of a budget plan.
+        
+        Returns:
+            True if a budget was removed, False if not found
+        """
+        with self._log.lock:
+            if self._log.budget_payloads().pop(budget_id, None) is None:
+                return False
+            sequence = self._log.append(OP_DELETE_BUDGET, pack_text(budget_id))
+        self._log.wait_durable(sequence)
+        return True
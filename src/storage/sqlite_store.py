@@ -0,0 +1,517 @@
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import sqlite3
+import threading
+import time
+
+from models.transaction import Transaction
+from models.budget_plan import BudgetPlan
+from models.columnar_ledger import (
+    AmbiguousIdError, parse_day, format_day, category_key, encode_id, decode_id, id_prefix_range
+)
+from utils.identifiers import new_raw_id
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    seq INTEGER PRIMARY KEY,
+    id BLOB NOT NULL UNIQUE,
+    amount REAL NOT NULL,
+    category TEXT NOT NULL,
+    category_key TEXT NOT NULL,
+    date TEXT NOT NULL,
+    description TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_date_id ON expenses (date, id);
+CREATE INDEX IF NOT EXISTS idx_expenses_category_date_id ON expenses (category_key, date, id);
+CREATE TABLE IF NOT EXISTS budgets (
+    id TEXT PRIMARY KEY,
+    amount REAL NOT NULL,
+    month TEXT NOT NULL,
+    category TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_budgets_month_category ON budgets (month, category);
+"""
+
+# Statements are kept as constants so sqlite3's per-connection cache reuses the prepared form
+EXPENSE_COLUMNS = "id, amount, category, date, description, created_at"
+INSERT_EXPENSE = ("INSERT INTO expenses (id, amount, category, category_key, date, description, created_at) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?)")
+SELECT_EXPENSE_BY_ID = f"SELECT {EXPENSE_COLUMNS} FROM expenses WHERE id = ?"
+SELECT_IDS_IN_RANGE = "SELECT id FROM expenses WHERE id BETWEEN ? AND ? ORDER BY id LIMIT 3"
+SELECT_ALL_EXPENSES = f"SELECT {EXPENSE_COLUMNS} FROM expenses ORDER BY seq"
+UPDATE_EXPENSE = ("UPDATE expenses SET amount = COALESCE(?, amount), category = COALESCE(?, category), "
+                  "category_key = COALESCE(?, category_key), date = COALESCE(?, date), "
+                  "description = COALESCE(?, description) WHERE id = ?")
+DELETE_EXPENSE = "DELETE FROM expenses WHERE id = ?"
+COUNT_EXPENSES = "SELECT COUNT(*), COALESCE(SUM(amount), 0) FROM expenses"
+CATEGORY_COUNTS = ("SELECT category, MIN(seq), COUNT(*) FROM expenses "
+                   "GROUP BY category_key ORDER BY category_key")
+
+SELECT_ALL_BUDGETS = "SELECT id, amount, month, category, created_at FROM budgets ORDER BY rowid"
+UPSERT_BUDGET = ("INSERT INTO budgets (id, amount, month, category, created_at) VALUES (?, ?, ?, ?, ?) "
+                 "ON CONFLICT (id) DO UPDATE SET amount = excluded.amount")
+DELETE_BUDGET = "DELETE FROM budgets WHERE id = ?"
+
+
+def month_bounds(month: str) -> Tuple[str, str]:
+    """
+    Turn a YYYY-MM month into an inclusive pair of YYYY-MM-DD bounds.
+    Day 31 is a safe upper bound for every month since dates compare as text.
+    """
+    return f"{month}-01", f"{month}-31"
+
+
+class SQLiteStorage:
+    """
+    Durable storage backed by a single SQLite database file.
+    Owns the connection and hands out a ledger for expenses and a store for budgets.
+    
+    The database runs in WAL mode with synchronous=NORMAL, so readers never block
+    the writer and each commit costs one WAL append rather than a full sync.
+    Writes commit immediately unless they run inside batch(), which groups them
+    into a single transaction. The connection is shared between request threads
+    and serialized with a lock.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open (creating if needed) the database at the given path.
+        
+        Args:
+            path: Database file path, or ':memory:' for a throwaway database
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False,
+                                           isolation_level=None, cached_statements=64)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        
+        self.ledger = SQLiteLedger(self)
+        self.budgets = SQLiteBudgetStore(self)
+    
+    def query(self, sql: str, parameters: tuple = ()) -> List[tuple]:
+        """Run a read statement and return every row."""
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+    
+    def write(self, sql: str, parameters: tuple = ()) -> int:
+        """
+        Run a write statement, committing it unless a batch is open.
+        
+        Returns:
+            Number of rows changed
+        """
+        with self._lock:
+            if self._batch_depth:
+                return self._connection.execute(sql, parameters).rowcount
+            with self._transaction():
+                return self._connection.execute(sql, parameters).rowcount
+    
+    def write_many(self, sql: str, rows: List[tuple]) -> int:
+        """
+        Run a write statement once per parameter tuple, committing them together unless a batch is open.
+        
+        Returns:
+            Number of rows changed
+        """
+        with self.batch():
+            return self._connection.executemany(sql, rows).rowcount
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group writes into one transaction that commits when the outermost batch exits.
+        An exception rolls back every write made inside the batch.
+        """
+        with self._lock:
+            if self._batch_depth:
+                self._batch_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._batch_depth -= 1
+                return
+            
+            with self._transaction():
+                self._batch_depth = 1
+                try:
+                    yield self
+                finally:
+                    self._batch_depth = 0
+    
+    @contextmanager
+    def _transaction(self):
+        """Internal helper to wrap statements in BEGIN/COMMIT, rolling back on error."""
+        self._connection.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+    
+    @property
+    def data_version(self) -> int:
+        """
+        Get SQLite's data version, which changes whenever another connection, in this
+        process or any other, commits a change. Commits made through this connection leave it alone.
+        """
+        return self.query("PRAGMA data_version")[0][0]
+    
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class SQLiteLedger:
+    """
+    Expense storage with the same interface as ColumnarLedger, persisted to SQLite.
+    Filters and aggregates are answered by indexed SQL queries, so only the rows
+    a caller asked for are ever loaded into Python.
+    """
+    
+    def __init__(self, storage: SQLiteStorage):
+        self._storage = storage
+        self._rollup = SQLiteRollup(storage)
+    
+    def __len__(self) -> int:
+        return self._storage.query(COUNT_EXPENSES)[0][0]
+    
+    def add(self, amount: float, category: str, date: Optional[str], description: str,
+            transaction_id: Optional[str] = None, created_at: Optional[float] = None) -> Transaction:
+        """
+        Insert a new expense row.
+        
+        Args:
+            amount: Transaction amount
+            category: Spending category
+            date: Transaction date in YYYY-MM-DD format (None for today)
+            description: Transaction description
+            transaction_id: Existing identifier to preserve (auto-generated if not provided)
+            created_at: Creation time as an epoch timestamp (defaults to now)
+        
+        Returns:
+            Transaction for the new row
+        """
+        raw_id = encode_id(transaction_id) if transaction_id else new_raw_id()
+        amount_value = float(amount)
+        day = format_day(parse_day(date))
+        created = time.time() if created_at is None else float(created_at)
+        
+        try:
+            self._storage.write(INSERT_EXPENSE, (raw_id, amount_value, category, category_key(category),
+                                                 day, description, created))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Duplicate transaction ID '{decode_id(raw_id)}'")
+        
+        return Transaction(amount_value, category, day, description,
+                           transaction_id=raw_id, created_at=created)
+    
+    def add_many(self, rows: Iterable[Tuple[float, str, Optional[str], str]]) -> List[Transaction]:
+        """
+        Insert a batch of new rows with generated IDs in one transaction.
+        
+        Args:
+            rows: (amount, category, date, description) tuples; a None date means today
+        
+        Returns:
+            Transactions for the new rows, in input order
+        """
+        created = time.time()
+        prepared = [(new_raw_id(), float(amount), category, format_day(parse_day(date)), description)
+                    for amount, category, date, description in rows]
+        self._storage.write_many(INSERT_EXPENSE, [
+            (raw_id, amount, category, category_key(category), day, description, created)
+            for raw_id, amount, category, day, description in prepared
+        ])
+        return [Transaction(amount, category, day, description, transaction_id=raw_id, created_at=created)
+                for raw_id, amount, category, day, description in prepared]
+    
+    def rows(self) -> Iterator[Transaction]:
+        """Iterate over all rows in insertion order."""
+        return iter(self._materialize(self._storage.query(SELECT_ALL_EXPENSES)))
+    
+    def get(self, expense_id: str) -> Optional[Transaction]:
+        """
+        Fetch a row by full ID or unambiguous ID prefix.
+        
+        Returns:
+            Transaction or None if not found
+        
+        Raises:
+            AmbiguousIdError: If a partial ID matches more than one row
+        """
+        raw_id = self._resolve_id(expense_id)
+        if raw_id is None:
+            return None
+        found = self._materialize(self._storage.query(SELECT_EXPENSE_BY_ID, (raw_id,)))
+        return found[0] if found else None
+    
+    def update(self, expense_id: str, amount: float = None, category: str = None,
+               date: str = None, description: str = None) -> Optional[Transaction]:
+        """
+        Update a row located by full ID or unambiguous ID prefix.
+        Only fields that are explicitly provided (not None) are changed.
+        
+        Returns:
+            Transaction with the new values or None if not found
+        """
+        amount_value = float(amount) if amount is not None else None
+        day = format_day(parse_day(date)) if date is not None else None
+        key = category_key(category) if category is not None else None
+        
+        with self._storage.batch():
+            raw_id = self._resolve_id(expense_id)
+            if raw_id is None:
+                return None
+            self._storage.write(UPDATE_EXPENSE, (amount_value, category, key, day, description, raw_id))
+            return self._materialize(self._storage.query(SELECT_EXPENSE_BY_ID, (raw_id,)))[0]
+    
+    def delete(self, expense_id: str) -> bool:
+        """
+        Delete a row located by full ID or unambiguous ID prefix.
+        
+        Returns:
+            True if a row was deleted, False if not found
+        """
+        with self._storage.batch():
+            raw_id = self._resolve_id(expense_id)
+            if raw_id is None:
+                return False
+            return self._storage.write(DELETE_EXPENSE, (raw_id,)) > 0
+    
+    def delete_where(self, category: Optional[str] = None, date_from: Optional[str] = None,
+                     date_to: Optional[str] = None) -> int:
+        """
+        Delete every row matching the given filters with a single indexed DELETE.
+        
+        Args:
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+            
+        Returns:
+            Number of rows deleted
+        """
+        clauses, parameters = self._filter_clauses(category, date_from, date_to)
+        sql = "DELETE FROM expenses"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return self._storage.write(sql, tuple(parameters))
+    
+    def select(self, category: Optional[str] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None) -> List[Transaction]:
+        """
+        Fetch the rows matching the given filters, in insertion order.
+        Date bounds use idx_expenses_date_id; a category uses idx_expenses_category_date_id.
+        
+        Args:
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+        
+        Returns:
+            List of matching Transactions
+        """
+        clauses, parameters = self._filter_clauses(category, date_from, date_to)
+        sql = f"SELECT {EXPENSE_COLUMNS} FROM expenses"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return self._materialize(self._storage.query(sql + " ORDER BY seq", tuple(parameters)))
+    
+    def page(self, limit: int, after: Optional[Tuple[str, str]] = None, category: Optional[str] = None,
+             date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Transaction]:
+        """
+        Fetch up to limit matching rows ordered by (date, ID), starting after a keyset position.
+        The row-value comparison seeks straight into the (date, id) indexes.
+        
+        Args:
+            limit: Maximum number of rows to return
+            after: (date, full ID) of the last row of the previous page
+            category: Category name to match case-insensitively
+            date_from: Inclusive start date in YYYY-MM-DD format
+            date_to: Inclusive end date in YYYY-MM-DD format
+        
+        Returns:
+            List of Transactions in (date, ID) order
+        """
+        clauses, parameters = self._filter_clauses(category, date_from, date_to)
+        if after is not None:
+            clauses.append("(date, id) > (?, ?)")
+            parameters.extend((format_day(parse_day(after[0])), encode_id(after[1])))
+        
+        sql = f"SELECT {EXPENSE_COLUMNS} FROM expenses"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return self._materialize(self._storage.query(sql + " ORDER BY date, id LIMIT ?", (*parameters, limit)))
+    
+    @staticmethod
+    def _filter_clauses(category: Optional[str], date_from: Optional[str],
+                        date_to: Optional[str]) -> Tuple[List[str], List]:
+        """Internal helper to translate filter criteria into WHERE clauses and parameters."""
+        clauses, parameters = [], []
+        if category:
+            clauses.append("category_key = ?")
+            parameters.append(category_key(category))
+        if date_from:
+            clauses.append("date >= ?")
+            parameters.append(format_day(parse_day(date_from)))
+        if date_to:
+            clauses.append("date <= ?")
+            parameters.append(format_day(parse_day(date_to)))
+        return clauses, parameters
+    
+    def category_counts(self) -> List[Tuple[str, int]]:
+        """
+        List distinct categories with their row counts.
+        Spellings that differ only in case are reported once, under the earliest label stored.
+        
+        Returns:
+            (category, count) pairs ordered by category name
+        """
+        return [(label, count) for label, _, count in self._storage.query(CATEGORY_COUNTS)]
+    
+    def batch(self):
+        """Group several writes into a single committed transaction."""
+        return self._storage.batch()
+    
+    @property
+    def rollup(self) -> 'SQLiteRollup':
+        """Get the SQL-backed spending aggregates."""
+        return self._rollup
+    
+    def _resolve_id(self, expense_id: str) -> Optional[bytes]:
+        """
+        Internal helper to turn a full or partial ID into the stored 16-byte key.
+        Prefixes become a BETWEEN range scan over the unique index on id.
+        """
+        if len(expense_id) == 36:
+            try:
+                return encode_id(expense_id)
+            except ValueError:
+                return None
+        
+        id_range = id_prefix_range(expense_id)
+        if id_range is None:
+            return None
+        matches = [row[0] for row in self._storage.query(SELECT_IDS_IN_RANGE, id_range)]
+        if not matches:
+            return None
+        if len(matches) > 1:
+            raise AmbiguousIdError(expense_id, [decode_id(raw_id)[:13] for raw_id in matches])
+        return matches[0]
+    
+    @staticmethod
+    def _materialize(records: List[tuple]) -> List[Transaction]:
+        """Internal helper to build Transactions from result rows."""
+        return [Transaction(amount, category, date, description, transaction_id=raw_id, created_at=created)
+                for raw_id, amount, category, date, description, created in records]
+
+
+class SQLiteRollup:
+    """
+    Spending aggregates computed with GROUP BY queries.
+    Mirrors the read side of SpendingRollup so controllers need not know which backend is in use.
+    """
+    
+    def __init__(self, storage: SQLiteStorage):
+        self._storage = storage
+    
+    @property
+    def total(self) -> float:
+        """Get the total amount across all expenses."""
+        return self._storage.query(COUNT_EXPENSES)[0][1]
+    
+    @property
+    def count(self) -> int:
+        """Get the number of expenses."""
+        return self._storage.query(COUNT_EXPENSES)[0][0]
+    
+    def monthly_totals(self) -> Dict[str, float]:
+        """
+        Spending per month in chronological order.
+        
+        Returns:
+            Dictionary mapping YYYY-MM to total spent
+        """
+        return dict(self._storage.query(
+            "SELECT substr(date, 1, 7) AS month, SUM(amount) FROM expenses GROUP BY month ORDER BY month"))
+    
+    def monthly_total(self, month: str) -> float:
+        """Get the amount spent in a month."""
+        return self._storage.query("SELECT COALESCE(SUM(amount), 0) FROM expenses WHERE date BETWEEN ? AND ?",
+                                   month_bounds(month))[0][0]
+    
+    def monthly_count(self, month: str) -> int:
+        """Get the number of expenses recorded in a month."""
+        return self._storage.query("SELECT COUNT(*) FROM expenses WHERE date BETWEEN ? AND ?",
+                                   month_bounds(month))[0][0]
+    
+    def category_totals(self, month: Optional[str] = None) -> Dict[str, float]:
+        """
+        Spending per category, either for one month or across all time.
+        
+        Args:
+            month: Optional YYYY-MM month to restrict to
+        
+        Returns:
+            Dictionary mapping category to total spent
+        """
+        if month is None:
+            return dict(self._storage.query("SELECT category, SUM(amount) FROM expenses GROUP BY category"))
+        return dict(self._storage.query(
+            "SELECT category, SUM(amount) FROM expenses WHERE date BETWEEN ? AND ? GROUP BY category",
+            month_bounds(month)))
+    
+    def daily_totals(self, month: Optional[str] = None) -> Dict[str, float]:
+        """
+        Spending per day in chronological order.
+        
+        Args:
+            month: Optional YYYY-MM month to restrict to
+        
+        Returns:
+            Dictionary mapping YYYY-MM-DD to total spent
+        """
+        if month is None:
+            return dict(self._storage.query(
+                "SELECT date, SUM(amount) FROM expenses GROUP BY date ORDER BY date"))
+        return dict(self._storage.query(
+            "SELECT date, SUM(amount) FROM expenses WHERE date BETWEEN ? AND ? GROUP BY date ORDER BY date",
+            month_bounds(month)))
+
+
+class SQLiteBudgetStore:
+    """
+    Write-through persistence for budget plans.
+    SenseController keeps its in-memory registry and mirrors every change here.
+    """
+    
+    def __init__(self, storage: SQLiteStorage):
+        self._storage = storage
+    
+    def load_all(self) -> List[BudgetPlan]:
+        """Load every stored budget plan in creation order."""
+        return [BudgetPlan(amount, month, category, budget_id=budget_id, created_at=created)
+                for budget_id, amount, month, category, created in self._storage.query(SELECT_ALL_BUDGETS)]
+    
+    def save(self, budget: BudgetPlan):
+        """Insert a budget plan, or update the amount of one already stored."""
+        self._storage.write(UPSERT_BUDGET, (budget.id, budget.amount, budget.month,
+                                            budget.category, budget.created_at))
+    
+    def delete(self, budget_id: str) -> bool:
+        """
+        Remove a stored budget plan.
+        
+        Returns:
+            True if a budget was removed, False if not found
+        """
+        return self._storage.write(DELETE_BUDGET, (budget_id,)) > 0
@@ -0,0 +1,126 @@
+from collections import deque
+from typing import Any, Dict, List, Optional
+import threading
+
+# Recent events kept for clients resuming from an earlier version
+DEFAULT_HISTORY_SIZE = 1000
+# Events queued for one client before it is considered too slow to keep up
+DEFAULT_CLIENT_BUFFER = 256
+
+
+class FeedSubscription:
+    """
+    One client's bounded queue of pending change events.
+    When the client falls more than its buffer behind, the queue is dropped and the
+    subscription is marked lagging; the client must then reload instead of patching.
+    """
+    
+    def __init__(self, buffer_size: int):
+        self._events = deque()
+        self._buffer_size = buffer_size
+        self._ready = threading.Condition()
+        self.lagging = False
+    
+    def offer(self, event: Dict[str, Any]):
+        """Queue an event for delivery, or mark the subscription lagging when the buffer is full."""
+        with self._ready:
+            if self.lagging:
+                return
+            if len(self._events) >= self._buffer_size:
+                self._events.clear()
+                self.lagging = True
+            else:
+                self._events.append(event)
+            self._ready.notify()
+    
+    def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event.
+        
+        Args:
+            timeout: Seconds to wait before giving up
+        
+        Returns:
+            The next event, or None on timeout or once the subscription is lagging
+        """
+        with self._ready:
+            if not self._events and not self.lagging:
+                self._ready.wait(timeout)
+            if self.lagging or not self._events:
+                return None
+            return self._events.popleft()
+
+
+class ChangeFeed:
+    """
+    Fan-out of ledger change events to live subscribers.
+    Events carry the ledger version they produced. The most recent ones are kept
+    so a reconnecting client can resume after the last version it saw; a client
+    asking for a version that is no longer (or was never) in the history is
+    started lagging.
+    """
+    
+    def __init__(self, version: int = 0, history_size: int = DEFAULT_HISTORY_SIZE,
+                 client_buffer: int = DEFAULT_CLIENT_BUFFER):
+        """
+        Args:
+            version: Ledger version the feed starts at
+            history_size: Number of recent events kept for resuming clients
+            client_buffer: Number of undelivered events allowed per subscriber
+        """
+        self._version = version
+        self._history = deque(maxlen=history_size)
+        self._client_buffer = client_buffer
+        self._subscribers: List[FeedSubscription] = []
+        self._lock = threading.Lock()
+    
+    def publish(self, event: Dict[str, Any]):
+        """
+        Record an event and hand it to every subscriber.
+        
+        Args:
+            event: Change event with a 'version' key
+        """
+        with self._lock:
+            self._version = event['version']
+            self._history.append(event)
+            for subscription in self._subscribers:
+                subscription.offer(event)
+    
+    def subscribe(self, since: Optional[int] = None) -> FeedSubscription:
+        """
+        Start receiving events, optionally replaying those after a known version first.
+        
+        Args:
+            since: Last version the client has seen (None to receive only new events)
+        
+        Returns:
+            Subscription to read events from; it is lagging if the replay is unavailable or too long
+        """
+        subscription = FeedSubscription(self._client_buffer)
+        with self._lock:
+            if since is not None and since != self._version:
+                if self._history and self._history[0]['version'] - 1 <= since < self._version:
+                    for event in self._history:
+                        if event['version'] > since:
+                            subscription.offer(event)
+                else:
+                    subscription.lagging = True
+            self._subscribers.append(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: FeedSubscription):
+        """Stop delivering events to a subscription."""
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+    
+    @property
+    def version(self) -> int:
+        """Get the version of the latest published event."""
+        return self._version
+    
+    @property
+    def subscriber_count(self) -> int:
+        """Get the number of connected subscribers."""
+        return len(self._subscribers)
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+import threading
+
+# Default memory budget for cached chart images
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class ChartCache:
+    """
+    Least-recently-used cache of rendered chart images, bounded by total bytes.
+    Keys should include the data versions the chart was drawn from, so a change
+    to the ledger or budgets simply stops matching old entries, which then age out.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_bytes: Largest total size of cached images; 0 disables caching
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, str]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, str]]:
+        """
+        Look up a rendered image and mark it most recently used.
+        
+        Returns:
+            Tuple of (image bytes, mimetype), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+    
+    def put(self, key: Hashable, body: bytes, mimetype: str):
+        """
+        Store a rendered image, evicting the least recently used ones to stay within max_bytes.
+        Images larger than the whole budget are not stored.
+        """
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[0])
+            self._entries[key] = (body, mimetype)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+    
+    def get_or_render(self, key: Hashable, render: Callable[[], Tuple[bytes, str]]) -> Tuple[bytes, str, bool]:
+        """
+        Return the cached image for a key, rendering and storing it on a miss.
+        Concurrent misses for the same key may both render; the result is identical.
+        
+        Args:
+            key: Cache key, including every input the image depends on
+            render: Callable producing (image bytes, mimetype)
+        
+        Returns:
+            Tuple of (image bytes, mimetype, whether it was a cache hit)
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry[0], entry[1], True
+        body, mimetype = render()
+        self.put(key, body, mimetype)
+        return body, mimetype, False
+    
+    def clear(self):
+        """Drop every cached image; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Report cache effectiveness and memory use.
+        
+        Returns:
+            Dictionary with hits, misses, evictions, entries, bytes and max_bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes
+            }
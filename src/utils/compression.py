@@ -0,0 +1,118 @@
+from typing import Iterable, Iterator, Optional
+import zlib
+
+from werkzeug.wrappers import Response
+
+from utils.streams import GZIP_WBITS
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip and deflate are always offered
+    brotli = None
+
+# Content types worth compressing; images such as PNG are already compressed
+COMPRESSIBLE_TYPES = {
+    'application/json', 'application/javascript', 'application/xml',
+    'image/svg+xml', 'text/csv', 'text/css', 'text/html', 'text/javascript', 'text/plain'
+}
+
+
+class StreamCompressor:
+    """
+    Incremental compressor for one HTTP content coding (br, gzip or deflate).
+    compress() sync-flushes after every chunk so each chunk reaches the client
+    as soon as it is produced; finish() writes the trailer.
+    """
+    
+    def __init__(self, encoding: str, level: int = 6):
+        """
+        Args:
+            encoding: 'br', 'gzip' or 'deflate'
+            level: Compression level, 1 (fastest) to 9 (smallest)
+        """
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=level)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS if encoding == 'gzip' else zlib.MAX_WBITS)
+    
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress a chunk and flush it so it can be sent on its own."""
+        if self._brotli is not None:
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        """End the compressed stream."""
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def supported_encodings() -> list:
+    """List the content codings this server can produce, most preferred first."""
+    return (['br'] if brotli is not None else []) + ['gzip', 'deflate']
+
+
+def compress_chunks(chunks: Iterable[bytes], encoding: str, level: int = 6) -> Iterator[bytes]:
+    """
+    Compress a stream of byte chunks for the given content coding as they arrive.
+    
+    Returns:
+        Iterator of compressed chunks, one per non-empty input chunk, then the trailer
+    """
+    compressor = StreamCompressor(encoding, level)
+    for chunk in chunks:
+        if chunk:
+            yield compressor.compress(chunk)
+    yield compressor.finish()
+
+
+def compress_response(response: Response, accept_encodings, min_size: int = 1024, level: int = 6) -> Response:
+    """
+    Apply negotiated response compression.
+    Buffered bodies smaller than min_size are left alone. Streamed bodies are
+    compressed chunk by chunk as they are sent, so chunked exports keep streaming.
+    Responses that are not 200, already encoded, ranged or of an incompressible
+    type pass through untouched. A strong ETag is weakened, since the compressed
+    bytes differ from the identity representation it was computed for.
+    
+    Args:
+        response: Outgoing response
+        accept_encodings: The request's parsed Accept-Encoding header
+        min_size: Smallest buffered body worth compressing, in bytes
+        level: Compression level, 1 (fastest) to 9 (smallest)
+    
+    Returns:
+        The same response, compressed when worthwhile
+    """
+    if (response.status_code != 200 or response.mimetype not in COMPRESSIBLE_TYPES
+            or 'Content-Encoding' in response.headers or 'Content-Range' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    
+    encoding: Optional[str] = accept_encodings.best_match(supported_encodings())
+    if encoding is None:
+        return response
+    
+    if response.is_streamed:
+        if response.content_length is not None and response.content_length < min_size:
+            return response
+        response.direct_passthrough = False
+        response.response = compress_chunks(response.response, encoding, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        compressor = StreamCompressor(encoding, level)
+        response.set_data(compressor.compress(body) + compressor.finish())
+    
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    response.headers.pop('Accept-Ranges', None)
+    return response
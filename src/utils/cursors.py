@@ -0,0 +1,48 @@
+from typing import Tuple
+import base64
+
+from models.columnar_ledger import parse_day, format_day, encode_id, decode_id
+
+CURSOR_WIDTH = 20
+
+
+def encode_cursor(date: str, expense_id: str) -> str:
+    """
+    Build an opaque pagination cursor pointing just past an expense.
+    Packs the day ordinal and raw ID into 20 bytes, then base64url-encodes them.
+    
+    Args:
+        date: Date of the last expense on the page (YYYY-MM-DD)
+        expense_id: Full ID of the last expense on the page
+    
+    Returns:
+        URL-safe cursor string
+    """
+    key = parse_day(date).to_bytes(4, 'big') + encode_id(expense_id)
+    return base64.urlsafe_b64encode(key).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Unpack a cursor built by encode_cursor.
+    
+    Args:
+        cursor: Cursor string from a previous page
+    
+    Returns:
+        (date, expense ID) of the last expense already returned
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        key = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    if len(key) != CURSOR_WIDTH:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    try:
+        date = format_day(int.from_bytes(key[:4], 'big'))
+    except (ValueError, OverflowError):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return date, decode_id(key[4:])
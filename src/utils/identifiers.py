@@ -0,0 +1,29 @@
+from datetime import datetime
+import os
+
+
+def new_raw_id() -> bytes:
+    """
+    Generate a random version 4 UUID as 16 raw bytes.
+    Skips building a uuid.UUID object; the textual form is produced on demand.
+    """
+    raw = bytearray(os.urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40
+    raw[8] = (raw[8] & 0x3F) | 0x80
+    return bytes(raw)
+
+
+def format_raw_id(raw_id: bytes) -> str:
+    """Render 16 raw bytes in canonical dash-separated UUID form."""
+    digits = raw_id.hex()
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+def format_timestamp(epoch: float) -> str:
+    """Render an epoch timestamp as a local ISO 8601 string."""
+    return datetime.fromtimestamp(epoch).isoformat()
+
+
+def parse_timestamp(timestamp: str) -> float:
+    """Convert a local ISO 8601 string from format_timestamp back into epoch seconds."""
+    return datetime.fromisoformat(timestamp).timestamp()
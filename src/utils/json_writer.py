@@ -0,0 +1,69 @@
+from json import JSONEncoder
+from operator import attrgetter
+from typing import Dict, Iterable, Optional, Tuple
+
+# Serialized fields, in the order the API models declare them
+TRANSACTION_FIELDS = ('id', 'amount', 'category', 'date', 'description', 'created_at')
+BUDGET_FIELDS = ('id', 'amount', 'month', 'category', 'created_at')
+
+# Compact output; payloads are plain dicts and lists, so the cycle check is wasted work
+_ENCODER = JSONEncoder(check_circular=False, separators=(',', ':'))
+
+
+def parse_fields(spec: Optional[str], allowed: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Turn a comma-separated fields= parameter into a projection.
+    
+    Args:
+        spec: Requested field names, or None/empty for every field
+        allowed: Fields the record type can serialize, in output order
+    
+    Returns:
+        Requested fields in the order of allowed
+    
+    Raises:
+        ValueError: If a requested field is unknown or nothing was requested
+    """
+    if not spec:
+        return allowed
+    requested = {name.strip() for name in spec.split(',') if name.strip()}
+    unknown = sorted(requested.difference(allowed))
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}; choose from {', '.join(allowed)}")
+    if not requested:
+        raise ValueError("fields must name at least one field")
+    return tuple(name for name in allowed if name in requested)
+
+
+def write_list(key: str, records: Iterable, fields: Tuple[str, ...], all_fields: Tuple[str, ...],
+               extra: Optional[Dict[str, object]] = None) -> str:
+    """
+    Encode records as {key: [...], "count": n, ...extra} in one pass of the C JSON encoder.
+    Whole records reuse their cached to_dict() form; a projection reads only the
+    requested attributes, so lazily formatted values such as IDs and timestamps
+    are never rendered when they are not asked for.
+    
+    Args:
+        key: Name of the list member, e.g. 'expenses'
+        records: Transactions or budget plans
+        fields: Fields to emit for each record
+        all_fields: Every field of the record type, used to detect a full projection
+        extra: Additional members appended after count
+    
+    Returns:
+        JSON document text
+    """
+    if fields == all_fields:
+        items = [record.to_dict() for record in records]
+    elif len(fields) == 1:
+        name = fields[0]
+        getter = attrgetter(name)
+        items = [{name: getter(record)} for record in records]
+    else:
+        getter = attrgetter(*fields)
+        items = [dict(zip(fields, getter(record))) for record in records]
+    
+    document = {key: items, 'count': len(items)}
+    if extra:
+        document.update(extra)
+    return _ENCODER.encode(document)
@@ -0,0 +1,186 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import json
+import os
+import queue
+import select
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+# Wire format shared with views.chart_worker: length-prefixed JSON requests,
+# replies prefixed with a status byte (0 ok, 1 error) and a length
+REQUEST_HEADER = struct.Struct('>I')
+REPLY_HEADER = struct.Struct('>BI')
+
+# Directory holding the importable packages, used as the workers' working directory
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+
+class RenderPoolBusy(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+    pass
+
+
+class RenderTimeout(Exception):
+    """Raised when a render does not finish within the pool's timeout."""
+    pass
+
+
+class RenderError(Exception):
+    """Raised when a worker fails to render a chart or exits unexpectedly."""
+    pass
+
+
+class RenderWorker:
+    """One long-lived render process and the pipes used to talk to it."""
+    
+    def __init__(self, command: List[str]):
+        env = dict(os.environ, MPLBACKEND='Agg')
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        cwd=str(SRC_DIR), env=env, bufsize=0)
+        self.healthy = True
+    
+    def call(self, payload: bytes, deadline: float) -> bytes:
+        """
+        Send one request and wait for its reply.
+        A timeout or broken pipe leaves the worker unhealthy, since its reply
+        stream can no longer be trusted.
+        
+        Args:
+            payload: Encoded JSON request
+            deadline: time.monotonic() value by which the reply must arrive
+        
+        Returns:
+            Rendered image bytes
+        
+        Raises:
+            RenderTimeout: If the deadline passes first
+            RenderError: If rendering failed or the worker died
+        """
+        try:
+            self.process.stdin.write(REQUEST_HEADER.pack(len(payload)) + payload)
+            status, length = REPLY_HEADER.unpack(self._read(REPLY_HEADER.size, deadline))
+            body = self._read(length, deadline)
+        except (BrokenPipeError, OSError) as error:
+            self.healthy = False
+            raise RenderError(f'Render worker failed: {error}')
+        except RenderTimeout:
+            self.healthy = False
+            raise
+        if status:
+            raise RenderError(body.decode('utf-8', 'replace'))
+        return body
+    
+    def _read(self, size: int, deadline: float) -> bytes:
+        """Internal helper to read exactly size bytes from the worker before the deadline."""
+        descriptor = self.process.stdout.fileno()
+        chunks = []
+        while size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([descriptor], [], [], remaining)[0]:
+                raise RenderTimeout('Chart render timed out')
+            chunk = os.read(descriptor, size)
+            if not chunk:
+                self.healthy = False
+                raise RenderError('Render worker exited')
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+    
+    def stop(self):
+        """Terminate the worker process."""
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+
+
+class RenderPool:
+    """
+    Fixed set of pre-warmed chart render processes.
+    Each worker imports matplotlib once and keeps its font cache hot, so renders
+    run in parallel across cores without sharing any pyplot state with the web
+    server's threads. At most size + max_pending renders are admitted at once;
+    beyond that callers are refused immediately instead of queueing without bound.
+    A worker that times out is killed and replaced.
+    """
+    
+    def __init__(self, size: int, max_pending: Optional[int] = None, timeout: float = 10.0,
+                 command: Optional[List[str]] = None):
+        """
+        Args:
+            size: Number of worker processes
+            max_pending: Renders allowed to wait for a free worker (defaults to 2 per worker)
+            timeout: Seconds a render may take, including any wait for a worker
+            command: Worker command line (defaults to the chart worker module)
+        """
+        self.size = size
+        self.timeout = timeout
+        self._command = command or [sys.executable, '-m', 'views.chart_worker']
+        self._admission = threading.BoundedSemaphore(size + (2 * size if max_pending is None else max_pending))
+        self._idle: 'queue.LifoQueue[RenderWorker]' = queue.LifoQueue()
+        self._workers: List[RenderWorker] = []
+        self._lock = threading.Lock()
+        for _ in range(size):
+            self._idle.put(self._start_worker())
+    
+    def _start_worker(self) -> RenderWorker:
+        """Internal helper to launch a worker and track it for shutdown."""
+        worker = RenderWorker(self._command)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+    
+    def _retire_worker(self, worker: RenderWorker):
+        """Internal helper to stop a worker and stop tracking it."""
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.stop()
+    
+    def render(self, kind: str, data: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Render a chart on the next free worker.
+        
+        Args:
+            kind: Chart kind understood by views.web_charts.render_chart
+            data: JSON-serializable series for the chart
+            options: Output keyword arguments for render_chart (fmt, size, dpi)
+        
+        Returns:
+            Rendered image bytes
+        
+        Raises:
+            RenderPoolBusy: If the pool and its wait queue are full
+            RenderTimeout: If no worker frees up, or the render does not finish, in time
+            RenderError: If the worker reports a failure
+        """
+        if not self._admission.acquire(blocking=False):
+            raise RenderPoolBusy('All chart renderers are busy')
+        try:
+            deadline = time.monotonic() + self.timeout
+            payload = json.dumps({'kind': kind, 'data': data, 'options': options or {}}).encode('utf-8')
+            try:
+                worker = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise RenderTimeout('No chart renderer became free in time')
+            try:
+                return worker.call(payload, deadline)
+            finally:
+                if not worker.healthy:
+                    self._retire_worker(worker)
+                    worker = self._start_worker()
+                self._idle.put(worker)
+        finally:
+            self._admission.release()
+    
+    def close(self):
+        """Stop every worker process."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
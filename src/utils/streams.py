@@ -0,0 +1,25 @@
+from typing import Iterable, Iterator
+import zlib
+
+# zlib window bits selecting a gzip header and trailer
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Compress a stream of byte chunks into a single gzip member as they arrive.
+    Only the compressor's window is held in memory, never the whole stream.
+    
+    Args:
+        chunks: Uncompressed byte chunks
+        level: zlib compression level, 1 (fastest) to 9 (smallest)
+    
+    Returns:
+        Iterator of compressed chunks; empty ones are skipped
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
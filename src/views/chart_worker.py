@@ -0,0 +1,53 @@
+"""
+Chart Render Worker
+Long-lived process that renders charts for the web app's render pool.
+Run as `python -m views.chart_worker` from the src directory. Requests arrive on
+stdin as a 4-byte big-endian length followed by JSON {"kind", "data", "options"},
+where options holds render_chart's fmt, size and dpi; each reply on stdout is a
+status byte (0 ok, 1 error), a 4-byte length, then the image bytes or the error
+message.
+"""
+
+import json
+import os
+import sys
+
+from utils.render_pool import REQUEST_HEADER, REPLY_HEADER
+from views.web_charts import render_chart, warm_up
+
+
+def _read_exactly(stream, size: int) -> bytes:
+    """Read size bytes, or fewer only when the stream ends."""
+    chunks = []
+    while size:
+        chunk = stream.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def main():
+    """Serve render requests until stdin closes."""
+    # Keep the reply channel private so stray prints cannot corrupt the protocol
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    requests = sys.stdin.buffer
+    
+    warm_up()
+    while True:
+        header = _read_exactly(requests, REQUEST_HEADER.size)
+        if len(header) < REQUEST_HEADER.size:
+            return
+        request = json.loads(_read_exactly(requests, REQUEST_HEADER.unpack(header)[0]))
+        try:
+            status, body = 0, render_chart(request['kind'], request['data'], **request.get('options', {}))
+        except Exception as error:
+            status, body = 1, f'{type(error).__name__}: {error}'.encode('utf-8')
+        replies.write(REPLY_HEADER.pack(status, len(body)) + body)
+        replies.flush()
+
+
+if __name__ == '__main__':
+    main()
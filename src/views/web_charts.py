@@ -0,0 +1,350 @@
+"""
+Web Chart Rendering Module
+Draws the dashboard charts from small pre-aggregated series and returns PNG, SVG or WebP bytes.
+Has no dependency on controllers, so it can run in a separate render worker process.
+
+Each chart type has one pre-built figure template drawn with the object-oriented
+Figure and Agg canvas API, never pyplot. Axes, titles, labels, legends and the
+layout are set up once per process; a render only replaces the data artists and
+encodes the canvas. Templates are shared mutable state, so callers must not
+render from several threads at once.
+"""
+
+import io
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from matplotlib import colormaps
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
+
+# Default resolution of rendered charts
+CHART_DPI = 100
+
+# Default figure size in inches of each chart kind
+CHART_SIZES: Dict[str, Tuple[float, float]] = {
+    'category': (6, 5),
+    'budget': (14, 6),
+    'monthly-trend': (12, 6)
+}
+
+# Output formats and their mimetypes
+CHART_FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'webp': 'image/webp'
+}
+
+ALLOCATED_COLOR = '#4299e1'
+ACTUAL_COLOR = '#ed8936'
+UNDER_BUDGET_COLOR = '#48bb78'
+OVER_BUDGET_COLOR = '#f56565'
+AVAILABLE_COLOR = '#e2e8f0'
+
+
+def pie_wedges(sums: Dict[str, float]) -> Dict[str, float]:
+    """Keep the sums a pie can draw: a wedge needs a positive, finite size, which net refunds and NaN lack."""
+    return {label: value for label, value in sums.items() if math.isfinite(value) and value > 0}
+
+
+class ChartTemplate:
+    """
+    A figure whose static parts are built once and whose data artists are swapped per render.
+    Subclasses build their axes in __init__ and implement draw().
+    """
+    
+    def __init__(self, figsize: Tuple[float, float]):
+        self.figsize = figsize
+        self.figure = Figure(figsize=figsize, dpi=CHART_DPI)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self._data_artists: List[Artist] = []
+    
+    def draw(self, data: Dict[str, Any]) -> List[Artist]:
+        """
+        Add the data artists for one render.
+        
+        Returns:
+            Artists to remove before the next render
+        """
+        raise NotImplementedError
+    
+    def render(self, data: Dict[str, Any], fmt: str = 'png', size: Optional[Tuple[float, float]] = None,
+               dpi: float = CHART_DPI) -> bytes:
+        """
+        Replace the previous render's data artists and encode the figure.
+        The subplot layout is in figure fractions, so it carries over to any size.
+        
+        Args:
+            data: Series for the chart
+            fmt: Output format, a key of CHART_FORMATS
+            size: Figure size in inches (defaults to the template's own)
+            dpi: Resolution; the image is size * dpi pixels
+        
+        Returns:
+            Encoded image bytes
+        """
+        # Forget the old artists before drawing, so a failed draw never leaves removed ones to remove again
+        stale, self._data_artists = self._data_artists, []
+        for artist in stale:
+            artist.remove()
+        self._data_artists = self.draw(data)
+        self.figure.set_size_inches(size or self.figsize)
+        image_buffer = io.BytesIO()
+        if fmt == 'png':
+            self.figure.dpi = dpi
+            self.canvas.print_png(image_buffer)
+        else:
+            self.canvas.print_figure(image_buffer, format=fmt, dpi=dpi)
+        return image_buffer.getvalue()
+
+
+class MessageTemplate(ChartTemplate):
+    """Empty-state figure showing a single centered message."""
+    
+    def __init__(self, figsize: Tuple[float, float], fontsize: int):
+        super().__init__(figsize)
+        self._message = self.figure.text(0.5, 0.5, '', ha='center', va='center', fontsize=fontsize)
+    
+    def draw(self, data: Dict[str, Any]) -> List[Artist]:
+        self._message.set_text(data['message'])
+        return []
+
+
+class CategoryTemplate(ChartTemplate):
+    """Spending distribution pie chart."""
+    
+    def __init__(self):
+        super().__init__(CHART_SIZES['category'])
+        self.axes = self.figure.add_subplot()
+        self.figure.subplots_adjust(left=0.1, right=0.9, bottom=0.05, top=0.88)
+    
+    def draw(self, data: Dict[str, Any]) -> List[Artist]:
+        self.axes.set_title(data['title'], fontsize=14, fontweight='bold')
+        category_sums = pie_wedges(data['categories'])
+        if not category_sums:
+            return []
+        chart_colors = colormaps['Set3'](range(len(category_sums)))
+        wedges, labels, percentages = self.axes.pie(list(category_sums.values()), labels=list(category_sums.keys()),
+                                                    autopct='%1.1f%%', startangle=90, colors=chart_colors)
+        return wedges + labels + percentages
+
+
+class BudgetTemplate(ChartTemplate):
+    """Budget utilization gauge beside a per-category allocated vs actual bar chart."""
+    
+    def __init__(self):
+        super().__init__(CHART_SIZES['budget'])
+        self.gauge_axes, self.compare_axes = self.figure.subplots(1, 2)
+        self.figure.subplots_adjust(left=0.04, right=0.98, bottom=0.28, top=0.88, wspace=0.15)
+        
+        compare_ax = self.compare_axes
+        compare_ax.set_xlabel('Spending Categories')
+        compare_ax.set_ylabel('Dollar Amount ($)')
+        compare_ax.set_title('Category-Level Budget Analysis', fontsize=14, fontweight='bold')
+        compare_ax.grid(axis='y', alpha=0.3)
+        compare_ax.set_axisbelow(True)
+        self._legend = compare_ax.legend(handles=[Patch(color=ALLOCATED_COLOR, label='Allocated'),
+                                                  Patch(color=ACTUAL_COLOR, label='Actual')])
+        self._no_categories = compare_ax.text(0.5, 0.5, 'No category-specific budgets', ha='center',
+                                              va='center', fontsize=14, transform=compare_ax.transAxes)
+    
+    def draw(self, data: Dict[str, Any]) -> List[Artist]:
+        artists: List[Artist] = []
+        
+        # Left panel: Overall budget utilization gauge
+        actual_spent = data['total_spent']
+        allocated_budget = data['total_budget']
+        budget_remaining = data['total_remaining']
+        
+        gauge_colors = [UNDER_BUDGET_COLOR if budget_remaining >= 0 else OVER_BUDGET_COLOR, AVAILABLE_COLOR]
+        gauge_portions = [max(0, min(actual_spent, allocated_budget)), max(0, budget_remaining)]
+        if sum(gauge_portions) > 0:
+            wedges, labels, percentages = self.gauge_axes.pie(gauge_portions, labels=['Utilized', 'Available'],
+                                                              autopct='%1.1f%%', startangle=90, colors=gauge_colors)
+            artists += wedges + labels + percentages
+        self.gauge_axes.set_title(f'Budget Utilization\n\${actual_spent:.2f} of \${allocated_budget:.2f}',
+                                  fontsize=14, fontweight='bold')
+        
+        # Right panel: Category-level comparison
+        compare_ax = self.compare_axes
+        categories = data['categories']
+        has_categories = bool(categories)
+        if has_categories:
+            compare_ax.set_axis_on()
+        else:
+            compare_ax.set_axis_off()
+        compare_ax.title.set_visible(has_categories)
+        self._legend.set_visible(has_categories)
+        self._no_categories.set_visible(not has_categories)
+        if has_categories:
+            cat_names = list(categories.keys())
+            bar_positions = range(len(cat_names))
+            bar_width = 0.35
+            
+            artists += compare_ax.bar([i - bar_width/2 for i in bar_positions],
+                                      [categories[c]['budget'] for c in cat_names], bar_width,
+                                      color=ALLOCATED_COLOR).patches
+            artists += compare_ax.bar([i + bar_width/2 for i in bar_positions],
+                                      [categories[c]['spent'] for c in cat_names], bar_width,
+                                      color=ACTUAL_COLOR).patches
+            compare_ax.set_xticks(bar_positions, cat_names, rotation=45, ha='right')
+            compare_ax.relim()
+            compare_ax.autoscale_view()
+        return artists
+
+
+class TrendTemplate(ChartTemplate):
+    """Monthly actual spending vs planned budget lines, shading overspent months."""
+    
+    def __init__(self):
+        super().__init__(CHART_SIZES['monthly-trend'])
+        self.axes = ax = self.figure.add_subplot()
+        self.figure.subplots_adjust(left=0.07, right=0.98, bottom=0.18, top=0.92)
+        
+        self._spent_line, = ax.plot([], [], marker='o', label='Actual Spending', linewidth=2, color=ACTUAL_COLOR)
+        self._budget_line, = ax.plot([], [], marker='s', label='Planned Budget', linewidth=2,
+                                     linestyle='--', color=ALLOCATED_COLOR)
+        ax.set_xlabel('Time Period', fontsize=12)
+        ax.set_ylabel('Dollar Amount ($)', fontsize=12)
+        ax.set_title('Spending Trend Over Time', fontsize=16, fontweight='bold')
+        ax.legend(fontsize=10)
+        ax.grid(True, alpha=0.3)
+    
+    def draw(self, data: Dict[str, Any]) -> List[Artist]:
+        ax = self.axes
+        sorted_periods = data['periods']
+        actual_spending = data['spent']
+        planned_budgets = data['budget']
+        
+        # Periods are plotted at their index, labelled by tick, so the axis keeps no category state between renders
+        positions = list(range(len(sorted_periods)))
+        self._spent_line.set_data(positions, actual_spending)
+        self._budget_line.set_data(positions, planned_budgets)
+        ax.set_xticks(positions, sorted_periods, rotation=45, ha='right')
+        
+        # Highlight overspending periods
+        artists: List[Artist] = []
+        for idx in positions:
+            if planned_budgets[idx] > 0 and actual_spending[idx] > planned_budgets[idx]:
+                artists.append(ax.axvspan(idx-0.3, idx+0.3, alpha=0.2, color='red'))
+        
+        ax.relim()
+        ax.autoscale_view()
+        return artists
+
+
+# Templates built so far in this process, by name
+_templates: Dict[Any, ChartTemplate] = {}
+
+
+def _template(name: Any, factory: Callable[[], ChartTemplate]) -> ChartTemplate:
+    """Internal helper to fetch a template, building it on first use."""
+    template = _templates.get(name)
+    if template is None:
+        template = _templates[name] = factory()
+    return template
+
+
+def _render_message(figsize: Tuple[float, float], message: str, fontsize: int, **output) -> bytes:
+    """Internal helper to render an empty-state message figure."""
+    template = _template(('message', figsize, fontsize), lambda: MessageTemplate(figsize, fontsize))
+    return template.render({'message': message}, **output)
+
+
+def render_category_chart(data: Dict[str, Any], **output) -> bytes:
+    """
+    Render the spending distribution pie chart.
+    
+    Args:
+        data: {'categories': {category: total}, 'title': chart title}
+        output: Optional fmt, size and dpi, as for ChartTemplate.render
+    
+    Returns:
+        Encoded image bytes
+    """
+    if not pie_wedges(data['categories']):
+        return _render_message(CHART_SIZES['category'], 'No spending data to display', 14, **output)
+    return _template('category', CategoryTemplate).render(data, **output)
+
+
+def render_budget_chart(data: Dict[str, Any], **output) -> bytes:
+    """
+    Render the budget vs actual dual-panel chart.
+    
+    Args:
+        data: {'total_spent', 'total_budget', 'total_remaining',
+            'categories': {category: {'budget', 'spent'}}}
+        output: Optional fmt, size and dpi, as for ChartTemplate.render
+    
+    Returns:
+        Encoded image bytes
+    """
+    if data['total_budget'] == 0:
+        return _render_message((10, 6), 'No budget allocation for this period', 16, **output)
+    return _template('budget', BudgetTemplate).render(data, **output)
+
+
+def render_trend_chart(data: Dict[str, Any], **output) -> bytes:
+    """
+    Render the monthly spending vs budget trend chart.
+    
+    Args:
+        data: {'periods': [YYYY-MM, ...], 'spent': [...], 'budget': [...]} in chronological order
+        output: Optional fmt, size and dpi, as for ChartTemplate.render
+    
+    Returns:
+        Encoded image bytes
+    """
+    if not data['periods']:
+        return _render_message(CHART_SIZES['monthly-trend'], 'Insufficient data for trend analysis', 16, **output)
+    return _template('monthly-trend', TrendTemplate).render(data, **output)
+
+
+# Chart kinds accepted by render_chart
+RENDERERS: Dict[str, Callable[..., bytes]] = {
+    'category': render_category_chart,
+    'budget': render_budget_chart,
+    'monthly-trend': render_trend_chart
+}
+
+# Sample series drawn once per process to build the templates and load fonts ahead of real requests
+WARM_UP_DATA = {
+    'category': {'categories': {'Warm-up': 1.0}, 'title': 'Warm-up'},
+    'budget': {'total_spent': 1.0, 'total_budget': 2.0, 'total_remaining': 1.0,
+               'categories': {'Warm-up': {'budget': 2.0, 'spent': 1.0}}},
+    'monthly-trend': {'periods': ['2000-01', '2000-02'], 'spent': [1.0, 2.0], 'budget': [2.0, 2.0]}
+}
+
+
+def render_chart(kind: str, data: Dict[str, Any], fmt: str = 'png', size: Optional[Tuple[float, float]] = None,
+                 dpi: float = CHART_DPI) -> bytes:
+    """
+    Render a chart by kind.
+    
+    Args:
+        kind: 'category', 'budget' or 'monthly-trend'
+        data: Series for that chart, as documented on its render function
+        fmt: Output format, a key of CHART_FORMATS
+        size: Figure size in inches (defaults to the chart's CHART_SIZES entry)
+        dpi: Resolution in dots per inch
+    
+    Returns:
+        Encoded image bytes
+    
+    Raises:
+        ValueError: If the chart kind or format is unknown
+    """
+    renderer = RENDERERS.get(kind)
+    if renderer is None:
+        raise ValueError(f"Unknown chart kind '{kind}'")
+    if fmt not in CHART_FORMATS:
+        raise ValueError(f"Unknown chart format '{fmt}'")
+    return renderer(data, fmt=fmt, size=size, dpi=dpi)
+
+
+def warm_up():
+    """Render every chart kind once so later renders find templates, fonts and caches loaded."""
+    for kind, data in WARM_UP_DATA.items():
+        render_chart(kind, data)
@@ -1,13 +1,28 @@
-from flask import Flask, render_template, jsonify, request, send_file
+from flask import Flask, Response, render_template, jsonify, request
 from flask_cors import CORS
 from flask_restx import Api, Resource, fields
-from controllers.spend_controller import SpendController
+from flask_restx.utils import unpack
+from controllers.spend_controller import SpendController, DEFAULT_PAGE_SIZE
 from controllers.sense_controller import SenseController
+from models.columnar_ledger import AmbiguousIdError
+from storage.sqlite_store import SQLiteStorage
+from storage.operation_log import OperationLog
+from storage.mapped_ledger import MappedLedger
+from utils.streams import gzip_chunks
+from utils.compression import compress_response
+from utils.json_writer import write_list, parse_fields, TRANSACTION_FIELDS, BUDGET_FIELDS
+from utils.change_feed import ChangeFeed
+from utils.chart_cache import ChartCache
+from utils.render_pool import RenderPool, RenderPoolBusy, RenderTimeout, RenderError
+from views.web_charts import render_chart as render_chart_in_process, CHART_DPI, CHART_FORMATS, CHART_SIZES
 from datetime import datetime
-import io
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from functools import wraps
+import atexit
+import json
+import math
+import os
+import threading
+import uuid
 from collections import defaultdict
 
 app = Flask(__name__, template_folder='../templates', static_folder='../static')
@@ -23,9 +38,220 @@ api = Api(
     prefix='/api'
 )
 
-# Initialize controllers
-spend_controller = SpendController()
-sense_controller = SenseController()
+# Initialize controllers, persisting to SQLite when SPENDSENSE_DB names a database file
+# or to an operation log when SPENDSENSE_LOG_DIR names a log directory.
+# SPENDSENSE_LEDGER_FILE instead maps a binary ledger file: every write is journaled
+# beside it before the request returns, and the journal is folded into the file on exit.
+# Opening takes no lock and each write locks the journal only while it runs, so the
+# debug reloader's parent and child can both open the file.
+database_path = os.environ.get('SPENDSENSE_DB')
+log_directory = os.environ.get('SPENDSENSE_LOG_DIR')
+ledger_path = os.environ.get('SPENDSENSE_LEDGER_FILE')
+if database_path or log_directory:
+    storage = SQLiteStorage(database_path) if database_path else OperationLog(log_directory)
+    spend_controller = SpendController(storage.ledger)
+    sense_controller = SenseController(storage.budgets)
+elif ledger_path:
+    storage = MappedLedger(ledger_path)
+    atexit.register(storage.save)
+    spend_controller = SpendController(storage)
+    sense_controller = SenseController()
+else:
+    storage = None
+    spend_controller = SpendController()
+    sense_controller = SenseController()
+
+# Largest number of rows accepted by one bulk request
+MAX_BULK_ROWS = 50000
+
+# Response compression: bodies below COMPRESS_MIN_SIZE bytes are sent as-is,
+# COMPRESS_LEVEL trades CPU for size (1 fastest to 9 smallest)
+app.config.setdefault('COMPRESS_MIN_SIZE', int(os.environ.get('SPENDSENSE_COMPRESS_MIN_SIZE', 1024)))
+app.config.setdefault('COMPRESS_LEVEL', int(os.environ.get('SPENDSENSE_COMPRESS_LEVEL', 6)))
+
+# Seconds between keep-alive comments on an idle event stream
+app.config.setdefault('EVENTS_HEARTBEAT', float(os.environ.get('SPENDSENSE_EVENTS_HEARTBEAT', 15)))
+# Milliseconds an EventSource waits before reconnecting
+EVENTS_RETRY_MS = 3000
+
+# Changes on every start so ETags handed out by a previous run never match
+INSTANCE_TAG = uuid.uuid4().hex[:12]
+
+# Live expense change events, served to dashboards over /api/events
+change_feed = ChangeFeed(version=spend_controller.version)
+spend_controller.add_listener(change_feed.publish)
+
+# Rendered chart images, keyed by chart, parameters and data versions
+chart_cache = ChartCache(int(os.environ.get('SPENDSENSE_CHART_CACHE_BYTES', 32 * 1024 * 1024)))
+
+# Charts render in SPENDSENSE_RENDER_WORKERS worker processes when set; otherwise
+# in-process, one at a time, since the chart figure templates are shared mutable state
+render_workers = int(os.environ.get('SPENDSENSE_RENDER_WORKERS', 0))
+if render_workers > 0:
+    render_pool = RenderPool(render_workers,
+                             max_pending=int(os.environ.get('SPENDSENSE_RENDER_QUEUE', 2 * render_workers)),
+                             timeout=float(os.environ.get('SPENDSENSE_RENDER_TIMEOUT', 10)))
+    atexit.register(render_pool.close)
+else:
+    render_pool = None
+render_lock = threading.Lock()
+
+# Bounds on requested chart geometry, so no request can ask for an arbitrarily large render
+CHART_PIXEL_RANGE = (100, 4000)
+CHART_DPI_RANGE = (25, 300)
+
+def storage_version() -> str:
+    """
+    Tag the changes other processes committed to a shared database, which no controller
+    version counts. Only SQLite databases are shared; other backends give an empty tag.
+    """
+    return f'd{storage.data_version}' if isinstance(storage, SQLiteStorage) else ''
+
+def versioned(*controllers, scope=None):
+    """
+    Serve a read endpoint with a strong ETag built from controller versions and storage_version().
+    A request whose If-None-Match already holds the current tag gets an empty 304
+    before the view runs, so nothing is queried, serialized or rendered.
+    Responses carry Cache-Control: no-cache so browsers revalidate on every poll.
+    
+    Args:
+        controllers: Controllers whose version the response depends on
+        scope: Optional callable returning extra state the response depends on, such as the current month
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            tag_parts = [INSTANCE_TAG] + [str(controller.version) for controller in controllers]
+            shared = storage_version()
+            if shared:
+                tag_parts.append(shared)
+            if scope is not None:
+                tag_parts.append(scope())
+            etag = '-'.join(tag_parts)
+            
+            if request.if_none_match.contains_weak(etag):
+                not_modified = Response(status=304, headers={'Cache-Control': 'no-cache'})
+                not_modified.set_etag(etag)
+                return not_modified
+            
+            result = view(*args, **kwargs)
+            if isinstance(result, Response):
+                if result.status_code == 200:
+                    result.set_etag(etag)
+                    result.headers['Cache-Control'] = 'no-cache'
+                return result
+            data, code, headers = unpack(result)
+            if code == 200:
+                headers = dict(headers or {}, ETag=f'"{etag}"')
+                headers['Cache-Control'] = 'no-cache'
+            return data, code, headers
+        return wrapper
+    return decorator
+
+def json_response(body: str) -> Response:
+    """Wrap pre-encoded JSON text in a response, bypassing restx marshalling."""
+    return Response(body, mimetype='application/json')
+
+def chart_output(kind: str) -> tuple:
+    """
+    Read a chart request's format, width, height and dpi query parameters, clamped to safe bounds.
+    Without a dpi, a requested width or height scales the whole chart, keeping its default layout;
+    with one, the figure grows or shrinks around text of the same size.
+    
+    Args:
+        kind: Chart kind, whose default size fills in missing dimensions
+    
+    Returns:
+        Normalized tuple of (format, width px, height px, dpi), usable as part of a cache key
+    
+    Raises:
+        ValueError: If the format is not supported or dpi is not a finite number
+    """
+    output_format = (request.args.get('format') or 'png').lower()
+    if output_format not in CHART_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(CHART_FORMATS)}")
+    width = request.args.get('width', type=int)
+    height = request.args.get('height', type=int)
+    dpi = request.args.get('dpi', type=float)
+    if dpi is not None and not math.isfinite(dpi):
+        raise ValueError('dpi must be a finite number')
+    
+    def clamp(value, bounds):
+        return min(max(value, bounds[0]), bounds[1])
+    
+    default_width, default_height = CHART_SIZES[kind]
+    if dpi is None:
+        if width is not None:
+            dpi = clamp(width, CHART_PIXEL_RANGE) / default_width
+        elif height is not None:
+            dpi = clamp(height, CHART_PIXEL_RANGE) / default_height
+        else:
+            dpi = CHART_DPI
+    dpi = round(clamp(dpi, CHART_DPI_RANGE), 2)
+    width = clamp(width if width is not None else round(default_width * dpi), CHART_PIXEL_RANGE)
+    height = clamp(height if height is not None else round(default_height * dpi), CHART_PIXEL_RANGE)
+    return output_format, width, height, dpi
+
+def render_chart(kind: str, data: dict, output: tuple) -> tuple:
+    """
+    Render a chart from its aggregated series, on the render pool when one is configured.
+    
+    Args:
+        kind: Chart kind, e.g. 'category'
+        data: Small JSON-serializable series the chart is drawn from
+        output: (format, width, height, dpi) from chart_output
+    
+    Returns:
+        Tuple of (image bytes, mimetype)
+    """
+    output_format, width, height, dpi = output
+    options = {'fmt': output_format, 'size': (width / dpi, height / dpi), 'dpi': dpi}
+    if render_pool is not None:
+        return render_pool.render(kind, data, options), CHART_FORMATS[output_format]
+    with render_lock:
+        return render_chart_in_process(kind, data, **options), CHART_FORMATS[output_format]
+
+# Controllers whose data each chart kind is drawn from; only their versions, and storage_version(), go into its cache key
+CHART_SOURCES = {
+    'category': (spend_controller,),
+    'budget': (spend_controller, sense_controller),
+    'monthly-trend': (spend_controller, sense_controller)
+}
+
+def chart_response(key: tuple, series) -> Response:
+    """
+    Serve a chart image from the chart cache, rendering it only on a miss.
+    The requested format and geometry (see chart_output) are part of the cache key.
+    
+    Args:
+        key: Chart kind and normalized parameters; the output options, the versions of the
+            chart's CHART_SOURCES and storage_version() are appended
+        series: Callable returning the chart's data, only called on a miss
+    """
+    try:
+        output = chart_output(key[0])
+    except ValueError as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}', 'success': False}), 400
+    versions = tuple(controller.version for controller in CHART_SOURCES[key[0]]) + (storage_version(),)
+    try:
+        body, mimetype, hit = chart_cache.get_or_render(key + output + versions,
+                                                        lambda: render_chart(key[0], series(), output))
+    except RenderPoolBusy as e:
+        return jsonify({'error': str(e), 'success': False}), 503, {'Retry-After': '1'}
+    except RenderTimeout as e:
+        return jsonify({'error': str(e), 'success': False}), 504
+    except RenderError as e:
+        # The failed worker has already been replaced, so a retry can succeed
+        return jsonify({'error': f'Chart rendering failed: {str(e)}', 'success': False}), 503
+    response = Response(body, mimetype=mimetype)
+    response.headers['X-Chart-Cache'] = 'hit' if hit else 'miss'
+    return response
+
+@app.after_request
+def compress(response):
+    """Compress text responses with the best coding the client accepts (br, gzip or deflate)."""
+    return compress_response(response, request.accept_encodings,
+                             min_size=app.config['COMPRESS_MIN_SIZE'], level=app.config['COMPRESS_LEVEL'])
 
 # Create API namespaces
 ns_expenses = api.namespace('expenses', description='Transaction and spending management')
@@ -50,7 +276,52 @@ expense_input_model = api.model('TransactionInput', {
 
 expense_list_model = api.model('TransactionList', {
     'expenses': fields.List(fields.Nested(expense_model)),
-    'count': fields.Integer(description='Total transaction count')
+    'count': fields.Integer(description='Total transaction count'),
+    'next_cursor': fields.String(description='Cursor for the next page (paginated requests only, null on the last page)')
+})
+
+category_count_model = api.model('CategoryCount', {
+    'category': fields.String(description='Spending category', example='Food'),
+    'count': fields.Integer(description='Number of transactions in the category')
+})
+
+category_list_model = api.model('CategoryList', {
+    'categories': fields.List(fields.Nested(category_count_model)),
+    'count': fields.Integer(description='Number of distinct categories')
+})
+
+bulk_error_model = api.model('BulkRowError', {
+    'index': fields.Integer(description='Zero-based position of the rejected row'),
+    'error': fields.String(description='Why the row was rejected')
+})
+
+bulk_response_model = api.model('BulkResponse', {
+    'success': fields.Boolean(description='True when at least one row was recorded'),
+    'inserted': fields.Integer(description='Number of transactions recorded'),
+    'failed': fields.Integer(description='Number of rows rejected'),
+    'ids': fields.List(fields.String, description='Identifiers of the recorded transactions, in input order'),
+    'errors': fields.List(fields.Nested(bulk_error_model))
+})
+
+import_error_model = api.model('ImportRowError', {
+    'line': fields.Integer(description='CSV line on which the rejected row ends'),
+    'error': fields.String(description='Why the row was rejected')
+})
+
+import_result_model = api.model('ImportResult', {
+    'success': fields.Boolean(description='True when at least one row was imported'),
+    'rows': fields.Integer(description='Number of data rows read'),
+    'inserted': fields.Integer(description='Number of transactions recorded'),
+    'failed': fields.Integer(description='Number of rows rejected'),
+    'chunks': fields.Integer(description='Number of batches committed'),
+    'errors': fields.List(fields.Nested(import_error_model)),
+    'errors_truncated': fields.Boolean(description='True when more rows failed than are listed in errors')
+})
+
+delete_result_model = api.model('DeleteResult', {
+    'success': fields.Boolean(description='Operation success indicator'),
+    'deleted': fields.Integer(description='Number of transactions deleted'),
+    'message': fields.String(description='Status message')
 })
 
 response_model = api.model('ApiResponse', {
@@ -82,25 +353,55 @@ def home_dashboard():
 # Transaction Management Endpoints
 @ns_expenses.route('')
 class TransactionCollection(Resource):
+    @versioned(spend_controller)
     @ns_expenses.doc('retrieve_all_transactions', params={
         'category': 'Category filter',
-        'tag': 'Tag filter'
+        'date_from': 'Start date, inclusive (YYYY-MM-DD)',
+        'date_to': 'End date, inclusive (YYYY-MM-DD)',
+        'tag': 'Tag filter',
+        'limit': 'Page size; enables pagination ordered by date, then ID',
+        'cursor': 'next_cursor from the previous page',
+        'fields': 'Comma-separated transaction fields to include, e.g. id,amount,date'
     })
-    @ns_expenses.marshal_with(expense_list_model)
+    @ns_expenses.response(200, 'Success', expense_list_model)
+    @ns_expenses.response(400, 'Invalid date filter, limit or cursor')
     def get(self):
-        """Retrieve all transactions with optional category/tag filtering"""
+        """Retrieve all transactions with optional category/date/tag filtering and pagination"""
+        try:
+            selected_fields = parse_fields(request.args.get('fields'), TRANSACTION_FIELDS)
+        except ValueError as e:
+            api.abort(400, f'Invalid data format: {str(e)}')
         category_filter = request.args.get('category')
+        start_date = request.args.get('date_from')
+        end_date = request.args.get('date_to')
         tag_filter = request.args.get('tag')
+        page_limit = request.args.get('limit')
+        page_cursor = request.args.get('cursor')
+        
+        # Paginated listing when a limit or cursor is supplied
+        if page_limit or page_cursor:
+            try:
+                transaction_list, next_cursor = spend_controller.page_expenses(
+                    limit=int(page_limit) if page_limit else DEFAULT_PAGE_SIZE, cursor=page_cursor,
+                    category=category_filter, date_from=start_date, date_to=end_date
+                )
+            except ValueError as e:
+                api.abort(400, f'Invalid data format: {str(e)}')
+            return json_response(write_list('expenses', transaction_list, selected_fields, TRANSACTION_FIELDS,
+                                            extra={'next_cursor': next_cursor}))
         
-        if category_filter or tag_filter:
-            transaction_list = spend_controller.filter_expenses(category=category_filter, tag=tag_filter)
+        if any([category_filter, start_date, end_date, tag_filter]):
+            try:
+                transaction_list = spend_controller.filter_expenses(
+                    category=category_filter, date_from=start_date, date_to=end_date, tag=tag_filter
+                )
+            except ValueError as e:
+                api.abort(400, f'Invalid data format: {str(e)}')
         else:
             transaction_list = spend_controller.get_all_expenses()
         
-        return {
-            'expenses': [txn.to_dict() for txn in transaction_list],
-            'count': len(transaction_list)
-        }
+        return json_response(write_list('expenses', transaction_list, selected_fields, TRANSACTION_FIELDS,
+                                        extra={'next_cursor': None}))
     
     @ns_expenses.doc('record_new_transaction')
     @ns_expenses.expect(expense_input_model, validate=True)
@@ -131,16 +432,111 @@ class TransactionCollection(Resource):
             api.abort(400, f'Invalid data format: {str(e)}')
         except Exception as e:
             api.abort(500, f'Transaction creation failed: {str(e)}')
+    
+    @ns_expenses.doc('delete_matching_transactions', params={
+        'month': 'Month to clear (YYYY-MM)',
+        'category': 'Category filter',
+        'date_from': 'Start date, inclusive (YYYY-MM-DD)',
+        'date_to': 'End date, inclusive (YYYY-MM-DD)'
+    })
+    @ns_expenses.marshal_with(delete_result_model)
+    @ns_expenses.response(400, 'No filter given, or a filter is malformed')
+    def delete(self):
+        """Delete every transaction matching a month, date range and/or category in one operation"""
+        try:
+            deleted_count = spend_controller.delete_where(
+                month=request.args.get('month'), category=request.args.get('category'),
+                date_from=request.args.get('date_from'), date_to=request.args.get('date_to')
+            )
+        except ValueError as e:
+            api.abort(400, f'Invalid data format: {str(e)}')
+        return {
+            'success': True,
+            'deleted': deleted_count,
+            'message': f'{deleted_count} transaction(s) deleted'
+        }
+
+@ns_expenses.route('/bulk')
+class TransactionBulkCollection(Resource):
+    @ns_expenses.doc('record_transactions_in_bulk', body=[expense_input_model])
+    @ns_expenses.marshal_with(bulk_response_model, code=201)
+    @ns_expenses.response(400, 'Body is not a JSON array or NDJSON, or no row was valid')
+    @ns_expenses.response(413, 'Too many rows in one request')
+    def post(self):
+        """Record many transactions at once from a JSON array or NDJSON (application/x-ndjson) body"""
+        try:
+            if request.mimetype == 'application/x-ndjson':
+                rows = [json.loads(line) for line in request.get_data(as_text=True).splitlines() if line.strip()]
+            else:
+                rows = request.get_json(force=True)
+        except ValueError as e:
+            api.abort(400, f'Invalid data format: {str(e)}')
+        if not isinstance(rows, list):
+            api.abort(400, 'Invalid data format: expected a JSON array of transactions')
+        if len(rows) > MAX_BULK_ROWS:
+            api.abort(413, f'At most {MAX_BULK_ROWS} transactions per request')
+        
+        created, row_errors = spend_controller.add_expenses(rows)
+        bulk_response = {
+            'success': bool(created),
+            'inserted': len(created),
+            'failed': len(row_errors),
+            'ids': [txn.id for txn in created],
+            'errors': row_errors
+        }
+        return bulk_response, 201 if created else 400
+
+@ns_expenses.route('/import/csv')
+class DataImportResource(Resource):
+    @ns_expenses.doc('import_transactions_csv', params={
+        'file': {'in': 'formData', 'type': 'file', 'description': 'CSV file with Amount and Category columns'}
+    })
+    @ns_expenses.marshal_with(import_result_model, code=201)
+    @ns_expenses.response(400, 'Missing file, bad header, malformed CSV, or no row was valid')
+    def post(self):
+        """Import transactions from a CSV upload (multipart 'file' field or a text/csv body)"""
+        upload = request.files.get('file')
+        if upload is not None:
+            csv_stream = upload.stream
+        elif request.mimetype == 'text/csv':
+            csv_stream = request.stream
+        else:
+            api.abort(400, "Upload a CSV file in the 'file' field or send a text/csv body")
+        
+        try:
+            import_report = spend_controller.import_csv(csv_stream)
+        except ValueError as e:
+            api.abort(400, f'Invalid data format: {str(e)}')
+        import_report['success'] = import_report['inserted'] > 0
+        return import_report, 201 if import_report['success'] else 400
+
+@ns_expenses.route('/categories')
+class TransactionCategoryCollection(Resource):
+    @versioned(spend_controller)
+    @ns_expenses.doc('list_transaction_categories')
+    @ns_expenses.marshal_with(category_list_model)
+    def get(self):
+        """List distinct spending categories with transaction counts"""
+        category_counts = spend_controller.get_category_counts()
+        return {
+            'categories': category_counts,
+            'count': len(category_counts)
+        }
 
 @ns_expenses.route('/<string:expense_id>')
 @ns_expenses.param('expense_id', 'Transaction identifier')
 class TransactionResource(Resource):
+    @versioned(spend_controller)
     @ns_expenses.doc('fetch_transaction_details')
     @ns_expenses.response(200, 'Transaction found', expense_model)
     @ns_expenses.response(404, 'Transaction not found')
+    @ns_expenses.response(409, 'Transaction ID prefix is ambiguous')
     def get(self, expense_id):
         """Fetch details of a specific transaction"""
-        transaction = spend_controller.get_expense_by_id(expense_id)
+        try:
+            transaction = spend_controller.get_expense_by_id(expense_id)
+        except AmbiguousIdError as e:
+            api.abort(409, str(e))
         if transaction:
             return {'expense': transaction.to_dict()}
         api.abort(404, f'Transaction {expense_id} does not exist')
@@ -149,6 +545,7 @@ class TransactionResource(Resource):
     @ns_expenses.expect(expense_input_model)
     @ns_expenses.marshal_with(response_model)
     @ns_expenses.response(404, 'Transaction not found')
+    @ns_expenses.response(409, 'Transaction ID prefix is ambiguous')
     def put(self, expense_id):
         """Modify an existing transaction record"""
         payload = api.payload
@@ -170,6 +567,8 @@ class TransactionResource(Resource):
                     'message': 'Transaction modified successfully'
                 }
             api.abort(404, f'Transaction {expense_id} does not exist')
+        except AmbiguousIdError as e:
+            api.abort(409, str(e))
         except ValueError as e:
             api.abort(400, f'Invalid data format: {str(e)}')
         except Exception as e:
@@ -178,43 +577,63 @@ class TransactionResource(Resource):
     @ns_expenses.doc('remove_transaction')
     @ns_expenses.response(200, 'Transaction removed')
     @ns_expenses.response(404, 'Transaction not found')
+    @ns_expenses.response(409, 'Transaction ID prefix is ambiguous')
     def delete(self, expense_id):
         """Remove a transaction from records"""
-        if spend_controller.delete_expense(expense_id):
+        try:
+            deleted = spend_controller.delete_expense(expense_id)
+        except AmbiguousIdError as e:
+            api.abort(409, str(e))
+        if deleted:
             return {'success': True, 'message': 'Transaction removed successfully'}
         api.abort(404, f'Transaction {expense_id} does not exist')
 
 @ns_expenses.route('/export/csv')
 class DataExportResource(Resource):
-    @ns_expenses.doc('export_transactions_csv')
-    @ns_expenses.response(200, 'CSV export file generated')
+    @versioned(spend_controller)
+    @ns_expenses.doc('export_transactions_csv', params={
+        'category': 'Category filter',
+        'date_from': 'Start date, inclusive (YYYY-MM-DD)',
+        'date_to': 'End date, inclusive (YYYY-MM-DD)',
+        'gzip': 'Set to true to download a gzip-compressed .csv.gz file'
+    })
+    @ns_expenses.response(200, 'CSV export streamed')
+    @ns_expenses.response(400, 'Invalid date filter')
     def get(self):
-        """Generate CSV export of all transactions"""
-        csv_content = spend_controller.export_to_csv()
-        
-        buffer = io.BytesIO()
-        buffer.write(csv_content.encode('utf-8'))
-        buffer.seek(0)
+        """Stream a CSV export of transactions ordered by date, with optional filters"""
+        try:
+            csv_chunks = spend_controller.iter_csv(
+                category=request.args.get('category'),
+                date_from=request.args.get('date_from'),
+                date_to=request.args.get('date_to')
+            )
+        except ValueError as e:
+            api.abort(400, f'Invalid data format: {str(e)}')
         
         timestamp = datetime.now().strftime("%Y%m%d")
-        return send_file(
-            buffer,
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'spendsense_transactions_{timestamp}.csv'
-        )
+        download_name = f'spendsense_transactions_{timestamp}.csv'
+        mimetype = 'text/csv'
+        if request.args.get('gzip', '').lower() in ('1', 'true', 'yes'):
+            csv_chunks = gzip_chunks(csv_chunks)
+            download_name += '.gz'
+            mimetype = 'application/gzip'
+        
+        return Response(csv_chunks, mimetype=mimetype,
+                        headers={'Content-Disposition': f'attachment; filename={download_name}'})
 
 # Budget Planning Endpoints
 @ns_budgets.route('')
 class BudgetPlanCollection(Resource):
+    @versioned(sense_controller)
     @ns_budgets.doc('retrieve_all_budgets')
     def get(self):
         """Retrieve all budget plans"""
+        try:
+            selected_fields = parse_fields(request.args.get('fields'), BUDGET_FIELDS)
+        except ValueError as e:
+            api.abort(400, f'Invalid data format: {str(e)}')
         budget_plans = sense_controller.get_all_budgets()
-        return {
-            'budgets': [plan.to_dict() for plan in budget_plans],
-            'count': len(budget_plans)
-        }
+        return json_response(write_list('budgets', budget_plans, selected_fields, BUDGET_FIELDS))
     
     @ns_budgets.doc('create_budget_plan')
     @ns_budgets.expect(budget_input_model)
@@ -239,11 +658,12 @@ class BudgetPlanCollection(Resource):
 
 @ns_budgets.route('/analysis/<string:month>')
 class BudgetAnalyticsResource(Resource):
+    @versioned(spend_controller, sense_controller)
     @ns_budgets.doc('analyze_budget_performance', params={'month': 'Period in YYYY-MM format'})
     def get(self, month):
         """Analyze budget performance vs actual spending for a period"""
-        transaction_list = spend_controller.get_all_expenses()
-        performance_data = sense_controller.calculate_spending_vs_budget(transaction_list, month)
+        category_spending = spend_controller.get_category_totals(month)
+        performance_data = sense_controller.analyze_category_spending(category_spending, month)
         return performance_data
 
 @ns_budgets.route('/<string:budget_id>')
@@ -257,213 +677,194 @@ class BudgetPlanResource(Resource):
 
 # Supplementary Web Interface Routes
 @app.route('/api/stats', methods=['GET'])
+@versioned(spend_controller)
 def fetch_spending_statistics():
     """Retrieve comprehensive spending statistics"""
-    transaction_list = spend_controller.get_all_expenses()
-    
-    if not transaction_list:
-        return jsonify({
-            'total': 0,
-            'count': 0,
-            'by_category': {},
-            'by_date': {}
-        })
-    
-    total_spent = sum(txn.amount for txn in transaction_list)
-    
-    category_totals = defaultdict(float)
-    for txn in transaction_list:
-        category_totals[txn.category] += txn.amount
-    
-    daily_totals = defaultdict(float)
-    for txn in transaction_list:
-        daily_totals[txn.date] += txn.amount
-    
-    return jsonify({
-        'total': total_spent,
-        'count': len(transaction_list),
-        'by_category': dict(category_totals),
-        'by_date': dict(sorted(daily_totals.items()))
-    })
+    return jsonify(spend_controller.get_spending_statistics())
 
 @app.route('/api/chart/category', methods=['GET'])
+@versioned(spend_controller)
 def generate_category_distribution():
     """Generate spending distribution pie chart by category"""
-    # Extract period filters from query parameters
-    filter_month = request.args.get('month', type=int)
-    filter_year = request.args.get('year', type=int)
+    try:
+        period = category_chart_period()
+    except ValueError as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}', 'success': False}), 400
+    return chart_response(('category',) + period, lambda: category_chart_series(*period))
+
+def category_chart_period() -> tuple:
+    """
+    Read the optional month and year filters of the category chart.
     
-    transaction_list = spend_controller.get_all_expenses()
+    Returns:
+        Tuple of (year, month), or (None, None) for all time
     
-    # Apply period filtering if specified
+    Raises:
+        ValueError: If the month is not 1-12 or the year is not 1-9999
+    """
+    filter_month = request.args.get('month', type=int)
+    filter_year = request.args.get('year', type=int)
+    if filter_month is None or filter_year is None:
+        return None, None
+    if not 1 <= filter_month <= 12:
+        raise ValueError('month must be between 1 and 12')
+    if not 1 <= filter_year <= 9999:
+        raise ValueError('year must be between 1 and 9999')
+    return filter_year, filter_month
+
+def category_chart_series(filter_year, filter_month) -> dict:
+    """Collect the category pie chart's totals and title for a period (or all time)"""
+    # Read category totals for the requested period from the spending rollups
     if filter_month is not None and filter_year is not None:
-        period_filtered = []
-        for txn in transaction_list:
-            txn_date = datetime.strptime(txn.date, '%Y-%m-%d')
-            if txn_date.month == filter_month and txn_date.year == filter_year:
-                period_filtered.append(txn)
-        transaction_list = period_filtered
-    
-    if not transaction_list:
-        # Generate empty state visualization
-        fig, ax = plt.subplots(figsize=(6, 5))
-        ax.text(0.5, 0.5, 'No spending data to display', ha='center', va='center', fontsize=14)
-        ax.axis('off')
-    else:
-        category_sums = defaultdict(float)
-        for txn in transaction_list:
-            category_sums[txn.category] += txn.amount
-        
-        fig, ax = plt.subplots(figsize=(6, 5))
-        category_labels = list(category_sums.keys())
-        spending_values = list(category_sums.values())
-        
-        chart_colors = plt.cm.Set3(range(len(category_labels)))
-        ax.pie(spending_values, labels=category_labels, autopct='%1.1f%%', startangle=90, colors=chart_colors)
-        
-        # Customize title based on filter presence
-        if filter_month is not None and filter_year is not None:
-            period_label = datetime(filter_year, filter_month, 1).strftime('%B %Y')
-            ax.set_title(f'Category Breakdown - {period_label}', fontsize=14, fontweight='bold')
-        else:
-            ax.set_title('Spending by Category', fontsize=14, fontweight='bold')
-    
-    image_buffer = io.BytesIO()
-    plt.savefig(image_buffer, format='png', bbox_inches='tight', dpi=100)
-    image_buffer.seek(0)
-    plt.close()
-    
-    return send_file(image_buffer, mimetype='image/png')
+        period_label = datetime(filter_year, filter_month, 1).strftime('%B %Y')
+        return {'categories': spend_controller.get_category_totals(f'{filter_year:04d}-{filter_month:02d}'),
+                'title': f'Category Breakdown - {period_label}'}
+    return {'categories': spend_controller.get_category_totals(), 'title': 'Spending by Category'}
 
 @app.route('/api/budgets/current', methods=['GET'])
+@versioned(spend_controller, sense_controller, scope=lambda: datetime.now().strftime('%Y-%m'))
 def fetch_active_budget_info():
     """Retrieve current month's budget information and performance"""
     active_period = datetime.now().strftime('%Y-%m')
     period_budgets = sense_controller.get_budgets_by_month(active_period)
-    transaction_list = spend_controller.get_all_expenses()
-    performance_analysis = sense_controller.calculate_spending_vs_budget(transaction_list, active_period)
+    category_spending = spend_controller.get_category_totals(active_period)
+    performance_analysis = sense_controller.analyze_category_spending(category_spending, active_period)
     
     return jsonify({
         'budgets': [plan.to_dict() for plan in period_budgets],
         'analysis': performance_analysis
     })
 
-@app.route('/api/chart/budget/<string:month>', methods=['GET'])
-def visualize_budget_comparison(month):
-    """Generate comprehensive budget vs actual spending visualization"""
-    transaction_list = spend_controller.get_all_expenses()
-    performance_data = sense_controller.calculate_spending_vs_budget(transaction_list, month)
+@app.route('/api/dashboard', methods=['GET'])
+@versioned(spend_controller, sense_controller, scope=lambda: request.args.get('month') or datetime.now().strftime('%Y-%m'))
+def fetch_dashboard():
+    """Retrieve everything the dashboard shows for a month in a single response"""
+    period = request.args.get('month') or datetime.now().strftime('%Y-%m')
+    try:
+        selected_fields = parse_fields(request.args.get('fields'), TRANSACTION_FIELDS)
+        snapshot = spend_controller.get_dashboard(period, limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int))
+    except ValueError as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}', 'success': False}), 400
     
-    if performance_data['total_budget'] == 0:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.text(0.5, 0.5, 'No budget allocation for this period', ha='center', va='center', fontsize=16)
-        ax.axis('off')
-    else:
-        # Generate dual-panel comparison visualization
-        fig, (gauge_ax, compare_ax) = plt.subplots(1, 2, figsize=(14, 6))
-        
-        # Left panel: Overall budget utilization gauge
-        actual_spent = performance_data['total_spent']
-        allocated_budget = performance_data['total_budget']
-        budget_remaining = performance_data['total_remaining']
-        
-        gauge_colors = ['#48bb78' if budget_remaining >= 0 else '#f56565', '#e2e8f0']
-        gauge_portions = [min(actual_spent, allocated_budget), max(0, budget_remaining)]
-        
-        if sum(gauge_portions) > 0:
-            gauge_ax.pie(gauge_portions, labels=['Utilized', 'Available'], autopct='%1.1f%%', 
-                   startangle=90, colors=gauge_colors)
-        gauge_ax.set_title(f'Budget Utilization\n${actual_spent:.2f} of ${allocated_budget:.2f}', 
-                     fontsize=14, fontweight='bold')
-        
-        # Right panel: Category-level comparison
-        if performance_data['categories']:
-            cat_names = list(performance_data['categories'].keys())
-            allocated_amounts = [performance_data['categories'][c]['budget'] for c in cat_names]
-            actual_amounts = [performance_data['categories'][c]['spent'] for c in cat_names]
-            
-            bar_positions = range(len(cat_names))
-            bar_width = 0.35
-            
-            compare_ax.bar([i - bar_width/2 for i in bar_positions], allocated_amounts, bar_width, 
-                          label='Allocated', color='#4299e1')
-            compare_ax.bar([i + bar_width/2 for i in bar_positions], actual_amounts, bar_width, 
-                          label='Actual', color='#ed8936')
-            
-            compare_ax.set_xlabel('Spending Categories')
-            compare_ax.set_ylabel('Dollar Amount ($)')
-            compare_ax.set_title('Category-Level Budget Analysis', fontsize=14, fontweight='bold')
-            compare_ax.set_xticks(bar_positions)
-            compare_ax.set_xticklabels(cat_names, rotation=45, ha='right')
-            compare_ax.legend()
-            compare_ax.grid(axis='y', alpha=0.3)
-        else:
-            compare_ax.text(0.5, 0.5, 'No category-specific budgets', ha='center', va='center', fontsize=14)
-            compare_ax.axis('off')
+    budget_analysis = sense_controller.analyze_category_spending(snapshot['categories'], snapshot['month'])
+    return json_response(write_list('expenses', snapshot['expenses'], selected_fields, TRANSACTION_FIELDS, extra={
+        'next_cursor': snapshot['next_cursor'],
+        'month': snapshot['month'],
+        'version': snapshot['version'],
+        'stats': snapshot['stats'],
+        'categories': snapshot['categories'],
+        'budget': budget_analysis,
+        'history': snapshot['history']
+    }))
+
+@app.route('/api/events', methods=['GET'])
+def stream_change_events():
+    """Stream expense change events as Server-Sent Events"""
+    # Event IDs are instance:version, so a tag from a previous run can never resume
+    last_seen = request.headers.get('Last-Event-ID') or request.args.get('since')
+    since = None
+    if last_seen:
+        instance, _, version = last_seen.rpartition(':')
+        if not version.isdigit():
+            return jsonify({'error': 'Invalid data format: since must be a version number', 'success': False}), 400
+        since = int(version) if instance in ('', INSTANCE_TAG) else -1
+    heartbeat = app.config['EVENTS_HEARTBEAT']
     
-    plt.tight_layout()
-    image_buffer = io.BytesIO()
-    plt.savefig(image_buffer, format='png', bbox_inches='tight', dpi=100)
-    image_buffer.seek(0)
-    plt.close()
+    def generate():
+        subscription = change_feed.subscribe(since)
+        try:
+            yield f'retry: {EVENTS_RETRY_MS}\nevent: hello\ndata: {{"version":{change_feed.version}}}\n\n'
+            while True:
+                event = subscription.next_event(heartbeat)
+                if subscription.lagging:
+                    # Too far behind to patch: the client reloads, then resumes from this version
+                    yield f'id: {INSTANCE_TAG}:{change_feed.version}\nevent: reset\ndata: {{"version":{change_feed.version}}}\n\n'
+                    return
+                if event is None:
+                    yield ': heartbeat\n\n'
+                else:
+                    yield f'id: {INSTANCE_TAG}:{event["version"]}\nevent: change\ndata: {json.dumps(event, separators=(",", ":"))}\n\n'
+        finally:
+            change_feed.unsubscribe(subscription)
     
-    return send_file(image_buffer, mimetype='image/png')
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/chart/cache', methods=['GET'])
+def fetch_chart_cache_stats():
+    """Report chart cache hits, misses, evictions and memory use"""
+    return jsonify(chart_cache.stats())
+
+@app.route('/api/chart/budget/<string:month>', methods=['GET'])
+@versioned(spend_controller, sense_controller)
+def visualize_budget_comparison(month):
+    """Generate comprehensive budget vs actual spending visualization"""
+    return chart_response(('budget', month), lambda: budget_chart_series(month))
+
+def budget_chart_series(month: str) -> dict:
+    """Collect the overall and per-category budget figures the budget chart compares"""
+    category_spending = spend_controller.get_category_totals(month)
+    performance_data = sense_controller.analyze_category_spending(category_spending, month)
+    return {
+        'total_spent': performance_data['total_spent'],
+        'total_budget': performance_data['total_budget'],
+        'total_remaining': performance_data['total_remaining'],
+        'categories': {name: {'budget': figures['budget'], 'spent': figures['spent']}
+                       for name, figures in performance_data['categories'].items()}
+    }
 
 @app.route('/api/chart/monthly-trend', methods=['GET'])
+@versioned(spend_controller, sense_controller)
 def generate_spending_timeline():
     """Generate historical spending trend visualization"""
-    transaction_list = spend_controller.get_all_expenses()
+    return chart_response(('monthly-trend',), trend_chart_series)
+
+def trend_chart_series() -> dict:
+    """Collect actual spending and overall budgets per month, in chronological order"""
+    # Seed periods from the monthly spending rollup
+    period_aggregates = defaultdict(lambda: {'spent': 0, 'budget': 0})
+    monthly_spending = spend_controller.get_monthly_totals()
+    if not monthly_spending:
+        return {'periods': [], 'spent': [], 'budget': []}
     
-    if not transaction_list:
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.text(0.5, 0.5, 'Insufficient data for trend analysis', ha='center', va='center', fontsize=16)
-        ax.axis('off')
-    else:
-        # Aggregate transactions by month
-        period_aggregates = defaultdict(lambda: {'spent': 0, 'budget': 0})
-        
-        for txn in transaction_list:
-            period_key = txn.date[:7]  # Extract YYYY-MM
-            period_aggregates[period_key]['spent'] += txn.amount
-        
-        # Incorporate budget allocations
-        for budget_plan in sense_controller.get_all_budgets():
-            if not budget_plan.category:  # Overall budgets only
-                period_aggregates[budget_plan.month]['budget'] = budget_plan.amount
-        
-        # Chronologically order periods
-        sorted_periods = sorted(period_aggregates.keys())
-        actual_spending = [period_aggregates[p]['spent'] for p in sorted_periods]
-        planned_budgets = [period_aggregates[p]['budget'] for p in sorted_periods]
-        
-        # Construct timeline visualization
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        ax.plot(sorted_periods, actual_spending, marker='o', label='Actual Spending', 
-               linewidth=2, color='#ed8936')
-        ax.plot(sorted_periods, planned_budgets, marker='s', label='Planned Budget', 
-               linewidth=2, linestyle='--', color='#4299e1')
-        
-        ax.set_xlabel('Time Period', fontsize=12)
-        ax.set_ylabel('Dollar Amount ($)', fontsize=12)
-        ax.set_title('Spending Trend Over Time', fontsize=16, fontweight='bold')
-        ax.legend(fontsize=10)
-        ax.grid(True, alpha=0.3)
-        plt.xticks(rotation=45, ha='right')
-        
-        # Highlight overspending periods
-        for idx, period in enumerate(sorted_periods):
-            if planned_budgets[idx] > 0 and actual_spending[idx] > planned_budgets[idx]:
-                ax.axvspan(idx-0.3, idx+0.3, alpha=0.2, color='red')
-        
-        plt.tight_layout()
+    for period_key, period_spent in monthly_spending.items():
+        period_aggregates[period_key]['spent'] = period_spent
     
-    image_buffer = io.BytesIO()
-    plt.savefig(image_buffer, format='png', bbox_inches='tight', dpi=100)
-    image_buffer.seek(0)
-    plt.close()
+    # Incorporate budget allocations
+    for budget_plan in sense_controller.get_all_budgets():
+        if not budget_plan.category:  # Overall budgets only
+            period_aggregates[budget_plan.month]['budget'] = budget_plan.amount
     
-    return send_file(image_buffer, mimetype='image/png')
+    # Chronologically order periods
+    sorted_periods = sorted(period_aggregates.keys())
+    return {
+        'periods': sorted_periods,
+        'spent': [period_aggregates[p]['spent'] for p in sorted_periods],
+        'budget': [period_aggregates[p]['budget'] for p in sorted_periods]
+    }
+
+# Chart data for client-side rendering: the same series the PNG charts are drawn from
+@app.route('/api/chart-data/category', methods=['GET'])
+@versioned(spend_controller)
+def fetch_category_chart_data():
+    """Retrieve the category distribution chart's totals as JSON"""
+    try:
+        period = category_chart_period()
+    except ValueError as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}', 'success': False}), 400
+    return jsonify(category_chart_series(*period))
+
+@app.route('/api/chart-data/budget/<string:month>', methods=['GET'])
+@versioned(spend_controller, sense_controller)
+def fetch_budget_chart_data(month):
+    """Retrieve the budget vs actual chart's figures as JSON"""
+    return jsonify(budget_chart_series(month))
+
+@app.route('/api/chart-data/monthly-trend', methods=['GET'])
+@versioned(spend_controller, sense_controller)
+def fetch_trend_chart_data():
+    """Retrieve the spending trend chart's monthly series as JSON"""
+    return jsonify(trend_chart_series())
 
 # Global Error Handlers
 @app.errorhandler(404)
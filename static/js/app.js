@@ -2,16 +2,19 @@ const API_BASE = '/api';
 let editingExpenseId = null;
 let currentBudgetMonth = '';
 let selectedMonth = new Date(); // Track the selected month for navigation
+let dashboardState = null; // Last dashboard snapshot, patched by live change events
+let liveFeed = null;
+let liveFeedOpen = false;
 
 // Initialize
 document.addEventListener('DOMContentLoaded', () => {
     setDefaultDate();
     setDefaultBudgetMonth();
     updateMonthDisplay();
-    loadExpenses();
-    loadStats();
+    loadDashboard();
     loadChart();
     loadTrendChart();
+    loadCategoryOptions();
     
     document.getElementById('expenseForm').addEventListener('submit', handleSubmit);
     document.getElementById('cancelBtn').addEventListener('click', cancelEdit);
@@ -32,6 +35,39 @@ function setDefaultBudgetMonth() {
     currentBudgetMonth = currentMonth;
 }
 
+// Add categories already used in the ledger to the category dropdowns
+async function loadCategoryOptions() {
+    try {
+        const response = await fetch(`${API_BASE}/expenses/categories`);
+        const data = await response.json();
+        
+        ['category', 'budgetCategory'].forEach(selectId => {
+            const select = document.getElementById(selectId);
+            if (!select) return;
+            
+            const known = new Set(Array.from(select.options).map(option => option.value.toLowerCase()));
+            const missing = data.categories.filter(entry => entry.category && !known.has(entry.category.toLowerCase()));
+            if (missing.length === 0) return;
+            
+            let group = select.querySelector('optgroup[data-source="ledger"]');
+            if (!group) {
+                group = document.createElement('optgroup');
+                group.label = 'Previously Used';
+                group.dataset.source = 'ledger';
+                select.appendChild(group);
+            }
+            missing.forEach(entry => {
+                const option = document.createElement('option');
+                option.value = entry.category;
+                option.textContent = `${entry.category} (${entry.count})`;
+                group.appendChild(option);
+            });
+        });
+    } catch (error) {
+        console.error('Error loading categories:', error);
+    }
+}
+
 // Tab Navigation
 function showTab(tabName) {
     // Hide all tabs
@@ -58,8 +94,7 @@ function showTab(tabName) {
     if (tabName === 'transactions' || tabName === 'expenses') {
         document.getElementById('transactionsTab').classList.add('active');
         document.querySelectorAll('.nav-btn')[0].classList.add('active');
-        loadExpenses();
-        loadStats();
+        loadDashboard();
         loadChart();
     } else if (tabName === 'goals') {
         document.getElementById('goalsTab').classList.add('active');
@@ -102,8 +137,7 @@ function previousMonth() {
     selectedMonth = new Date(selectedMonth.getFullYear(), selectedMonth.getMonth() - 1, 1);
     updateMonthDisplay();
     // Reload data for the new month
-    loadExpenses();
-    loadStats();
+    loadDashboard();
     loadChart();
 }
 
@@ -112,35 +146,179 @@ function nextMonth() {
     selectedMonth = new Date(selectedMonth.getFullYear(), selectedMonth.getMonth() + 1, 1);
     updateMonthDisplay();
     // Reload data for the new month
-    loadExpenses();
-    loadStats();
+    loadDashboard();
     loadChart();
 }
 
 // Expense Functions
-async function loadExpenses() {
-    try {
-        const response = await fetch(`${API_BASE}/expenses`);
-        const data = await response.json();
-        console.log('Loaded expenses:', data);
+const EXPENSE_PAGE_SIZE = 500;
+
+// Fetch all expenses matching the filters, following the API's keyset pages
+// (optionally resuming from a cursor handed out by an earlier page)
+async function fetchExpenses(filters = {}, cursor = null) {
+    const expenses = [];
+    
+    do {
+        const params = new URLSearchParams({ ...filters, limit: EXPENSE_PAGE_SIZE });
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
         
-        // Filter expenses by selected month
-        const targetMonth = selectedMonth.getMonth();
-        const targetYear = selectedMonth.getFullYear();
+        const response = await fetch(`${API_BASE}/expenses?${params}`);
+        if (!response.ok) {
+            throw new Error('Failed to fetch expenses');
+        }
         
-        const filteredExpenses = data.expenses.filter(expense => {
-            const expenseDate = new Date(expense.date);
-            return expenseDate.getMonth() === targetMonth && 
-                   expenseDate.getFullYear() === targetYear;
-        });
+        const data = await response.json();
+        expenses.push(...data.expenses);
+        cursor = data.next_cursor;
+    } while (cursor);
+    
+    return expenses;
+}
+
+// YYYY-MM key of the month containing the given date
+function monthKey(date) {
+    return `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
+}
+
+// Date range filter covering the whole month of the given date
+function monthFilter(date) {
+    const year = date.getFullYear();
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const lastDay = new Date(year, date.getMonth() + 1, 0).getDate();
+    return { date_from: `${year}-${month}-01`, date_to: `${year}-${month}-${lastDay}` };
+}
+
+// Load the selected month's transactions, stats, category breakdown and history in one request
+async function loadDashboard() {
+    try {
+        const response = await fetch(`${API_BASE}/dashboard?month=${monthKey(selectedMonth)}&limit=${EXPENSE_PAGE_SIZE}`);
+        if (!response.ok) {
+            throw new Error('Failed to fetch dashboard');
+        }
+        
+        const dashboard = await response.json();
+        let expenses = dashboard.expenses;
+        if (dashboard.next_cursor) {
+            // Busy month: follow the remaining pages of transactions
+            expenses = expenses.concat(await fetchExpenses(monthFilter(selectedMonth), dashboard.next_cursor));
+        }
         
-        displayExpenses(filteredExpenses);
+        dashboardState = { ...dashboard, expenses };
+        renderDashboard();
+        if (!liveFeed) {
+            connectLiveFeed(dashboard.version);
+        }
     } catch (error) {
-        console.error('Error loading expenses:', error);
+        console.error('Error loading dashboard:', error);
         showError('Failed to load expenses');
     }
 }
 
+function renderDashboard() {
+    displayExpenses(dashboardState.expenses);
+    displayStats(dashboardState.stats);
+    displayCategoryBreakdown(dashboardState.categories);
+    if (dashboardState.month === monthKey(new Date())) {
+        displayHistory(dashboardState.history);
+    }
+}
+
+// Live Updates
+// Subscribe to the server's change feed so edits from any tab patch the dashboard in place
+function connectLiveFeed(version) {
+    if (!window.EventSource) {
+        return;
+    }
+    
+    liveFeed = new EventSource(`${API_BASE}/events?since=${version}`);
+    liveFeed.addEventListener('hello', () => { liveFeedOpen = true; });
+    liveFeed.addEventListener('change', e => applyChangeEvent(JSON.parse(e.data)));
+    // Too far behind to patch: reload, then the feed resumes after the reset
+    liveFeed.addEventListener('reset', () => { loadDashboard(); });
+    liveFeed.onerror = () => { liveFeedOpen = false; };
+}
+
+function applyChangeEvent(event) {
+    if (!dashboardState || event.version <= dashboardState.version) {
+        return;
+    }
+    dashboardState.version = event.version;
+    
+    const month = dashboardState.month;
+    const [year, monthNumber] = month.split('-').map(Number);
+    const previousKey = monthKey(new Date(year, monthNumber - 2, 1));
+    let monthAffected = false;
+    
+    // Rollups carry the new totals of every affected month, so they are copied, never summed
+    event.rollups.months.forEach(summary => {
+        const entry = dashboardState.history.find(h => h.month === summary.month);
+        if (entry) {
+            Object.assign(entry, summary);
+        }
+        if (summary.month === month) {
+            monthAffected = true;
+            dashboardState.stats.total = summary.total;
+            dashboardState.stats.count = summary.count;
+            dashboardState.categories = Object.fromEntries(
+                Object.entries(summary.categories).sort((a, b) => b[1] - a[1]));
+        } else if (summary.month === previousKey) {
+            dashboardState.stats.previous_total = summary.total;
+        }
+    });
+    
+    if (monthAffected && !patchExpenses(event)) {
+        // Not enough detail to patch the list (e.g. a bulk import): reload the month
+        loadDashboard();
+    } else {
+        renderDashboard();
+    }
+    
+    loadTrendChart();
+    if (monthAffected) {
+        loadChart();
+    }
+}
+
+// Apply a change event to the selected month's transaction list; false if it cannot be patched
+function patchExpenses(event) {
+    const month = dashboardState.month;
+    let expenses = dashboardState.expenses;
+    
+    if (event.op === 'add') {
+        if (!event.expenses) {
+            return false;
+        }
+        expenses = expenses.concat(event.expenses.filter(e => e.date.startsWith(month)));
+    } else if (event.op === 'update') {
+        const index = expenses.findIndex(e => e.id === event.ids[0]);
+        const changes = event.changes || {};
+        if (index === -1) {
+            // Moved into this month: only the changed fields are known
+            return !changes.date;
+        }
+        expenses[index] = { ...expenses[index], ...changes };
+        expenses = expenses.filter(e => e.date.startsWith(month));
+    } else if (event.op === 'delete') {
+        if (!event.ids) {
+            return false;
+        }
+        expenses = expenses.filter(e => !event.ids.includes(e.id));
+    } else if (event.op === 'delete_where') {
+        const filters = event.filters;
+        expenses = expenses.filter(e => !(
+            (!filters.category || e.category.toLowerCase() === filters.category.toLowerCase()) &&
+            (!filters.date_from || e.date >= filters.date_from) &&
+            (!filters.date_to || e.date <= filters.date_to)));
+    }
+    
+    // Keep the API's date, then ID order
+    dashboardState.expenses = expenses.sort((a, b) =>
+        a.date.localeCompare(b.date) || a.id.localeCompare(b.id));
+    return true;
+}
+
 function displayExpenses(expenses) {
     const container = document.getElementById('expensesList');
     
@@ -184,130 +362,69 @@ function displayExpenses(expenses) {
     }).join('');
 }
 
-async function loadStats() {
-    try {
-        const response = await fetch(`${API_BASE}/expenses`);
-        const data = await response.json();
-        const expenses = data.expenses || [];
-        
-        // Get selected month and year
-        const targetMonth = selectedMonth.getMonth();
-        const targetYear = selectedMonth.getFullYear();
-        
-        // Filter expenses for selected month only
-        const monthExpenses = expenses.filter(expense => {
-            const expenseDate = new Date(expense.date);
-            return expenseDate.getMonth() === targetMonth && 
-                   expenseDate.getFullYear() === targetYear;
-        });
-        
-        // Calculate selected month's total
-        const monthTotal = monthExpenses.reduce((sum, expense) => {
-            return sum + parseFloat(expense.amount || 0);
-        }, 0);
-        
-        console.log(`Expenses for ${selectedMonth.toLocaleDateString('en-US', { month: 'long', year: 'numeric' })}:`, monthTotal);
-        
-        // Update sidebar stats with selected month total
-        const totalEl = document.getElementById('totalExpenses');
-        if (totalEl) {
-            totalEl.textContent = `$${monthTotal.toFixed(2)}`;
-        }
-        
-        // Update financial health meter with selected month total
-        const netPositionEl = document.getElementById('netPosition');
-        if (netPositionEl) {
-            netPositionEl.textContent = `$${monthTotal.toFixed(2)}`;
-        }
-        
-        // Update month expenses if exists
-        const monthEl = document.getElementById('monthExpenses');
-        if (monthEl) {
-            monthEl.textContent = `$${monthTotal.toFixed(2)}`;
-        }
-        
-        // Calculate and update average daily spend for selected month
-        await calculateAverageDailySpend();
-    } catch (error) {
-        console.error('Error loading stats:', error);
+function displayStats(stats) {
+    const monthTotal = stats.total;
+    
+    // Update sidebar stats with selected month total
+    const totalEl = document.getElementById('totalExpenses');
+    if (totalEl) {
+        totalEl.textContent = `$${monthTotal.toFixed(2)}`;
+    }
+    
+    // Update financial health meter with selected month total
+    const netPositionEl = document.getElementById('netPosition');
+    if (netPositionEl) {
+        netPositionEl.textContent = `$${monthTotal.toFixed(2)}`;
     }
+    
+    // Update month expenses if exists
+    const monthEl = document.getElementById('monthExpenses');
+    if (monthEl) {
+        monthEl.textContent = `$${monthTotal.toFixed(2)}`;
+    }
+    
+    displayAverageDailySpend(stats);
 }
 
-async function calculateAverageDailySpend() {
-    try {
-        const response = await fetch(`${API_BASE}/expenses`);
-        const data = await response.json();
-        const expenses = data.expenses || [];
-        
-        // Get selected month and year
-        const targetMonth = selectedMonth.getMonth();
-        const targetYear = selectedMonth.getFullYear();
-        const now = new Date();
-        const isCurrentMonth = targetMonth === now.getMonth() && targetYear === now.getFullYear();
-        
-        // For current month, use current day; for past months, use last day of month
-        const daysInMonth = isCurrentMonth ? now.getDate() : new Date(targetYear, targetMonth + 1, 0).getDate();
-        
-        // Filter expenses for selected month
-        const monthExpenses = expenses.filter(expense => {
-            const expenseDate = new Date(expense.date);
-            return expenseDate.getMonth() === targetMonth && 
-                   expenseDate.getFullYear() === targetYear;
-        });
-        
-        // Calculate total for selected month
-        const monthTotal = monthExpenses.reduce((sum, expense) => {
-            return sum + parseFloat(expense.amount || 0);
-        }, 0);
-        
-        // Calculate average per day
-        const averagePerDay = daysInMonth > 0 ? monthTotal / daysInMonth : 0;
-        
-        // Update the display
-        const avgDailyEl = document.getElementById('averageDailySpend');
-        if (avgDailyEl) {
-            avgDailyEl.textContent = `$${averagePerDay.toFixed(2)}`;
-        }
-        
-        // Calculate trend (compare with previous month)
-        const lastMonth = targetMonth === 0 ? 11 : targetMonth - 1;
-        const lastMonthYear = targetMonth === 0 ? targetYear - 1 : targetYear;
-        
-        const lastMonthExpenses = expenses.filter(expense => {
-            const expenseDate = new Date(expense.date);
-            return expenseDate.getMonth() === lastMonth && 
-                   expenseDate.getFullYear() === lastMonthYear;
-        });
-        
-        const lastMonthTotal = lastMonthExpenses.reduce((sum, expense) => {
-            return sum + parseFloat(expense.amount || 0);
-        }, 0);
-        
-        // Get days in last month
-        const lastMonthDate = new Date(lastMonthYear, lastMonth + 1, 0);
-        const daysInLastMonth = lastMonthDate.getDate();
-        const lastMonthAverage = daysInLastMonth > 0 ? lastMonthTotal / daysInLastMonth : 0;
-        
-        // Update trend indicator
-        const trendEl = document.getElementById('spendingTrend');
-        if (trendEl) {
-            const difference = averagePerDay - lastMonthAverage;
-            const percentChange = lastMonthAverage > 0 ? ((difference / lastMonthAverage) * 100).toFixed(1) : 0;
-            
-            let trendHTML = '';
-            if (Math.abs(difference) < 0.5) {
-                trendHTML = '<span class="trend-indicator neutral">→</span><span class="trend-text">No change from last month</span>';
-            } else if (difference > 0) {
-                trendHTML = `<span class="trend-indicator up">↑</span><span class="trend-text">Up ${percentChange}% from last month</span>`;
-            } else {
-                trendHTML = `<span class="trend-indicator down">↓</span><span class="trend-text">Down ${Math.abs(percentChange)}% from last month</span>`;
-            }
-            
-            trendEl.innerHTML = trendHTML;
+function displayAverageDailySpend(stats) {
+    // Get selected month and year
+    const targetMonth = selectedMonth.getMonth();
+    const targetYear = selectedMonth.getFullYear();
+    const now = new Date();
+    const isCurrentMonth = targetMonth === now.getMonth() && targetYear === now.getFullYear();
+    
+    // For current month, use current day; for past months, use last day of month
+    const daysInMonth = isCurrentMonth ? now.getDate() : stats.days_in_month;
+    
+    // Calculate average per day
+    const averagePerDay = daysInMonth > 0 ? stats.total / daysInMonth : 0;
+    
+    // Update the display
+    const avgDailyEl = document.getElementById('averageDailySpend');
+    if (avgDailyEl) {
+        avgDailyEl.textContent = `$${averagePerDay.toFixed(2)}`;
+    }
+    
+    // Calculate trend (compare with previous month)
+    const daysInLastMonth = new Date(targetYear, targetMonth, 0).getDate();
+    const lastMonthAverage = daysInLastMonth > 0 ? stats.previous_total / daysInLastMonth : 0;
+    
+    // Update trend indicator
+    const trendEl = document.getElementById('spendingTrend');
+    if (trendEl) {
+        const difference = averagePerDay - lastMonthAverage;
+        const percentChange = lastMonthAverage > 0 ? ((difference / lastMonthAverage) * 100).toFixed(1) : 0;
+        
+        let trendHTML = '';
+        if (Math.abs(difference) < 0.5) {
+            trendHTML = '<span class="trend-indicator neutral">→</span><span class="trend-text">No change from last month</span>';
+        } else if (difference > 0) {
+            trendHTML = `<span class="trend-indicator up">↑</span><span class="trend-text">Up ${percentChange}% from last month</span>`;
+        } else {
+            trendHTML = `<span class="trend-indicator down">↓</span><span class="trend-text">Down ${Math.abs(percentChange)}% from last month</span>`;
         }
         
-    } catch (error) {
-        console.error('Error calculating average daily spend:', error);
+        trendEl.innerHTML = trendHTML;
     }
 }
 
@@ -316,73 +433,138 @@ async function loadChart() {
         // Pass month and year parameters to filter chart data
         const month = selectedMonth.getMonth() + 1; // API expects 1-12
         const year = selectedMonth.getFullYear();
-        const response = await fetch(`${API_BASE}/chart/category?month=${month}&year=${year}`);
-        if (response.ok) {
-            const blob = await response.blob();
-            const imgUrl = URL.createObjectURL(blob);
-            document.getElementById('categoryChart').src = imgUrl;
-            document.getElementById('categoryChart').style.display = 'block';
-            document.getElementById('noChartData').style.display = 'none';
-        }
-        
-        // Load category breakdown for the selected month
-        await loadCategoryBreakdown();
+        const data = await fetchChartData(`category?month=${month}&year=${year}`);
+        drawCategoryChart(data);
     } catch (error) {
         console.error('Error loading chart:', error);
     }
 }
 
-// Load Category Breakdown for Selected Month
-async function loadCategoryBreakdown() {
-    try {
-        const response = await fetch(`${API_BASE}/expenses`);
-        const data = await response.json();
-        const expenses = data.expenses || [];
-        
-        // Filter expenses for selected month
-        const targetMonth = selectedMonth.getMonth();
-        const targetYear = selectedMonth.getFullYear();
-        
-        const monthExpenses = expenses.filter(expense => {
-            const expenseDate = new Date(expense.date);
-            return expenseDate.getMonth() === targetMonth && 
-                   expenseDate.getFullYear() === targetYear;
-        });
-        
-        // Calculate category totals
-        const categoryTotals = {};
-        let total = 0;
-        
-        monthExpenses.forEach(expense => {
-            const category = expense.category || 'Uncategorized';
-            const amount = parseFloat(expense.amount || 0);
-            categoryTotals[category] = (categoryTotals[category] || 0) + amount;
-            total += amount;
-        });
-        
-        // Sort categories by amount
-        const sortedCategories = Object.entries(categoryTotals)
-            .sort((a, b) => b[1] - a[1])
-            .slice(0, 5); // Top 5 categories
-        
-        // Check if there's any data
-        const spendingBreakdownCard = document.querySelector('.spending-breakdown');
-        if (sortedCategories.length === 0 || total === 0) {
-            // Hide the entire Spending Breakdown card if no data
-            if (spendingBreakdownCard) {
-                spendingBreakdownCard.style.display = 'none';
-            }
-        } else {
-            // Show the card if there's data
-            if (spendingBreakdownCard) {
-                spendingBreakdownCard.style.display = 'block';
-            }
-            // Draw bar chart for top categories
-            drawTopCategoriesChart(sortedCategories, total);
+// Chart Rendering
+// Charts are drawn here from the series the server's PNG charts use; the PNG routes remain for exports
+const CHART_PALETTE = ['#2c5f5d', '#5fc3b4', '#4299e1', '#ed8936', '#9f7aea', '#ecc94b', '#48bb78', '#f56565'];
+const ALLOCATED_COLOR = '#4299e1';
+const ACTUAL_COLOR = '#ed8936';
+
+async function fetchChartData(path) {
+    const response = await fetch(`${API_BASE}/chart-data/${path}`);
+    if (!response.ok) {
+        throw new Error(`Chart data request failed with status ${response.status}`);
+    }
+    return response.json();
+}
+
+// Show a chart canvas, or its empty-state message; returns the cleared 2D context, or null when empty
+function prepareChartCanvas(canvasId, emptyId, hasData) {
+    const canvas = document.getElementById(canvasId);
+    if (!canvas) return null;
+    
+    canvas.style.display = hasData ? 'block' : 'none';
+    const emptyEl = document.getElementById(emptyId);
+    if (emptyEl) {
+        emptyEl.style.display = hasData ? 'none' : 'block';
+    }
+    if (!hasData) return null;
+    
+    const ctx = canvas.getContext('2d');
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    return ctx;
+}
+
+// Shorten a label with an ellipsis until it fits maxWidth
+function fitLabel(ctx, text, maxWidth) {
+    if (ctx.measureText(text).width <= maxWidth) {
+        return text;
+    }
+    let label = text;
+    while (label.length > 1 && ctx.measureText(`${label}…`).width > maxWidth) {
+        label = label.slice(0, -1);
+    }
+    return `${label}…`;
+}
+
+function drawChartLegend(ctx, items, x, y) {
+    ctx.font = '12px sans-serif';
+    ctx.textAlign = 'left';
+    items.forEach(([label, color]) => {
+        ctx.fillStyle = color;
+        ctx.fillRect(x, y - 10, 12, 12);
+        ctx.fillStyle = '#4a5568';
+        ctx.fillText(label, x + 18, y);
+        x += ctx.measureText(label).width + 40;
+    });
+}
+
+// Draw the category distribution as a donut with a legend below it
+function drawCategoryChart(data) {
+    // Categories arrive ordered by amount
+    const entries = Object.entries(data.categories).filter(([, amount]) => amount > 0);
+    const ctx = prepareChartCanvas('categoryChart', 'noChartData', entries.length > 0);
+    if (!ctx) return;
+    
+    const width = ctx.canvas.width;
+    const total = entries.reduce((sum, [, amount]) => sum + amount, 0);
+    const centerX = width / 2;
+    const centerY = 105;
+    const radius = 95;
+    
+    let angle = -Math.PI / 2;
+    entries.forEach(([category, amount], index) => {
+        const sweep = (amount / total) * Math.PI * 2;
+        ctx.beginPath();
+        ctx.moveTo(centerX, centerY);
+        ctx.arc(centerX, centerY, radius, angle, angle + sweep);
+        ctx.closePath();
+        ctx.fillStyle = CHART_PALETTE[index % CHART_PALETTE.length];
+        ctx.fill();
+        angle += sweep;
+    });
+    
+    // Cut out the donut hole and show the period total in it
+    ctx.globalCompositeOperation = 'destination-out';
+    ctx.beginPath();
+    ctx.arc(centerX, centerY, radius * 0.6, 0, Math.PI * 2);
+    ctx.fill();
+    ctx.globalCompositeOperation = 'source-over';
+    ctx.fillStyle = '#2d3748';
+    ctx.font = 'bold 16px sans-serif';
+    ctx.textAlign = 'center';
+    ctx.fillText(`$${total.toFixed(2)}`, centerX, centerY + 6);
+    
+    // Legend: top eight categories with their share
+    entries.slice(0, 8).forEach(([category, amount], index) => {
+        const y = 2 * centerY + 28 + index * 15;
+        ctx.fillStyle = CHART_PALETTE[index % CHART_PALETTE.length];
+        ctx.fillRect(20, y - 9, 10, 10);
+        ctx.fillStyle = '#4a5568';
+        ctx.font = '12px sans-serif';
+        ctx.textAlign = 'left';
+        ctx.fillText(fitLabel(ctx, category, width - 110), 38, y);
+        ctx.textAlign = 'right';
+        ctx.fillText(`${(amount / total * 100).toFixed(1)}%`, width - 20, y);
+    });
+}
+
+// Show Category Breakdown for Selected Month
+function displayCategoryBreakdown(categoryTotals) {
+    // Categories arrive ordered by amount
+    const sortedCategories = Object.entries(categoryTotals).slice(0, 5); // Top 5 categories
+    const total = Object.values(categoryTotals).reduce((sum, amount) => sum + amount, 0);
+    
+    // Check if there's any data
+    const spendingBreakdownCard = document.querySelector('.spending-breakdown');
+    if (sortedCategories.length === 0 || total === 0) {
+        // Hide the entire Spending Breakdown card if no data
+        if (spendingBreakdownCard) {
+            spendingBreakdownCard.style.display = 'none';
         }
-        
-    } catch (error) {
-        console.error('Error loading category breakdown:', error);
+    } else {
+        // Show the card if there's data
+        if (spendingBreakdownCard) {
+            spendingBreakdownCard.style.display = 'block';
+        }
+        // Draw bar chart for top categories
+        drawTopCategoriesChart(sortedCategories, total);
     }
 }
 
@@ -475,10 +657,10 @@ async function handleSubmit(e) {
         if (response.ok && data.success) {
             toggleExpenseModal(); // Close modal
             resetForm();
-            await loadExpenses();
-            await loadStats();
-            await loadChart();
-            await loadTrendChart();
+            // The live feed patches the dashboard; reload only without it
+            if (!liveFeedOpen) {
+                await Promise.all([loadDashboard(), loadChart(), loadTrendChart()]);
+            }
             showSuccess(editingExpenseId ? 'Expense updated!' : 'Expense added!');
         } else {
             showError(data.error || data.message || 'Failed to save expense');
@@ -491,9 +673,8 @@ async function handleSubmit(e) {
 
 async function editExpense(id) {
     try {
-        const response = await fetch(`${API_BASE}/expenses`);
-        const data = await response.json();
-        const expense = data.expenses.find(e => e.id === id);
+        const response = await fetch(`${API_BASE}/expenses/${id}`);
+        const expense = response.ok ? (await response.json()).expense : null;
         
         if (expense) {
             editingExpenseId = id;
@@ -546,10 +727,10 @@ async function deleteExpense(id) {
         console.log('Delete response:', data);
         
         if (response.ok && data.success) {
-            await loadExpenses();
-            await loadStats();
-            await loadChart();
-            await loadTrendChart();
+            // The live feed patches the dashboard; reload only without it
+            if (!liveFeedOpen) {
+                await Promise.all([loadDashboard(), loadChart(), loadTrendChart()]);
+            }
             // Reload budget data if on budget tab
             if (document.getElementById('budgetTab').classList.contains('active')) {
                 await loadBudgetData();
@@ -573,65 +754,28 @@ async function resetMonthBudget() {
     }
     
     try {
-        // Get all expenses
-        const response = await fetch(`${API_BASE}/expenses`);
-        const data = await response.json();
+        // Delete the whole month in one request
+        const month = monthKey(selectedMonth);
+        const response = await fetch(`${API_BASE}/expenses?month=${month}`, { method: 'DELETE' });
+        const result = await response.json();
         
         if (!response.ok) {
-            throw new Error('Failed to fetch expenses');
+            showError(result.message || 'Failed to reset month budget');
+            return;
         }
         
-        const expenses = data.expenses || data;
-        
-        // Filter expenses for the selected month
-        const year = selectedMonth.getFullYear();
-        const month = selectedMonth.getMonth() + 1;
-        
-        const monthExpenses = expenses.filter(expense => {
-            const expenseDate = new Date(expense.date);
-            return expenseDate.getFullYear() === year && (expenseDate.getMonth() + 1) === month;
-        });
-        
-        if (monthExpenses.length === 0) {
+        const deletedCount = result.deleted;
+        if (deletedCount === 0) {
             showError(`No expenses found for ${monthName}`);
             return;
         }
         
-        // Delete each expense
-        let deletedCount = 0;
-        let failedCount = 0;
-        
-        for (const expense of monthExpenses) {
-            try {
-                const deleteResponse = await fetch(`${API_BASE}/expenses/${expense.id}`, {
-                    method: 'DELETE'
-                });
-                
-                if (deleteResponse.ok) {
-                    deletedCount++;
-                } else {
-                    failedCount++;
-                }
-            } catch (error) {
-                console.error(`Failed to delete expense ${expense.id}:`, error);
-                failedCount++;
-            }
-        }
-        
-        // Reload all data
-        await loadExpenses();
-        await loadStats();
-        await loadChart();
-        await loadCategoryBreakdown();
-        
-        if (deletedCount > 0) {
-            showSuccess(`Successfully deleted ${deletedCount} expense(s) from ${monthName}`);
-        }
-        
-        if (failedCount > 0) {
-            showError(`Failed to delete ${failedCount} expense(s)`);
+        // Reload all data, unless the live feed already patched it
+        if (!liveFeedOpen) {
+            await Promise.all([loadDashboard(), loadChart()]);
         }
         
+        showSuccess(`Successfully deleted ${deletedCount} expense(s) from ${monthName}`);
     } catch (error) {
         console.error('Error resetting month budget:', error);
         showError('Failed to reset month budget');
@@ -679,26 +823,18 @@ async function filterExpenses() {
 function clearFilters() {
     document.getElementById('filterCategory').value = '';
     document.getElementById('filterTag').value = '';
-    loadExpenses();
+    loadDashboard();
 }
 
-async function exportCSV() {
-    try {
-        const response = await fetch(`${API_BASE}/expenses/export/csv`);
-        const blob = await response.blob();
-        const url = window.URL.createObjectURL(blob);
-        const a = document.createElement('a');
-        a.href = url;
-        a.download = `expenses_${new Date().toISOString().split('T')[0]}.csv`;
-        document.body.appendChild(a);
-        a.click();
-        window.URL.revokeObjectURL(url);
-        document.body.removeChild(a);
-        showSuccess('CSV exported successfully!');
-    } catch (error) {
-        console.error('Error exporting CSV:', error);
-        showError('Failed to export CSV');
-    }
+function exportCSV() {
+    // Link straight to the endpoint so the browser streams the download to disk
+    const a = document.createElement('a');
+    a.href = `${API_BASE}/expenses/export/csv`;
+    a.download = `expenses_${new Date().toISOString().split('T')[0]}.csv`;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    showSuccess('CSV export started!');
 }
 
 // Budget Functions
@@ -822,14 +958,7 @@ async function handleBudgetSubmit(e) {
 
 async function loadBudgetChart(month) {
     try {
-        const response = await fetch(`${API_BASE}/chart/budget/${month}`);
-        if (response.ok) {
-            const blob = await response.blob();
-            const imgUrl = URL.createObjectURL(blob);
-            document.getElementById('budgetChart').src = imgUrl;
-            document.getElementById('budgetChart').style.display = 'block';
-            document.getElementById('noBudgetChart').style.display = 'none';
-        }
+        drawBudgetChart(await fetchChartData(`budget/${month}`));
     } catch (error) {
         console.error('Error loading budget chart:', error);
     }
@@ -837,19 +966,158 @@ async function loadBudgetChart(month) {
 
 async function loadTrendChart() {
     try {
-        const response = await fetch(`${API_BASE}/chart/monthly-trend`);
-        if (response.ok) {
-            const blob = await response.blob();
-            const imgUrl = URL.createObjectURL(blob);
-            document.getElementById('trendChart').src = imgUrl;
-            document.getElementById('trendChart').style.display = 'block';
-            document.getElementById('noTrendChart').style.display = 'none';
-        }
+        drawTrendChart(await fetchChartData('monthly-trend'));
     } catch (error) {
         console.error('Error loading trend chart:', error);
     }
 }
 
+// Draw the overall budget utilization ring beside allocated vs actual bars per category
+function drawBudgetChart(data) {
+    const ctx = prepareChartCanvas('budgetChart', 'noBudgetChart', data.total_budget > 0);
+    if (!ctx) return;
+    
+    const width = ctx.canvas.width;
+    const height = ctx.canvas.height;
+    
+    // Left panel: overall utilization ring
+    const centerX = 130;
+    const centerY = height / 2;
+    const radius = 90;
+    const utilization = data.total_spent / data.total_budget;
+    ctx.lineWidth = 24;
+    ctx.strokeStyle = '#e2e8f0';
+    ctx.beginPath();
+    ctx.arc(centerX, centerY, radius, 0, Math.PI * 2);
+    ctx.stroke();
+    ctx.strokeStyle = data.total_remaining >= 0 ? '#48bb78' : '#f56565';
+    ctx.beginPath();
+    ctx.arc(centerX, centerY, radius, -Math.PI / 2, -Math.PI / 2 + Math.min(utilization, 1) * Math.PI * 2);
+    ctx.stroke();
+    
+    ctx.fillStyle = '#2d3748';
+    ctx.textAlign = 'center';
+    ctx.font = 'bold 20px sans-serif';
+    ctx.fillText(`${(utilization * 100).toFixed(1)}%`, centerX, centerY + 2);
+    ctx.font = '12px sans-serif';
+    ctx.fillText(`$${data.total_spent.toFixed(2)} of $${data.total_budget.toFixed(2)}`, centerX, centerY + 22);
+    
+    // Right panel: category-level comparison
+    const categories = Object.entries(data.categories);
+    const area = { left: 300, right: width - 20, top: 40, bottom: height - 40 };
+    if (categories.length === 0) {
+        ctx.fillStyle = '#a0aec0';
+        ctx.font = '14px sans-serif';
+        ctx.fillText('No category-specific budgets', (area.left + area.right) / 2, centerY);
+        return;
+    }
+    
+    const maxAmount = Math.max(...categories.flatMap(([, figures]) => [figures.budget, figures.spent]), 1);
+    const scale = (area.bottom - area.top) / maxAmount;
+    const groupWidth = (area.right - area.left) / categories.length;
+    const barWidth = Math.min(28, groupWidth * 0.35);
+    
+    ctx.strokeStyle = '#cbd5e0';
+    ctx.lineWidth = 1;
+    ctx.beginPath();
+    ctx.moveTo(area.left, area.bottom);
+    ctx.lineTo(area.right, area.bottom);
+    ctx.stroke();
+    
+    categories.forEach(([category, figures], index) => {
+        const middle = area.left + groupWidth * (index + 0.5);
+        ctx.fillStyle = ALLOCATED_COLOR;
+        ctx.fillRect(middle - barWidth, area.bottom - figures.budget * scale, barWidth, figures.budget * scale);
+        ctx.fillStyle = ACTUAL_COLOR;
+        ctx.fillRect(middle, area.bottom - figures.spent * scale, barWidth, figures.spent * scale);
+        
+        ctx.fillStyle = '#4a5568';
+        ctx.font = '12px sans-serif';
+        ctx.textAlign = 'center';
+        ctx.fillText(fitLabel(ctx, category, groupWidth - 6), middle, area.bottom + 18);
+    });
+    
+    drawChartLegend(ctx, [['Allocated', ALLOCATED_COLOR], ['Actual', ACTUAL_COLOR]], area.left, 20);
+}
+
+// Draw monthly spending against the overall budget, shading overspent months
+function drawTrendChart(data) {
+    const ctx = prepareChartCanvas('trendChart', 'noTrendChart', data.periods.length > 0);
+    if (!ctx) return;
+    
+    const width = ctx.canvas.width;
+    const height = ctx.canvas.height;
+    const area = { left: 70, right: width - 30, top: 40, bottom: height - 40 };
+    const maxAmount = Math.max(...data.spent, ...data.budget, 1);
+    const scale = (area.bottom - area.top) / maxAmount;
+    const step = data.periods.length > 1 ? (area.right - area.left) / (data.periods.length - 1) : 0;
+    const xAt = index => (step ? area.left + step * index : (area.left + area.right) / 2);
+    const yAt = amount => area.bottom - amount * scale;
+    
+    // Highlight overspending periods
+    const bandWidth = Math.max(step * 0.6, 20);
+    ctx.fillStyle = 'rgba(245, 101, 101, 0.2)';
+    data.periods.forEach((period, index) => {
+        if (data.budget[index] > 0 && data.spent[index] > data.budget[index]) {
+            ctx.fillRect(xAt(index) - bandWidth / 2, area.top, bandWidth, area.bottom - area.top);
+        }
+    });
+    
+    // Grid lines with dollar labels
+    ctx.strokeStyle = '#e2e8f0';
+    ctx.lineWidth = 1;
+    ctx.fillStyle = '#718096';
+    ctx.font = '11px sans-serif';
+    ctx.textAlign = 'right';
+    for (let i = 0; i <= 4; i++) {
+        const amount = (maxAmount / 4) * i;
+        ctx.beginPath();
+        ctx.moveTo(area.left, yAt(amount));
+        ctx.lineTo(area.right, yAt(amount));
+        ctx.stroke();
+        ctx.fillText(`$${amount.toFixed(0)}`, area.left - 8, yAt(amount) + 4);
+    }
+    
+    drawTrendSeries(ctx, data.spent, xAt, yAt, ACTUAL_COLOR, []);
+    drawTrendSeries(ctx, data.budget, xAt, yAt, ALLOCATED_COLOR, [6, 4]);
+    
+    // Period labels, thinned out so they never overlap
+    const labelEvery = Math.ceil(data.periods.length / 12);
+    ctx.fillStyle = '#4a5568';
+    ctx.font = '12px sans-serif';
+    ctx.textAlign = 'center';
+    data.periods.forEach((period, index) => {
+        if (index % labelEvery === 0) {
+            ctx.fillText(period, xAt(index), area.bottom + 20);
+        }
+    });
+    
+    drawChartLegend(ctx, [['Actual Spending', ACTUAL_COLOR], ['Planned Budget', ALLOCATED_COLOR]], area.left, 20);
+}
+
+function drawTrendSeries(ctx, values, xAt, yAt, color, dash) {
+    ctx.strokeStyle = color;
+    ctx.fillStyle = color;
+    ctx.lineWidth = 2;
+    ctx.setLineDash(dash);
+    ctx.beginPath();
+    values.forEach((value, index) => {
+        if (index === 0) {
+            ctx.moveTo(xAt(index), yAt(value));
+        } else {
+            ctx.lineTo(xAt(index), yAt(value));
+        }
+    });
+    ctx.stroke();
+    ctx.setLineDash([]);
+    
+    values.forEach((value, index) => {
+        ctx.beginPath();
+        ctx.arc(xAt(index), yAt(value), 3.5, 0, Math.PI * 2);
+        ctx.fill();
+    });
+}
+
 // Utility Functions
 function showSuccess(message) {
     alert(`✅ ${message}`);
@@ -1128,71 +1396,51 @@ function toggleCompletedGoals() {
 // Load History Data
 async function loadHistoryData() {
     try {
-        const response = await fetch(`${API_BASE}/expenses`);
-        const data = await response.json();
-        const expenses = data.expenses || [];
-        
-        // Calculate historical data for last 6 months
-        const historyData = calculateHistoricalData(expenses);
-        
-        // Update metrics
-        updateHistoryMetrics(historyData);
-        
-        // Draw line chart
-        drawHistoryLineChart(historyData);
-        
-        // Update top categories
-        updateTopCategories(expenses);
-        
-        // Update monthly breakdown table
-        updateHistoryTable(historyData);
+        // Only the history is needed here, so keep the transactions page minimal
+        const response = await fetch(`${API_BASE}/dashboard?month=${monthKey(new Date())}&limit=1&fields=id`);
+        if (!response.ok) {
+            throw new Error('Failed to fetch history');
+        }
         
+        const dashboard = await response.json();
+        displayHistory(dashboard.history);
     } catch (error) {
         console.error('Error loading history data:', error);
     }
 }
 
-// Calculate Historical Data for Last 6 Months
-function calculateHistoricalData(expenses) {
-    const today = new Date();
-    const sixMonthsAgo = new Date(today.getFullYear(), today.getMonth() - 5, 1);
+// Render the six-month history from the dashboard's monthly rollups
+function displayHistory(history) {
+    const historyData = calculateHistoricalData(history);
     
-    const monthlyData = {};
+    // Update metrics
+    updateHistoryMetrics(historyData);
     
-    // Initialize 6 months
-    for (let i = 0; i < 6; i++) {
-        const date = new Date(today.getFullYear(), today.getMonth() - (5 - i), 1);
-        const key = `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
-        const monthName = date.toLocaleDateString('en-US', { month: 'short' });
-        
-        monthlyData[key] = {
-            month: monthName,
-            year: date.getFullYear(),
-            expenses: 0,
+    // Draw line chart
+    drawHistoryLineChart(historyData);
+    
+    // Update top categories
+    updateTopCategories(historyData);
+    
+    // Update monthly breakdown table
+    updateHistoryTable(historyData);
+}
+
+// Shape the dashboard's monthly history for the history tab
+function calculateHistoricalData(history) {
+    return history.map(entry => {
+        const [year, month] = entry.month.split('-').map(Number);
+        const date = new Date(year, month - 1, 1);
+        
+        return {
+            month: date.toLocaleDateString('en-US', { month: 'short' }),
+            year: year,
+            expenses: entry.total,
             income: 0,
-            count: 0,
-            categories: {}
+            count: entry.count,
+            categories: entry.categories
         };
-    }
-    
-    // Aggregate expense data
-    expenses.forEach(expense => {
-        const expenseDate = new Date(expense.date);
-        if (expenseDate >= sixMonthsAgo) {
-            const key = `${expenseDate.getFullYear()}-${String(expenseDate.getMonth() + 1).padStart(2, '0')}`;
-            
-            if (monthlyData[key]) {
-                monthlyData[key].expenses += parseFloat(expense.amount);
-                monthlyData[key].count += 1;
-                
-                // Track categories
-                const category = expense.category || 'Uncategorized';
-                monthlyData[key].categories[category] = (monthlyData[key].categories[category] || 0) + parseFloat(expense.amount);
-            }
-        }
     });
-    
-    return Object.values(monthlyData);
 }
 
 // Update History Metrics
@@ -1315,12 +1563,13 @@ function drawHistoryLineChart(historyData) {
 }
 
 // Update Top Categories
-function updateTopCategories(expenses) {
+function updateTopCategories(historyData) {
     const categoryTotals = {};
     
-    expenses.forEach(expense => {
-        const category = expense.category || 'Uncategorized';
-        categoryTotals[category] = (categoryTotals[category] || 0) + parseFloat(expense.amount);
+    historyData.forEach(month => {
+        Object.entries(month.categories).forEach(([category, amount]) => {
+            categoryTotals[category] = (categoryTotals[category] || 0) + amount;
+        });
     });
     
     const sortedCategories = Object.entries(categoryTotals)
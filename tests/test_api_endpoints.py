@@ -4,12 +4,22 @@ Integration tests for API endpoints
 import unittest
 import sys
 import json
+import gzip
+import zlib
+import struct
+import io
+import os
+import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
+import web_app
 from web_app import app
+from utils.render_pool import RenderPool
+from storage.sqlite_store import SQLiteStorage
 
 
 class TestAPIEndpoints(unittest.TestCase):
@@ -105,6 +115,69 @@ class TestAPIEndpoints(unittest.TestCase):
         self.assertEqual(expense['amount'], 75.50)
         self.assertEqual(expense['category'], 'Food')
     
+    def test_filter_transactions_by_date_range(self):
+        """Test GET /api/expenses honours date_from/date_to"""
+        for day in ('2019-03-01', '2019-03-15', '2019-04-01'):
+            self.client.post(
+                '/api/expenses',
+                data=json.dumps({'amount': 10.0, 'category': 'Food', 'date': day, 'description': 'Dated'}),
+                content_type='application/json'
+            )
+        
+        response = self.client.get('/api/expenses?date_from=2019-03-01&date_to=2019-03-31')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['count'], 2)
+        self.assertTrue(all(e['date'].startswith('2019-03') for e in data['expenses']))
+    
+    def test_filter_transactions_invalid_date(self):
+        """Test GET /api/expenses with a malformed date returns 400"""
+        response = self.client.get('/api/expenses?date_from=March')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_paginate_transactions(self):
+        """Test GET /api/expenses with limit walks pages via next_cursor"""
+        for day in ('2018-05-03', '2018-05-01', '2018-05-02'):
+            self.client.post(
+                '/api/expenses',
+                data=json.dumps({'amount': 10.0, 'category': 'Food', 'date': day, 'description': 'Paged'}),
+                content_type='application/json'
+            )
+        
+        seen = []
+        cursor = None
+        while True:
+            query = '/api/expenses?date_from=2018-05-01&date_to=2018-05-31&limit=2'
+            response = self.client.get(query + (f'&cursor={cursor}' if cursor else ''))
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.data)
+            self.assertLessEqual(data['count'], 2)
+            seen.extend(e['date'] for e in data['expenses'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, ['2018-05-01', '2018-05-02', '2018-05-03'])
+    
+    def test_paginate_invalid_cursor(self):
+        """Test GET /api/expenses with a malformed cursor or limit returns 400"""
+        self.assertEqual(self.client.get('/api/expenses?cursor=garbage').status_code, 400)
+        self.assertEqual(self.client.get('/api/expenses?limit=0').status_code, 400)
+        self.assertEqual(self.client.get('/api/expenses?limit=ten').status_code, 400)
+    
+    def test_list_transaction_categories(self):
+        """Test GET /api/expenses/categories returns distinct categories with counts"""
+        self.client.post(
+            '/api/expenses',
+            data=json.dumps({'amount': 10.0, 'category': 'Stationery', 'date': '2025-10-01', 'description': 'Pens'}),
+            content_type='application/json'
+        )
+        
+        response = self.client.get('/api/expenses/categories')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertIn('categories', data)
+        self.assertIn('Stationery', [entry['category'] for entry in data['categories']])
+    
     def test_get_nonexistent_transaction(self):
         """Test GET /api/expenses/{id} with invalid ID returns 404"""
         response = self.client.get('/api/expenses/nonexistent')
@@ -268,6 +341,347 @@ class TestAPIEndpoints(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('text/csv', response.content_type)
 
+    
+    def test_bulk_create_transactions(self):
+        """Test POST /api/expenses/bulk with a JSON array"""
+        rows = [
+            {'amount': 12.0, 'category': 'Food', 'date': '2025-10-24', 'description': 'Bulk lunch'},
+            {'amount': 'ten', 'category': 'Food', 'date': '2025-10-24'}
+        ]
+        response = self.client.post('/api/expenses/bulk', data=json.dumps(rows),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        data = json.loads(response.data)
+        self.assertEqual(data['inserted'], 1)
+        self.assertEqual(data['failed'], 1)
+        self.assertEqual(data['errors'][0]['index'], 1)
+        
+        response = self.client.get(f"/api/expenses/{data['ids'][0]}")
+        self.assertEqual(json.loads(response.data)['expense']['description'], 'Bulk lunch')
+    
+    def test_bulk_create_from_ndjson(self):
+        """Test POST /api/expenses/bulk with newline-delimited JSON"""
+        body = '{"amount": 1.5, "category": "Food"}\n\n{"amount": 2.5, "category": "Rent"}\n'
+        response = self.client.post('/api/expenses/bulk', data=body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.data)['inserted'], 2)
+    
+    def test_bulk_create_rejects_bad_body(self):
+        """Test POST /api/expenses/bulk rejects non-array bodies and all-invalid batches"""
+        response = self.client.post('/api/expenses/bulk', data=json.dumps({'amount': 1}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        
+        response = self.client.post('/api/expenses/bulk', data=json.dumps([{'amount': 1}]),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.data)['failed'], 1)
+    
+    def test_delete_transactions_by_month(self):
+        """Test DELETE /api/expenses?month= removes the month in one request"""
+        for day in ('2031-02-01', '2031-02-28', '2031-03-01'):
+            self.client.post('/api/expenses', json={'amount': 5.0, 'category': 'Food', 'date': day,
+                                                    'description': 'Range delete'})
+        
+        response = self.client.delete('/api/expenses?month=2031-02')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['deleted'], 2)
+        
+        remaining = json.loads(self.client.get('/api/expenses?date_from=2031-01-01').data)
+        self.assertEqual([e['date'] for e in remaining['expenses']], ['2031-03-01'])
+        self.assertEqual(self.client.delete('/api/expenses?category=food&date_from=2031-03-01').status_code, 200)
+    
+    def test_delete_transactions_requires_filter(self):
+        """Test DELETE /api/expenses without a filter is rejected"""
+        self.assertEqual(self.client.delete('/api/expenses').status_code, 400)
+        self.assertEqual(self.client.delete('/api/expenses?month=2031-2-30x').status_code, 400)
+    
+    def test_export_csv_gzip_with_filters(self):
+        """Test GET /api/expenses/export/csv streams filtered rows and can gzip them"""
+        self.client.post('/api/expenses', json={'amount': 7.0, 'category': 'Export', 'date': '2032-01-05',
+                                                'description': 'Streamed row'})
+        
+        response = self.client.get('/api/expenses/export/csv?gzip=true&date_from=2032-01-01&date_to=2032-01-31')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content_type, 'application/gzip')
+        lines = gzip.decompress(response.data).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Streamed row', lines[1])
+        
+        self.assertEqual(self.client.get('/api/expenses/export/csv?date_from=soon').status_code, 400)
+    
+    def test_import_csv_upload(self):
+        """Test POST /api/expenses/import/csv with a multipart upload and a raw body"""
+        upload = io.BytesIO(b"Amount,Category,Date,Description\n4.5,Import,2033-01-01,Coffee\n-1,Import,2033-01-01,Bad\n")
+        response = self.client.post('/api/expenses/import/csv', data={'file': (upload, 'statement.csv')},
+                                    content_type='multipart/form-data')
+        self.assertEqual(response.status_code, 201)
+        data = json.loads(response.data)
+        self.assertEqual((data['inserted'], data['failed']), (1, 1))
+        self.assertEqual(data['errors'][0]['line'], 3)
+        
+        response = self.client.post('/api/expenses/import/csv', data='Amount,Category\n2,Import\n',
+                                    content_type='text/csv')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.post('/api/expenses/import/csv', json=[]).status_code, 400)
+        self.assertEqual(self.client.post('/api/expenses/import/csv', data='Category\nx\n',
+                                          content_type='text/csv').status_code, 400)
+    
+    def test_unchanged_reads_return_not_modified(self):
+        """Test read endpoints answer a matching If-None-Match with an empty 304"""
+        for url in ('/api/expenses', '/api/stats', '/api/budgets/analysis/2025-10', '/api/chart/monthly-trend'):
+            response = self.client.get(url)
+            etag = response.headers['ETag']
+            self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+            
+            repeat = self.client.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(repeat.status_code, 304, url)
+            self.assertEqual(repeat.data, b'')
+            self.assertEqual(repeat.headers['ETag'], etag)
+    
+    def test_etag_changes_after_mutation(self):
+        """Test expense and budget changes invalidate the tags of dependent reads"""
+        expenses_tag = self.client.get('/api/expenses').headers['ETag']
+        analysis_tag = self.client.get('/api/budgets/analysis/2025-10').headers['ETag']
+        
+        self.client.post('/api/budgets', json={'amount': 300.0, 'month': '2025-10', 'category': 'Etag'})
+        self.assertEqual(self.client.get('/api/expenses', headers={'If-None-Match': expenses_tag}).status_code, 304)
+        self.assertEqual(self.client.get('/api/budgets/analysis/2025-10',
+                                         headers={'If-None-Match': analysis_tag}).status_code, 200)
+        
+        self.client.post('/api/expenses', json={'amount': 3.0, 'category': 'Etag', 'description': 'Tagged'})
+        response = self.client.get('/api/expenses', headers={'If-None-Match': expenses_tag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], expenses_tag)
+    
+    def test_etag_changes_after_write_from_another_process(self):
+        """Test a shared SQLite database's commits from elsewhere invalidate tags this process handed out"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'shared.db')
+            shared, other = SQLiteStorage(path), SQLiteStorage(path)
+            try:
+                with patch.object(web_app, 'storage', shared):
+                    etag = self.client.get('/api/expenses').headers['ETag']
+                    self.assertEqual(self.client.get('/api/expenses', headers={'If-None-Match': etag}).status_code, 304)
+                    
+                    other.ledger.add(4.0, "Food", "2025-10-24", "written by another worker")
+                    response = self.client.get('/api/expenses', headers={'If-None-Match': etag})
+                    self.assertEqual(response.status_code, 200)
+                    self.assertNotEqual(response.headers['ETag'], etag)
+            finally:
+                shared.close()
+                other.close()
+    
+    def test_list_transactions_field_projection(self):
+        """Test GET /api/expenses keeps the model's shape and honours fields="""
+        self.client.post('/api/expenses', json={'amount': 9.25, 'category': 'Fields', 'date': '2034-01-01',
+                                                'description': 'Projected'})
+        
+        data = json.loads(self.client.get('/api/expenses?category=fields').data)
+        self.assertEqual(set(data), {'expenses', 'count', 'next_cursor'})
+        self.assertEqual(list(data['expenses'][0]), ['id', 'amount', 'category', 'date', 'description', 'created_at'])
+        
+        data = json.loads(self.client.get('/api/expenses?category=fields&limit=5&fields=date, amount').data)
+        self.assertEqual(data['expenses'], [{'amount': 9.25, 'date': '2034-01-01'}])
+        self.assertIsNone(data['next_cursor'])
+        self.assertEqual(self.client.get('/api/expenses?fields=id,secret').status_code, 400)
+    
+    def test_list_budgets_field_projection(self):
+        """Test GET /api/budgets honours fields="""
+        self.client.post('/api/budgets', json={'amount': 120.0, 'month': '2034-01', 'category': 'Fields'})
+        
+        data = json.loads(self.client.get('/api/budgets?fields=month,amount').data)
+        self.assertEqual(data['count'], len(data['budgets']))
+        self.assertIn({'amount': 120.0, 'month': '2034-01'}, data['budgets'])
+    
+    def test_dashboard_combines_month_views(self):
+        """Test GET /api/dashboard returns the month's page, stats, breakdown, budget and history"""
+        self.client.post('/api/expenses/bulk', json=[
+            {'amount': 40.0, 'category': 'Board', 'date': '2036-05-02'},
+            {'amount': 15.0, 'category': 'Board', 'date': '2036-04-20'}
+        ])
+        self.client.post('/api/budgets', json={'amount': 100.0, 'month': '2036-05'})
+        
+        response = self.client.get('/api/dashboard?month=2036-05&fields=date,amount')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['expenses'], [{'amount': 40.0, 'date': '2036-05-02'}])
+        self.assertEqual((data['stats']['total'], data['stats']['previous_total']), (40.0, 15.0))
+        self.assertEqual(data['categories'], {'Board': 40.0})
+        self.assertEqual((data['budget']['total_budget'], data['budget']['total_spent']), (100.0, 40.0))
+        self.assertEqual([h['total'] for h in data['history']], [0.0, 0.0, 0.0, 0.0, 15.0, 40.0])
+        
+        repeat = self.client.get('/api/dashboard?month=2036-05&fields=date,amount',
+                                 headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(self.client.get('/api/dashboard?month=2036-13').status_code, 400)
+        self.assertEqual(self.client.get('/api/dashboard?limit=0').status_code, 400)
+        self.client.delete('/api/expenses?category=board')
+    
+    def test_event_stream_pushes_and_resumes(self):
+        """Test GET /api/events streams changes, heartbeats, replays from a version and resets stale clients"""
+        self.app.config['EVENTS_HEARTBEAT'] = 0.01
+        response = self.client.get('/api/events', buffered=False)
+        self.assertEqual(response.content_type, 'text/event-stream; charset=utf-8')
+        events = iter(response.response)
+        self.assertIn(b'event: hello', next(events))
+        
+        self.client.post('/api/expenses', json={'amount': 6.0, 'category': 'Live', 'date': '2037-01-01',
+                                                'description': 'Pushed'})
+        message = next(events).decode('utf-8')
+        event_id = message.split('\n')[0][len('id: '):]
+        change = json.loads(message.split('data: ', 1)[1])
+        self.assertEqual((change['op'], change['expenses'][0]['description']), ('add', 'Pushed'))
+        self.assertEqual(next(events), b': heartbeat\n\n')
+        response.close()
+        
+        instance, version = event_id.rpartition(':')[0], change['version']
+        resumed = self.client.get('/api/events', headers={'Last-Event-ID': f'{instance}:{version - 1}'}, buffered=False)
+        replay = iter(resumed.response)
+        next(replay)
+        self.assertIn(f'id: {event_id}\nevent: change'.encode('utf-8'), next(replay))
+        resumed.close()
+        
+        stale = self.client.get('/api/events', headers={'Last-Event-ID': f'previous-run:{version}'}, buffered=False)
+        stale_events = iter(stale.response)
+        next(stale_events)
+        self.assertIn(b'event: reset', next(stale_events))
+        stale.close()
+        self.assertEqual(self.client.get('/api/events?since=latest').status_code, 400)
+        self.client.delete('/api/expenses?category=live')
+    
+    def test_chart_images_cached_per_version(self):
+        """Test repeat chart requests are served from the chart cache until the data changes"""
+        first = self.client.get('/api/chart/budget/2038-01')
+        self.assertEqual(first.content_type, 'image/png')
+        repeat = self.client.get('/api/chart/budget/2038-01')
+        self.assertEqual(repeat.headers['X-Chart-Cache'], 'hit')
+        self.assertEqual(repeat.data, first.data)
+        
+        category = self.client.get('/api/chart/category?month=1&year=2038')
+        
+        self.client.post('/api/budgets', json={'amount': 80.0, 'month': '2038-01'})
+        self.assertEqual(self.client.get('/api/chart/budget/2038-01').headers['X-Chart-Cache'], 'miss')
+        # Budgets do not feed the category chart, so its image survives a budget write
+        self.assertEqual(self.client.get('/api/chart/category?month=1&year=2038',
+                                         headers={'If-None-Match': category.headers['ETag']}).status_code, 304)
+        self.assertEqual(self.client.get('/api/chart/category?month=1&year=2038').headers['X-Chart-Cache'], 'hit')
+        stats = json.loads(self.client.get('/api/chart/cache').data)
+        self.assertGreaterEqual(stats['hits'], 1)
+        self.assertLessEqual(stats['bytes'], stats['max_bytes'])
+    
+    def test_chart_worker_failure_returns_503(self):
+        """Test a render worker that dies mid-request yields a JSON 503, not a 500"""
+        configured_pool = web_app.render_pool
+        crashing_pool = RenderPool(1, timeout=5, command=[sys.executable, '-c', 'pass'])
+        web_app.render_pool = crashing_pool
+        try:
+            response = self.client.get('/api/chart/monthly-trend?width=333')
+            self.assertEqual(response.status_code, 503)
+            self.assertFalse(json.loads(response.data)['success'])
+        finally:
+            web_app.render_pool = configured_pool
+            crashing_pool.close()
+        self.assertEqual(self.client.get('/api/chart/monthly-trend?width=333').status_code, 200)
+    
+    def test_chart_format_and_size_parameters(self):
+        """Test chart routes honour format, width, height and dpi within the server's bounds"""
+        svg = self.client.get('/api/chart/monthly-trend?format=svg')
+        self.assertEqual(svg.mimetype, 'image/svg+xml')
+        self.assertIn(b'<svg', svg.data)
+        webp = self.client.get('/api/chart/monthly-trend?format=webp')
+        self.assertEqual(webp.content_type, 'image/webp')
+        self.assertEqual(self.client.get('/api/chart/monthly-trend?format=gif').status_code, 400)
+        for dpi in ('nan', 'inf'):
+            self.assertEqual(self.client.get(f'/api/chart/monthly-trend?dpi={dpi}&width=800&height=600').status_code, 400)
+        
+        thumbnail = self.client.get('/api/chart/category?width=240')
+        self.assertEqual(struct.unpack('>II', thumbnail.data[16:24]), (240, 200))
+        clamped = self.client.get('/api/chart/category?width=5&height=999999&dpi=5000')
+        self.assertEqual(struct.unpack('>II', clamped.data[16:24]), (100, 4000))
+        
+        # Each geometry is cached separately
+        self.assertEqual(self.client.get('/api/chart/category?width=240').headers['X-Chart-Cache'], 'hit')
+        self.assertEqual(self.client.get('/api/chart/category?width=241').headers['X-Chart-Cache'], 'miss')
+    
+    def test_chart_data_endpoints(self):
+        """Test chart data endpoints return the series the PNG charts are drawn from"""
+        self.client.post('/api/expenses/bulk', json=[
+            {'amount': 30.0, 'category': 'Plotted', 'date': '2039-03-04', 'description': 'Chart data'},
+            {'amount': 12.5, 'category': 'Sketched', 'date': '2039-03-09', 'description': 'Chart data'}
+        ])
+        self.client.post('/api/budgets', json={'amount': 100.0, 'month': '2039-03'})
+        self.client.post('/api/budgets', json={'amount': 20.0, 'month': '2039-03', 'category': 'Plotted'})
+        
+        category = self.client.get('/api/chart-data/category?month=3&year=2039')
+        self.assertEqual(category.status_code, 200)
+        self.assertIn('ETag', category.headers)
+        data = json.loads(category.data)
+        self.assertEqual(data['categories'], {'Plotted': 30.0, 'Sketched': 12.5})
+        self.assertEqual(data['title'], 'Category Breakdown - March 2039')
+        repeat = self.client.get('/api/chart-data/category?month=3&year=2039',
+                                 headers={'If-None-Match': category.headers['ETag']})
+        self.assertEqual(repeat.status_code, 304)
+        for query in ('month=13&year=2024', 'month=0&year=2024', 'month=3&year=0'):
+            self.assertEqual(self.client.get(f'/api/chart-data/category?{query}').status_code, 400)
+            self.assertEqual(self.client.get(f'/api/chart/category?{query}').status_code, 400)
+        
+        budget = json.loads(self.client.get('/api/chart-data/budget/2039-03').data)
+        self.assertEqual(budget['total_budget'], 100.0)
+        self.assertEqual(budget['total_spent'], 42.5)
+        self.assertEqual(budget['categories']['Plotted'], {'budget': 20.0, 'spent': 30.0})
+        
+        trend = json.loads(self.client.get('/api/chart-data/monthly-trend').data)
+        index = trend['periods'].index('2039-03')
+        self.assertEqual(trend['spent'][index], 42.5)
+        self.assertEqual(trend['budget'][index], 100.0)
+        self.assertEqual(trend['periods'], sorted(trend['periods']))
+        
+        self.client.delete('/api/expenses?category=plotted')
+        self.client.delete('/api/expenses?category=sketched')
+    
+    def test_responses_compressed_when_accepted(self):
+        """Test large JSON is gzip-encoded on request while small bodies and PNG charts are not"""
+        self.client.post('/api/expenses/bulk', json=[{'amount': 1.5, 'category': 'Squeeze', 'date': '2035-01-01',
+                                                      'description': 'Compressible row'}] * 50)
+        
+        plain = self.client.get('/api/expenses?category=squeeze')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        response = self.client.get('/api/expenses?category=squeeze', headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertLess(len(response.data), len(plain.data))
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+        self.assertTrue(response.headers['ETag'].startswith('W/'))
+        
+        repeat = self.client.get('/api/expenses?category=squeeze',
+                                 headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+        self.assertEqual(repeat.status_code, 304)
+        
+        deflated = self.client.get('/api/expenses?category=squeeze', headers={'Accept-Encoding': 'deflate'})
+        self.assertEqual(deflated.headers['Content-Encoding'], 'deflate')
+        self.assertEqual(zlib.decompress(deflated.data), plain.data)
+        
+        small = self.client.get('/api/expenses?category=nothing-here', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', small.headers)
+        chart = self.client.get('/api/chart/monthly-trend', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(chart.content_type, 'image/png')
+        self.assertNotIn('Content-Encoding', chart.headers)
+    
+    def test_streamed_export_compressed_when_accepted(self):
+        """Test the streamed CSV export is compressed chunk by chunk"""
+        self.client.post('/api/expenses/bulk', json=[{'amount': 2.0, 'category': 'Squeeze', 'date': '2035-02-01',
+                                                      'description': 'Streamed'}] * 20)
+        
+        response = self.client.get('/api/expenses/export/csv?category=squeeze&date_from=2035-02-01', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response.headers)
+        lines = gzip.decompress(response.data).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 21)
+        
+        already = self.client.get('/api/expenses/export/csv?gzip=true&category=squeeze',
+                                  headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', already.headers)
 
 if __name__ == '__main__':
     unittest.main()
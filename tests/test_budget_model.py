@@ -70,6 +70,16 @@ class TestBudgetPlan(unittest.TestCase):
         budget_dict = total_budget.to_dict()
         self.assertIsNone(budget_dict['category'])
     
+    def test_budget_has_no_instance_dict(self):
+        """Test budgets are slotted"""
+        self.assertFalse(hasattr(self.budget, '__dict__'))
+    
+    def test_budget_to_dict_tracks_amount_changes(self):
+        """Test the cached serialized form is refreshed by the amount setter"""
+        self.assertEqual(self.budget.to_dict()['amount'], 1000.00)
+        self.budget.amount = 1250.00
+        self.assertEqual(self.budget.to_dict()['amount'], 1250.00)
+    
     def test_budget_properties_are_immutable(self):
         """Test that certain budget properties cannot be modified"""
         # Test that month property is read-only (no setter)
@@ -0,0 +1,55 @@
+"""
+Unit tests for the byte-bounded ChartCache
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.chart_cache import ChartCache
+
+
+class TestChartCache(unittest.TestCase):
+    """Test cases for ChartCache"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.cache = ChartCache(max_bytes=10)
+    
+    def test_get_or_render_counts_hits_and_misses(self):
+        """Test a key renders once and is then served from memory"""
+        renders = []
+        
+        def render():
+            renders.append(1)
+            return b'png', 'image/png'
+        
+        self.assertEqual(self.cache.get_or_render(('trend', 1, 0), render), (b'png', 'image/png', False))
+        self.assertEqual(self.cache.get_or_render(('trend', 1, 0), render), (b'png', 'image/png', True))
+        self.assertEqual(len(renders), 1)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+    
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Test the total size stays within max_bytes by dropping the oldest unused image"""
+        self.cache.put('a', b'1234', 'image/png')
+        self.cache.put('b', b'1234', 'image/png')
+        self.cache.get('a')
+        self.cache.put('c', b'1234', 'image/png')
+        
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        stats = self.cache.stats()
+        self.assertEqual((stats['entries'], stats['bytes'], stats['evictions']), (2, 8, 1))
+    
+    def test_oversized_image_not_stored(self):
+        """Test an image larger than the whole budget is served but never cached"""
+        self.cache.put('big', b'x' * 11, 'image/png')
+        self.assertIsNone(self.cache.get('big'))
+        self.assertEqual(self.cache.stats()['bytes'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
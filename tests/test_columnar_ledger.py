@@ -0,0 +1,339 @@
+"""
+Unit tests for ColumnarLedger storage engine
+"""
+import unittest
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from models.columnar_ledger import (
+    ColumnarLedger, StringPool, AmbiguousIdError, parse_day, format_day, encode_id, id_prefix_range,
+    COMPACTION_MIN_TOMBSTONES
+)
+
+
+class TestColumnarLedger(unittest.TestCase):
+    """Test cases for ColumnarLedger"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.ledger = ColumnarLedger()
+    
+    def test_add_materializes_transaction(self):
+        """Test adding a row returns a populated Transaction"""
+        record = self.ledger.add(12.5, "Food", "2025-10-24", "Lunch")
+        
+        self.assertEqual(record.amount, 12.5)
+        self.assertEqual(record.category, "Food")
+        self.assertEqual(record.date, "2025-10-24")
+        self.assertEqual(record.description, "Lunch")
+        self.assertEqual(len(record.id), 36)
+        self.assertIsNotNone(record.created_at)
+        self.assertEqual(len(self.ledger), 1)
+    
+    def test_row_round_trip_is_stable(self):
+        """Test materializing the same slot twice yields identical data"""
+        record = self.ledger.add(12.5, "Food", "2025-10-24", "Lunch")
+        self.assertEqual(self.ledger.row(0).to_dict(), record.to_dict())
+    
+    def test_preserves_supplied_id(self):
+        """Test an existing identifier is kept when re-inserting a row"""
+        original = self.ledger.add(5.0, "Food", "2025-10-24", "Snack")
+        copy_ledger = ColumnarLedger()
+        restored = copy_ledger.add(5.0, "Food", "2025-10-24", "Snack", transaction_id=original.id)
+        self.assertEqual(restored.id, original.id)
+    
+    def test_invalid_date_rejected_without_partial_row(self):
+        """Test a bad date raises ValueError and leaves the ledger untouched"""
+        with self.assertRaises(ValueError):
+            self.ledger.add(10.0, "Food", "24/10/2025", "Lunch")
+        self.assertEqual(len(self.ledger), 0)
+        self.assertEqual(len(self.ledger._ids), 0)
+    
+    def test_update_changes_only_given_columns(self):
+        """Test partial updates leave other columns intact"""
+        self.ledger.add(10.0, "Food", "2025-10-24", "Lunch")
+        updated = self.ledger.update_slot(0, category="Dining")
+        
+        self.assertEqual(updated.category, "Dining")
+        self.assertEqual(updated.amount, 10.0)
+        self.assertEqual(updated.date, "2025-10-24")
+    
+    def test_delete_keeps_order(self):
+        """Test deleting a middle row keeps the remaining rows in insertion order"""
+        for label in ("first", "second", "third"):
+            self.ledger.add(1.0, "Food", "2025-10-24", label)
+        self.ledger.delete_slot(1)
+        
+        self.assertEqual([r.description for r in self.ledger.rows()], ["first", "third"])
+        self.assertEqual(len(self.ledger), 2)
+        
+        self.ledger.compact()
+        self.assertEqual([r.description for r in self.ledger.rows()], ["first", "third"])
+        self.assertEqual(len(self.ledger._ids), 32)
+    
+    def test_find_slot_by_full_id(self):
+        """Test full IDs resolve through the hash index"""
+        self.ledger.add(1.0, "Food", "2025-10-24", "a")
+        record = self.ledger.add(2.0, "Food", "2025-10-24", "b")
+        self.assertEqual(self.ledger.find_slot(record.id), 1)
+        self.assertIsNone(self.ledger.find_slot("00000000-0000-0000-0000-000000000000"))
+    
+    def test_find_slot_by_prefix(self):
+        """Test a unique prefix resolves to its row"""
+        record = self.ledger.add(1.0, "Food", "2025-10-24", "a", transaction_id="aaaa0000-0000-4000-8000-000000000001")
+        self.ledger.add(1.0, "Food", "2025-10-24", "b", transaction_id="bbbb0000-0000-4000-8000-000000000001")
+        
+        self.assertEqual(self.ledger.row(self.ledger.find_slot("aaaa")).id, record.id)
+        self.assertIsNone(self.ledger.find_slot("cccc"))
+        self.assertIsNone(self.ledger.find_slot("not-an-id"))
+    
+    def test_ambiguous_prefix_is_reported(self):
+        """Test a prefix shared by two rows raises instead of picking one"""
+        self.ledger.add(1.0, "Food", "2025-10-24", "a", transaction_id="abcd0000-0000-4000-8000-000000000001")
+        self.ledger.add(1.0, "Food", "2025-10-24", "b", transaction_id="abcd0000-0000-4000-8000-000000000002")
+        
+        with self.assertRaises(AmbiguousIdError):
+            self.ledger.find_slot("abcd")
+        self.assertEqual(self.ledger.find_slot("abcd0000-0000-4000-8000-000000000002"), 1)
+    
+    def test_deleted_rows_leave_indexes(self):
+        """Test deleted IDs no longer resolve by full ID or prefix"""
+        record = self.ledger.add(1.0, "Food", "2025-10-24", "a")
+        self.ledger.delete_slot(self.ledger.find_slot(record.id))
+        
+        self.assertIsNone(self.ledger.find_slot(record.id))
+        self.assertIsNone(self.ledger.find_slot(record.id[:8]))
+    
+    def test_deleted_id_can_be_added_again(self):
+        """Test a tombstoned ID entry is skipped, so the same ID can be stored again"""
+        fixed_id = "abcd0000-0000-4000-8000-000000000001"
+        self.ledger.add(1.0, "Food", "2025-10-24", "old", transaction_id=fixed_id)
+        self.ledger.delete(fixed_id)
+        self.ledger.add(2.0, "Food", "2025-10-24", "new", transaction_id=fixed_id)
+        
+        self.assertEqual(self.ledger.find_slot(fixed_id), 1)
+        self.assertEqual(self.ledger.get("abcd").description, "new")
+        with self.assertRaises(ValueError):
+            self.ledger.add(3.0, "Food", "2025-10-24", "dup", transaction_id=fixed_id)
+    
+    def test_compaction_renumbers_slots(self):
+        """Test automatic compaction keeps surviving rows addressable"""
+        records = [self.ledger.add(float(i), "Food", "2025-10-24", str(i))
+                   for i in range(COMPACTION_MIN_TOMBSTONES * 2)]
+        for record in records[:COMPACTION_MIN_TOMBSTONES]:
+            self.ledger.delete_slot(self.ledger.find_slot(record.id))
+        
+        self.assertEqual(self.ledger._tombstones, 0)
+        self.assertEqual(len(self.ledger._amounts), COMPACTION_MIN_TOMBSTONES)
+        survivor = records[-1]
+        self.assertEqual(self.ledger.row(self.ledger.find_slot(survivor.id)).description, survivor.description)
+    
+    def test_date_range_bisects_index(self):
+        """Test date range queries return matching slots in insertion order"""
+        for day in ("2025-10-05", "2025-09-30", "2025-10-01", "2025-10-31", "2025-11-01"):
+            self.ledger.add(1.0, "Food", day, day)
+        
+        self.assertEqual(self.ledger.slots_in_date_range("2025-10-01", "2025-10-31"), [0, 2, 3])
+        self.assertEqual(self.ledger.slots_in_date_range(None, "2025-09-30"), [1])
+        self.assertEqual(self.ledger.slots_in_date_range("2025-12-01", None), [])
+    
+    def test_date_index_survives_compaction(self):
+        """Test the date index stays valid after slots are renumbered"""
+        first = self.ledger.add(1.0, "Food", "2025-10-01", "first")
+        self.ledger.add(1.0, "Food", "2025-10-02", "second")
+        self.ledger.delete_slot(self.ledger.find_slot(first.id))
+        self.ledger.compact()
+        
+        slots = self.ledger.slots_in_date_range("2025-10-01", "2025-10-31")
+        self.assertEqual([self.ledger.row(slot).description for slot in slots], ["second"])
+    
+    def test_deleted_rows_skipped_by_date_index(self):
+        """Test a delete leaves its date index entry to be skipped instead of shifting the index"""
+        first = self.ledger.add(1.0, "Food", "2025-10-01", "first")
+        self.ledger.add(1.0, "Food", "2025-10-01", "second")
+        self.ledger.delete(first.id)
+        
+        self.assertEqual(len(self.ledger._date_order), 2)
+        self.assertEqual(self.ledger.slots_in_date_range("2025-10-01", "2025-10-01"), [1])
+        self.assertEqual([r.description for r in self.ledger.page(5)], ["second"])
+    
+    def test_category_lookup_is_case_insensitive(self):
+        """Test category slots match regardless of case"""
+        self.ledger.add(1.0, "Food", "2025-10-24", "a")
+        self.ledger.add(1.0, "Rent", "2025-10-24", "b")
+        self.ledger.add(1.0, "FOOD", "2025-10-24", "c")
+        
+        self.assertEqual(self.ledger.slots_for_category("food"), [0, 2])
+    
+    def test_category_postings_follow_updates_and_deletes(self):
+        """Test posting lists move with category changes and drop deleted rows"""
+        self.ledger.add(1.0, "Food", "2025-10-24", "a")
+        self.ledger.add(1.0, "Food", "2025-10-24", "b")
+        self.ledger.add(1.0, "Rent", "2025-10-24", "c")
+        
+        self.ledger.update_slot(0, category="Rent")
+        self.ledger.delete_slot(1)
+        
+        self.assertEqual(self.ledger.slots_for_category("food"), [])
+        self.assertEqual(self.ledger.slots_for_category("RENT"), [0, 2])
+        self.assertEqual(self.ledger.category_counts(), [("Rent", 2)])
+    
+    def test_category_counts_merge_case_variants(self):
+        """Test distinct category listing folds case variants together"""
+        self.ledger.add(1.0, "Food", "2025-10-24", "a")
+        self.ledger.add(1.0, "food", "2025-10-24", "b")
+        self.ledger.add(1.0, "Bills", "2025-10-24", "c")
+        
+        self.assertEqual(self.ledger.category_counts(), [("Bills", 1), ("Food", 2)])
+    
+    def test_category_and_date_filters_intersect(self):
+        """Test combined filters agree whichever index drives the intersection"""
+        for day in range(1, 29):
+            self.ledger.add(1.0, "Food" if day % 7 else "Rent", f"2025-10-{day:02d}", str(day))
+        
+        self.assertEqual(self.ledger.find_slots("rent", "2025-10-01", "2025-10-31"), [6, 13, 20, 27])
+        self.assertEqual(self.ledger.find_slots("food", "2025-10-06", "2025-10-08"), [5, 7])
+    
+    def test_category_postings_survive_compaction(self):
+        """Test posting lists are renumbered when slots are compacted"""
+        first = self.ledger.add(1.0, "Food", "2025-10-24", "a")
+        self.ledger.add(1.0, "Food", "2025-10-24", "b")
+        self.ledger.delete_slot(self.ledger.find_slot(first.id))
+        self.ledger.compact()
+        
+        self.assertEqual(self.ledger.slots_for_category("food"), [0])
+    
+    def test_page_follows_date_then_id_order(self):
+        """Test keyset pages resume after the given (date, ID) and honour filters"""
+        self.ledger.add(1.0, "Food", "2025-10-02", "b", transaction_id="00000000-0000-4000-8000-000000000002")
+        self.ledger.add(1.0, "Rent", "2025-10-01", "a", transaction_id="00000000-0000-4000-8000-000000000009")
+        self.ledger.add(1.0, "Food", "2025-10-02", "c", transaction_id="00000000-0000-4000-8000-000000000001")
+        
+        first = self.ledger.page(2)
+        self.assertEqual([r.description for r in first], ["a", "c"])
+        rest = self.ledger.page(2, after=(first[-1].date, first[-1].id))
+        self.assertEqual([r.description for r in rest], ["b"])
+        self.assertEqual([r.description for r in self.ledger.page(5, category="food")], ["c", "b"])
+        self.assertEqual(self.ledger.page(5, date_from="2025-10-03"), [])
+    
+    def test_add_many_indexes_every_row(self):
+        """Test bulk appends reach the ID, date and category indexes and the rollup"""
+        self.ledger.add(1.0, "Rent", "2025-10-03", "existing")
+        records = self.ledger.add_many([
+            (2.0, "Food", "2025-10-02", "b"),
+            (3.0, "food", "2025-10-01", "a")
+        ])
+        
+        self.assertEqual(self.ledger.find_slot(records[1].id), 2)
+        self.assertEqual([r.description for r in self.ledger.page(5)], ["a", "b", "existing"])
+        self.assertEqual(self.ledger.slots_for_category("FOOD"), [1, 2])
+        self.assertEqual(self.ledger.rollup.category_totals("2025-10"), {"Rent": 1.0, "Food": 2.0, "food": 3.0})
+    
+    def test_add_many_small_and_large_batches_keep_order(self):
+        """Test both the per-row and the merged index paths keep date and ID order"""
+        for day in range(1, 29, 2):
+            self.ledger.add(1.0, "Food", f"2025-10-{day:02d}", str(day))
+        self.ledger.add_many([(1.0, "Food", "2025-10-04", "4")])
+        self.ledger.add_many([(1.0, "Food", f"2025-10-{day:02d}", str(day)) for day in range(2, 29, 2) if day != 4])
+        
+        self.assertEqual([int(r.description) for r in self.ledger.page(30)], list(range(1, 29)))
+        for record in self.ledger.rows():
+            self.assertEqual(self.ledger.find_slot(record.id[:12]), self.ledger.find_slot(record.id))
+    
+    def test_restore_many_keeps_ids_and_rejects_duplicates(self):
+        """Test bulk restores keep IDs and creation times and refuse IDs already present"""
+        existing = self.ledger.add(1.0, "Food", "2025-10-02", "existing")
+        restored_id = "00000000-0000-4000-8000-000000000001"
+        restored = (encode_id(restored_id), 2.0, parse_day("2025-10-01"), "Rent", "restored", 1700000000.5)
+        
+        self.assertEqual(self.ledger.restore_many([restored]), 1)
+        record = self.ledger.get(restored_id)
+        self.assertEqual((record.description, record.created_epoch), ("restored", 1700000000.5))
+        self.assertEqual([r.description for r in self.ledger.page(5)], ["restored", "existing"])
+        with self.assertRaises(ValueError):
+            self.ledger.restore_many([(encode_id(existing.id), 1.0, parse_day("2025-10-01"), "Food", "again", 0.0)])
+        self.assertEqual(len(self.ledger), 2)
+    
+    def test_detached_rows_ignore_later_writes(self):
+        """Test the column copy is taken up front and not disturbed by writes made afterwards"""
+        kept = self.ledger.add(1.0, "Food", "2025-10-01", "kept")
+        dropped = self.ledger.add(2.0, "Food", "2025-10-02", "dropped")
+        self.ledger.delete(dropped.id)
+        
+        rows = self.ledger.detached_rows()
+        self.ledger.update(kept.id, amount=5.0)
+        self.ledger.add(3.0, "Rent", "2025-10-03", "later")
+        
+        self.assertEqual([(r.id, r.amount, r.created_at) for r in rows], [(kept.id, 1.0, kept.created_at)])
+    
+    def test_add_many_rejects_batch_on_bad_date(self):
+        """Test one bad row leaves the ledger untouched"""
+        with self.assertRaises(ValueError):
+            self.ledger.add_many([(1.0, "Food", "2025-10-01", "ok"), (1.0, "Food", "bad", "bad")])
+        self.assertEqual(len(self.ledger), 0)
+    
+    def test_delete_where_clears_matches_from_every_index(self):
+        """Test a filtered delete drops rows from the ID, date and category indexes and the rollup"""
+        records = [self.ledger.add(float(day), "Food" if day % 2 else "Rent", f"2025-10-{day:02d}", str(day))
+                   for day in range(1, 11)]
+        
+        self.assertEqual(self.ledger.delete_where("rent", "2025-10-03", "2025-10-08"), 3)
+        self.assertIsNone(self.ledger.find_slot(records[3].id))
+        self.assertEqual(self.ledger.slots_for_category("rent"), [1, 9])
+        self.assertEqual([r.description for r in self.ledger.page(10, date_from="2025-10-03")],
+                         ["3", "5", "7", "9", "10"])
+        self.assertEqual(self.ledger.rollup.category_totals(), {"Food": 25.0, "Rent": 12.0})
+        self.assertEqual(self.ledger.delete_where("travel"), 0)
+    
+    def test_repeated_strings_are_pooled(self):
+        """Test repeated categories and descriptions are stored once"""
+        for _ in range(50):
+            self.ledger.add(1.0, "Food", "2025-10-24", "Lunch")
+        self.assertEqual(len(self.ledger._categories), 1)
+        self.assertEqual(len(self.ledger._descriptions), 1)
+    
+    def test_fixed_width_memory_per_row(self):
+        """Test columns and indexes together stay well under a Python object per row"""
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for day in range(10000):
+                self.ledger.add(1.0, "Food", f"2025-{day % 12 + 1:02d}-{day % 28 + 1:02d}", "Lunch")
+            allocated = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        self.assertLessEqual(allocated / 10000, 80)
+        self.assertLessEqual(self.ledger.memory_usage(), allocated)
+        self.assertGreaterEqual(self.ledger.memory_usage() / 10000, 16 + 1 + 8 + 4 + 4 + 4 + 8 + 4 + 4 + 4)
+
+
+class TestLedgerHelpers(unittest.TestCase):
+    """Test cases for ledger encoding helpers"""
+    
+    def test_day_round_trip(self):
+        """Test date strings survive ordinal encoding"""
+        self.assertEqual(format_day(parse_day("2024-02-29")), "2024-02-29")
+    
+    def test_id_prefix_range(self):
+        """Test prefixes map to inclusive byte bounds and malformed ones are rejected"""
+        low, high = id_prefix_range("ab")
+        self.assertEqual(low, bytes.fromhex("ab" + "0" * 30))
+        self.assertEqual(high, bytes.fromhex("ab" + "f" * 30))
+        self.assertIsNone(id_prefix_range("ABCD"))
+        self.assertIsNone(id_prefix_range("abcdabcdx"))
+    
+    def test_string_pool_codes(self):
+        """Test the pool hands out stable codes"""
+        pool = StringPool()
+        self.assertEqual(pool.intern("a"), 0)
+        self.assertEqual(pool.intern("b"), 1)
+        self.assertEqual(pool.intern("a"), 0)
+        self.assertEqual(pool.lookup(1), "b")
+
+
+if __name__ == '__main__':
+    unittest.main()
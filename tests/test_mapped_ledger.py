@@ -0,0 +1,220 @@
+"""
+Unit tests for the memory-mapped ledger file
+"""
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from storage.mapped_ledger import (
+    MappedLedger, write_ledger_file, JOURNAL_HEADER, JOURNAL_SUFFIX
+)
+from models.columnar_ledger import ColumnarLedger, AmbiguousIdError
+from models.spending_rollup import SpendingRollup
+from controllers.spend_controller import SpendController
+
+
+class TestMappedLedger(unittest.TestCase):
+    """Test cases for MappedLedger"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ledger.bin')
+        self.source = ColumnarLedger()
+        for day in range(1, 29):
+            category = "Food" if day % 7 else "RENT"
+            self.source.add(float(day), category, f"2025-10-{day:02d}", f"expense {day}")
+        write_ledger_file(self.path, self.source.rows())
+        self.ledger = MappedLedger(self.path)
+        self.controller = SpendController(self.ledger)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.ledger.close()
+        self.directory.cleanup()
+    
+    def test_rows_round_trip(self):
+        """Test mapped rows decode to the records that were written"""
+        self.assertEqual([record.to_dict() for record in self.controller.get_all_expenses()],
+                         [record.to_dict() for record in self.source.rows()])
+    
+    def test_lookup_by_full_and_partial_id(self):
+        """Test IDs resolve through the ID-ordered column"""
+        record = next(self.source.rows())
+        self.assertEqual(self.controller.get_expense_by_id(record.id).description, "expense 1")
+        self.assertEqual(self.controller.get_expense_by_id(record.id[:13]).id, record.id)
+        self.assertIsNone(self.controller.get_expense_by_id("00000000-0000-4000-8000-000000000000"))
+    
+    def test_ambiguous_prefix_spans_file_and_overlay(self):
+        """Test a prefix matching a mapped row and a new row is reported"""
+        self.ledger.close()
+        write_ledger_file(self.path, [self.source.add(1.0, "Food", "2025-10-01", "mapped",
+                                                      transaction_id="abcd0000-0000-4000-8000-000000000001")])
+        self.ledger = MappedLedger(self.path)
+        self.ledger.add(1.0, "Food", "2025-10-01", "new", transaction_id="abcd0000-0000-4000-8000-000000000002")
+        
+        with self.assertRaises(AmbiguousIdError):
+            self.ledger.get("abcd")
+        with self.assertRaises(ValueError):
+            self.ledger.add(1.0, "Food", "2025-10-01", "dup", transaction_id="abcd0000-0000-4000-8000-000000000001")
+    
+    def test_filters_match_columnar_ledger(self):
+        """Test category and date filters agree with the in-memory ledger"""
+        for criteria in ({'category': 'rent'},
+                         {'date_from': '2025-10-06', 'date_to': '2025-10-08'},
+                         {'category': 'food', 'date_from': '2025-10-20'}):
+            expected = [record.id for record in SpendController(self.source).filter_expenses(**criteria)]
+            actual = [record.id for record in self.controller.filter_expenses(**criteria)]
+            self.assertEqual(actual, expected)
+    
+    def test_pages_merge_file_and_overlay(self):
+        """Test keyset pages interleave mapped, overridden and new rows by (date, ID)"""
+        records = list(self.source.rows())
+        self.ledger.update(records[0].id, date="2025-10-10")
+        self.ledger.add(1.0, "Food", "2025-10-10", "new")
+        
+        seen, after = [], None
+        while True:
+            page = self.ledger.page(4, after=after, date_from="2025-10-08", date_to="2025-10-12")
+            if not page:
+                break
+            seen.extend(page)
+            after = (page[-1].date, page[-1].id)
+        
+        self.assertEqual(sorted(record.description for record in seen),
+                         ["expense 1", "expense 10", "expense 11", "expense 12", "expense 8", "expense 9", "new"])
+        keys = [(record.date, record.id) for record in seen]
+        self.assertEqual(keys, sorted(keys))
+    
+    def test_changes_overlay_mapped_rows(self):
+        """Test updates, deletes and adds are visible before saving"""
+        records = list(self.source.rows())
+        self.controller.get_spending_statistics()
+        self.controller.update_expense(records[0].id, category="Rent", date="2025-11-01")
+        self.controller.delete_expense(records[6].id)
+        self.controller.add_expense(100.0, "Travel", "2025-10-15", "Train")
+        
+        self.assertEqual(len(self.ledger), 28)
+        rent = self.controller.filter_expenses(category="rent")
+        self.assertEqual([record.description for record in rent][:2], ["expense 1", "expense 14"])
+        self.assertEqual(self.controller.filter_expenses(date_from="2025-11-01")[0].id, records[0].id)
+        self.assertEqual(self.controller.get_category_totals("2025-11"), {"Rent": 1.0})
+        self.assertEqual(self.controller.get_spending_statistics()['total'], sum(range(1, 29)) - 7 + 100.0)
+    
+    def test_delete_where_spans_file_and_overlay(self):
+        """Test filtered deletes clear mapped, overridden and new rows alike"""
+        records = list(self.source.rows())
+        self.controller.get_spending_statistics()
+        self.controller.update_expense(records[0].id, category="Rent")
+        self.controller.add_expense(100.0, "rent", "2025-10-15", "new")
+        
+        self.assertEqual(self.controller.delete_where(category="RENT"), 6)
+        self.assertEqual(len(self.ledger), 23)
+        self.assertEqual(self.controller.filter_expenses(category="rent"), [])
+        self.assertEqual(self.controller.get_category_totals(), {"Food": float(sum(range(2, 29)) - 7 - 14 - 21 - 28)})
+    
+    def test_save_folds_changes_into_file(self):
+        """Test save() rewrites the file so a fresh mapping sees every change"""
+        first = next(self.source.rows())
+        self.controller.update_expense(first.id, amount=99.0)
+        self.controller.add_expense(5.0, "Travel", "2025-10-15", "Bus")
+        self.ledger.save()
+        self.ledger.close()
+        self.assertEqual(os.path.getsize(self.path + JOURNAL_SUFFIX), JOURNAL_HEADER.size)
+        
+        self.ledger = MappedLedger(self.path)
+        self.assertEqual(len(self.ledger), 29)
+        self.assertEqual(self.ledger.get(first.id).amount, 99.0)
+        self.assertEqual(self.ledger.category_counts(), [("Food", 24), ("RENT", 4), ("Travel", 1)])
+    
+    def test_unsaved_changes_replayed_from_journal(self):
+        """Test every write survives a reopen without save(), as after a crash"""
+        records = list(self.source.rows())
+        self.controller.update_expense(records[0].id, amount=99.0, date="2025-11-01")
+        self.controller.delete_expense(records[1].id)
+        added = self.controller.add_expense(5.0, "Travel", "2025-10-15", "Bus")
+        self.controller.add_expenses([{"amount": 2.0, "category": "Fuel", "date": "2025-10-16"}])
+        self.controller.delete_where(category="rent")
+        expected = [record.to_dict() for record in self.ledger.rows()]
+        totals = self.controller.get_monthly_totals()
+        self.ledger.close()
+        # A torn record at the end of the journal is dropped
+        with open(self.path + JOURNAL_SUFFIX, 'ab') as journal:
+            journal.write(b'\x01\xff')
+        
+        self.ledger = MappedLedger(self.path)
+        self.assertEqual([record.to_dict() for record in self.ledger.rows()], expected)
+        self.assertEqual(self.ledger.get(added.id).created_at, added.created_at)
+        self.assertEqual(SpendController(self.ledger).get_monthly_totals(), totals)
+        
+        # Saving folds the journal in, so nothing is replayed twice
+        self.ledger.save()
+        self.ledger.close()
+        self.ledger = MappedLedger(self.path)
+        self.assertEqual([record.to_dict() for record in self.ledger.rows()], expected)
+    
+    def test_writers_in_two_processes_share_the_file(self):
+        """Test a second opener can read, and each write first catches up with the other's changes"""
+        other = MappedLedger(self.path)
+        try:
+            self.assertEqual(len(other), 28)
+            first = self.ledger.add(1.0, "Travel", "2025-10-01", "first")
+            # The reader has not written yet, so it has not seen the change
+            self.assertIsNone(other.get(first.id))
+            
+            second = other.add(2.0, "Travel", "2025-10-02", "second")
+            self.assertEqual(other.get(first.id).description, "first")
+            other.save()
+            
+            self.ledger.delete(second.id)
+            self.assertEqual(len(self.ledger), 29)
+            self.ledger.save()
+        finally:
+            other.close()
+        
+        self.ledger.close()
+        self.ledger = MappedLedger(self.path)
+        self.assertEqual(len(self.ledger), 29)
+        self.assertEqual(self.ledger.category_counts()[-1], ("Travel", 1))
+    
+    def test_save_without_changes_keeps_file(self):
+        """Test save() leaves the file alone when nothing was journaled, as when a reader exits"""
+        inode = os.stat(self.path).st_ino
+        self.ledger.save()
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+    
+    def test_totals_loaded_at_open(self):
+        """Test spending totals come from the file's totals section without reading rows"""
+        with patch.object(MappedLedger, '_mapped_row', side_effect=AssertionError("decoded a row")):
+            with patch.object(SpendingRollup, 'add_many', side_effect=AssertionError("summed rows")):
+                self.ledger.close()
+                self.ledger = MappedLedger(self.path)
+        self.ledger.add(1.0, "Food", "2025-10-01", "new")
+        self.assertEqual(self.ledger.rollup.total, sum(range(1, 29)) + 1.0)
+        self.assertEqual(self.ledger.rollup.category_totals()["RENT"], 7.0 + 14.0 + 21.0 + 28.0)
+        self.assertEqual(self.ledger.rollup.category_counts()["RENT"], 4)
+        
+        self.ledger.save()
+        self.ledger.close()
+        self.ledger = MappedLedger(self.path)
+        self.source.add(1.0, "Food", "2025-10-01", "new")
+        self.assertEqual(self.ledger.rollup.daily_totals(), self.source.rollup.daily_totals())
+        self.assertEqual(self.ledger.rollup.monthly_totals(), self.source.rollup.monthly_totals())
+    
+    def test_rejects_foreign_file(self):
+        """Test a file without the ledger header is refused"""
+        other = os.path.join(self.directory.name, 'other.bin')
+        with open(other, 'wb') as handle:
+            handle.write(b'not a ledger file at all')
+        with self.assertRaises(ValueError):
+            MappedLedger(other)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Unit tests for the operation log storage backend
+"""
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from storage.operation_log import OperationLog, SNAPSHOT_NAME, segment_name
+from models.columnar_ledger import ColumnarLedger
+from controllers.spend_controller import SpendController
+from controllers.sense_controller import SenseController
+
+
+class TestOperationLog(unittest.TestCase):
+    """Test cases for OperationLog recovery and snapshots"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.log = OperationLog(self.directory.name, snapshot_interval=None)
+        self.controller = SpendController(self.log.ledger)
+        self.budgets = SenseController(self.log.budgets)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.log.close()
+        self.directory.cleanup()
+    
+    def reopen(self):
+        """Close the log and recover it again, as a restart would"""
+        self.log.close()
+        self.log = OperationLog(self.directory.name, snapshot_interval=None)
+        return SpendController(self.log.ledger), SenseController(self.log.budgets)
+    
+    def test_operations_replayed_after_restart(self):
+        """Test adds, updates and deletes are rebuilt from the log"""
+        kept = self.controller.add_expense(10.0, "Food", "2025-10-24", "Lunch")
+        dropped = self.controller.add_expense(20.0, "Rent", "2025-10-01", "October")
+        self.controller.update_expense(kept.id[:8], amount=12.5, category="Dining")
+        self.controller.delete_expense(dropped.id)
+        
+        controller, _ = self.reopen()
+        expenses = controller.get_all_expenses()
+        self.assertEqual(len(expenses), 1)
+        self.assertEqual(expenses[0].id, kept.id)
+        self.assertEqual(expenses[0].amount, 12.5)
+        self.assertEqual(expenses[0].category, "Dining")
+        self.assertEqual(expenses[0].created_at, kept.created_at)
+        self.assertEqual(controller.get_category_totals(), {"Dining": 12.5})
+    
+    def test_creation_time_replayed_exactly(self):
+        """Test creation times survive a restart bit for bit, including inside a DST fall-back hour"""
+        # 2023-11-05 01:30 US Eastern occurs twice; this is the second (EST) one
+        ambiguous = 1699165800.1234567
+        had_tz = 'TZ' in os.environ
+        previous_tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'America/New_York'
+        time.tzset()
+        try:
+            self.log.ledger.add(10.0, "Food", "2023-11-05", "Late night", created_at=ambiguous)
+            self.log.snapshot()
+            self.log.ledger.add(5.0, "Food", "2023-11-05", "Logged after snapshot", created_at=ambiguous + 1)
+            
+            controller, _ = self.reopen()
+            created = sorted(expense.created_epoch for expense in controller.get_all_expenses())
+            self.assertEqual(created, [ambiguous, ambiguous + 1])
+        finally:
+            if had_tz:
+                os.environ['TZ'] = previous_tz
+            else:
+                del os.environ['TZ']
+            time.tzset()
+    
+    def test_delete_where_replayed_after_restart(self):
+        """Test a filtered delete is logged once and replayed against the same rows"""
+        self.controller.add_expense(10.0, "Food", "2025-09-30", "September")
+        self.controller.add_expense(20.0, "Food", "2025-10-01", "October")
+        self.assertEqual(self.controller.delete_where(month="2025-10"), 1)
+        self.controller.add_expense(30.0, "Food", "2025-10-02", "Added after")
+        
+        controller, _ = self.reopen()
+        self.assertEqual([e.description for e in controller.get_all_expenses()], ["September", "Added after"])
+    
+    def test_budgets_replayed_after_restart(self):
+        """Test budget changes are rebuilt from the log"""
+        overall = self.budgets.set_budget(2000.0, "2025-10")
+        self.budgets.set_budget(400.0, "2025-10", "Food")
+        self.budgets.set_budget(450.0, "2025-10", "Food")
+        self.budgets.delete_budget(overall.id)
+        
+        _, budgets = self.reopen()
+        self.assertIsNone(budgets.get_budget("2025-10"))
+        self.assertEqual(budgets.get_budget("2025-10", "Food").amount, 450.0)
+    
+    def test_snapshot_drops_covered_segments(self):
+        """Test a snapshot replaces old segments and recovery replays only the tail"""
+        self.controller.add_expense(10.0, "Food", "2025-10-24", "before")
+        self.budgets.set_budget(400.0, "2025-10", "Food")
+        self.log.snapshot()
+        self.controller.add_expense(5.0, "Food", "2025-10-25", "after")
+        
+        names = sorted(os.listdir(self.directory.name))
+        self.assertEqual(names, [segment_name(2), SNAPSHOT_NAME])
+        
+        controller, budgets = self.reopen()
+        self.assertEqual([record.description for record in controller.get_all_expenses()], ["before", "after"])
+        self.assertEqual(budgets.get_budget("2025-10", "Food").amount, 400.0)
+    
+    def test_snapshot_rows_restored_in_one_batch(self):
+        """Test recovery loads runs of added rows in bulk and still orders them around updates"""
+        records = self.log.ledger.add_many([(float(day), "Food", f"2025-10-{day:02d}", str(day)) for day in range(1, 21)])
+        self.log.snapshot()
+        self.controller.add_expense(30.0, "Rent", "2025-10-21", "after")
+        self.controller.update_expense(records[0].id, amount=99.0)
+        
+        batches = []
+        restore_many = ColumnarLedger.restore_many
+        def counting(ledger, rows):
+            rows = list(rows)
+            batches.append(len(rows))
+            return restore_many(ledger, rows)
+        with patch.object(ColumnarLedger, 'restore_many', counting):
+            controller, _ = self.reopen()
+        
+        self.assertEqual(batches, [21])
+        self.assertEqual(controller.get_expense_by_id(records[0].id).amount, 99.0)
+        self.assertEqual(controller.get_category_totals(), {"Food": sum(range(2, 21)) + 99.0, "Rent": 30.0})
+    
+    def test_torn_tail_is_discarded(self):
+        """Test a partially written final record is ignored and truncated"""
+        self.controller.add_expense(10.0, "Food", "2025-10-24", "intact")
+        self.log.close()
+        with open(os.path.join(self.directory.name, segment_name(1)), 'ab') as segment:
+            segment.write(b'\x01\x40\x00\x00\x00garbage')
+        
+        self.log = OperationLog(self.directory.name, snapshot_interval=None)
+        controller = SpendController(self.log.ledger)
+        self.assertEqual([record.description for record in controller.get_all_expenses()], ["intact"])
+        
+        controller.add_expense(1.0, "Food", "2025-10-24", "appended")
+        controller, _ = self.reopen()
+        self.assertEqual(len(controller.get_all_expenses()), 2)
+    
+    def test_failed_write_is_not_logged(self):
+        """Test an invalid expense leaves nothing behind to replay"""
+        with self.assertRaises(ValueError):
+            self.controller.add_expense(1.0, "Food", "bad-date", "oops")
+        
+        controller, _ = self.reopen()
+        self.assertEqual(controller.get_all_expenses(), [])
+    
+    def test_concurrent_writers_share_syncs(self):
+        """Test records from concurrent writers all survive recovery"""
+        def write_many(label):
+            for index in range(50):
+                self.controller.add_expense(1.0, label, "2025-10-24", str(index))
+        
+        writers = [threading.Thread(target=write_many, args=(f"writer-{n}",)) for n in range(4)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        
+        controller, _ = self.reopen()
+        self.assertEqual(len(controller.get_all_expenses()), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Unit tests for the chart RenderPool worker processes
+"""
+import unittest
+import sys
+import threading
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.render_pool import RenderPool, RenderPoolBusy, RenderTimeout, RenderError
+
+# Worker that never answers, for timeout and admission tests
+STALLED_WORKER = [sys.executable, '-c', 'import time; time.sleep(30)']
+
+
+class TestRenderPool(unittest.TestCase):
+    """Test cases for RenderPool"""
+    
+    def test_worker_renders_png(self):
+        """Test a worker process renders charts and reports bad requests"""
+        pool = RenderPool(1, timeout=60)
+        try:
+            image = pool.render('category', {'categories': {'Food': 12.5, 'Transport': 4.0},
+                                             'title': 'Spending by Category'})
+            self.assertTrue(image.startswith(b'\x89PNG'))
+            
+            with self.assertRaises(RenderError):
+                pool.render('unknown', {})
+            
+            # The worker survives a failed render
+            image = pool.render('monthly-trend', {'periods': ['2024-01'], 'spent': [10.0], 'budget': [0]})
+            self.assertTrue(image.startswith(b'\x89PNG'))
+        finally:
+            pool.close()
+    
+    def test_stalled_worker_times_out_and_is_replaced(self):
+        """Test a render past the timeout raises and swaps in a fresh worker"""
+        pool = RenderPool(1, timeout=0.2, command=STALLED_WORKER)
+        try:
+            stalled = pool._idle.queue[0]
+            with self.assertRaises(RenderTimeout):
+                pool.render('category', {})
+            
+            self.assertIsNotNone(stalled.process.poll())
+            self.assertEqual(len(pool._workers), 1)
+            self.assertIsNot(pool._workers[0], stalled)
+        finally:
+            pool.close()
+    
+    def test_full_pool_refuses_immediately(self):
+        """Test renders beyond the workers and wait queue are refused"""
+        pool = RenderPool(1, max_pending=0, timeout=1, command=STALLED_WORKER)
+        try:
+            first = threading.Thread(target=lambda: self.assertRaises(RenderTimeout, pool.render, 'category', {}))
+            first.start()
+            while pool._idle.qsize():
+                pass
+            
+            with self.assertRaises(RenderPoolBusy):
+                pool.render('category', {})
+            first.join()
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
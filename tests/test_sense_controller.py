@@ -4,6 +4,7 @@ Unit tests for SenseController
 import unittest
 import sys
 from pathlib import Path
+from unittest.mock import Mock
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
@@ -84,6 +85,52 @@ class TestSenseController(unittest.TestCase):
         result = self.controller.delete_budget("nonexistent")
         self.assertFalse(result)
     
+    def test_set_budget_updates_existing_entry(self):
+        """Test setting the same month and category twice updates in place"""
+        first = self.controller.set_budget(400.00, "2025-08", "Groceries")
+        second = self.controller.set_budget(450.00, "2025-08", "Groceries")
+        
+        self.assertIs(first, second)
+        self.assertEqual(second.amount, 450.00)
+        self.assertEqual(len(self.controller.get_budgets_by_month("2025-08")), 1)
+    
+    def test_overall_and_category_budgets_are_distinct(self):
+        """Test the overall budget (no category) does not collide with category budgets"""
+        overall = self.controller.set_budget(2000.00, "2025-08", None)
+        groceries = self.controller.set_budget(400.00, "2025-08", "Groceries")
+        
+        self.assertIs(self.controller.get_budget("2025-08"), overall)
+        self.assertIs(self.controller.get_budget("2025-08", "Groceries"), groceries)
+    
+    def test_deleted_budget_leaves_every_index(self):
+        """Test a deleted budget disappears from month and criteria lookups"""
+        budget = self.controller.set_budget(400.00, "2025-07", "Groceries")
+        self.controller.delete_budget(budget.id)
+        
+        self.assertIsNone(self.controller.get_budget("2025-07", "Groceries"))
+        self.assertEqual(self.controller.get_budgets_by_month("2025-07"), [])
+        
+        recreated = self.controller.set_budget(300.00, "2025-07", "Groceries")
+        self.assertNotEqual(recreated.id, budget.id)
+        self.assertFalse(self.controller.delete_budget(budget.id))
+    
+    def test_failed_store_delete_keeps_budget(self):
+        """Test a budget whose store delete fails stays in every index"""
+        store = Mock()
+        store.load_all.return_value = []
+        controller = SenseController(store)
+        budget = controller.set_budget(400.00, "2025-07", "Groceries")
+        
+        store.delete.side_effect = OSError("disk full")
+        with self.assertRaises(OSError):
+            controller.delete_budget(budget.id)
+        self.assertIs(controller.get_budget("2025-07", "Groceries"), budget)
+        self.assertEqual(controller.get_budgets_by_month("2025-07"), [budget])
+        
+        store.delete.side_effect = None
+        self.assertTrue(controller.delete_budget(budget.id))
+        self.assertEqual(controller.get_all_budgets(), [])
+    
     def test_calculate_spending_vs_budget_within_limit(self):
         """Test budget analysis when spending is within limit"""
         # Set budget
@@ -144,6 +191,37 @@ class TestSenseController(unittest.TestCase):
             groceries = analysis['categories']['Groceries']
             self.assertEqual(groceries['budget'], 500.00)
     
+    def test_analyze_category_spending_matches_expense_scan(self):
+        """Test analysis from pre-aggregated totals equals the per-expense path"""
+        self.controller.set_budget(1000.00, "2025-06", None)
+        self.controller.set_budget(300.00, "2025-06", "Food")
+        self.spend_controller.add_expense(120.00, "Food", "2025-06-03", "Dining")
+        self.spend_controller.add_expense(80.00, "Fuel", "2025-06-04", "Gas")
+        
+        from_expenses = self.controller.calculate_spending_vs_budget(
+            self.spend_controller.get_all_expenses(), "2025-06"
+        )
+        from_totals = self.controller.analyze_category_spending(
+            self.spend_controller.get_category_totals("2025-06"), "2025-06"
+        )
+        
+        self.assertEqual(from_expenses, from_totals)
+        self.assertEqual(from_totals['total_spent'], 200.00)
+        self.assertEqual(from_totals['categories']['Food']['remaining'], 180.00)
+    
+    def test_version_bumps_on_changes(self):
+        """Test the version advances on every budget change and not on reads or misses"""
+        budget = self.controller.set_budget(100.0, "2025-10")
+        self.controller.set_budget(150.0, "2025-10")
+        self.assertEqual(self.controller.version, 2)
+        
+        self.controller.get_budgets_by_month("2025-10")
+        self.assertFalse(self.controller.delete_budget("missing"))
+        self.assertEqual(self.controller.version, 2)
+        
+        self.controller.delete_budget(budget.id)
+        self.assertEqual(self.controller.version, 3)
+    
     def test_empty_budgets_list(self):
         """Test controller with no budgets"""
         budgets = self.controller.get_all_budgets()
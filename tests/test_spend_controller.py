@@ -3,12 +3,16 @@ Unit tests for SpendController
 """
 import unittest
 import sys
+import io
+import threading
 from pathlib import Path
+from unittest.mock import patch
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from controllers.spend_controller import SpendController
+from models.columnar_ledger import AmbiguousIdError
 
 
 class TestSpendController(unittest.TestCase):
@@ -61,6 +65,23 @@ class TestSpendController(unittest.TestCase):
         result = self.controller.get_expense_by_id("nonexistent-id")
         self.assertIsNone(result)
     
+    def test_get_expense_by_partial_id(self):
+        """Test retrieving expense by a unique ID prefix"""
+        expense = self.controller.add_expense(30.00, "Food", "2025-10-24", "Dinner")
+        
+        retrieved = self.controller.get_expense_by_id(expense.id[:8])
+        self.assertEqual(retrieved.id, expense.id)
+    
+    def test_ambiguous_partial_id_raises(self):
+        """Test a prefix matching several expenses is reported instead of guessed"""
+        self.controller.add_expense(30.00, "Food", "2025-10-24", "Dinner")
+        self.controller.add_expense(40.00, "Food", "2025-10-24", "Lunch")
+        
+        with self.assertRaises(AmbiguousIdError):
+            self.controller.get_expense_by_id("")
+        with self.assertRaises(AmbiguousIdError):
+            self.controller.delete_expense("")
+    
     def test_update_expense(self):
         """Test updating an expense"""
         expense = self.controller.add_expense(
@@ -146,19 +167,132 @@ class TestSpendController(unittest.TestCase):
         for expense in filtered:
             self.assertEqual(expense.category, "Groceries")
     
+    def test_page_expenses_cursor(self):
+        """Test paging returns every expense once with a cursor between pages"""
+        for day in range(1, 6):
+            self.controller.add_expense(float(day), "Food", f"2025-10-{day:02d}", str(day))
+        
+        seen, cursor = [], None
+        while True:
+            page, cursor = self.controller.page_expenses(limit=2, cursor=cursor)
+            seen.extend(record.description for record in page)
+            if cursor is None:
+                break
+        self.assertEqual(seen, ["1", "2", "3", "4", "5"])
+    
+    def test_page_expenses_rejects_bad_input(self):
+        """Test invalid limits and cursors raise ValueError"""
+        with self.assertRaises(ValueError):
+            self.controller.page_expenses(limit=0)
+        with self.assertRaises(ValueError):
+            self.controller.page_expenses(cursor="not-a-cursor")
+    
     def test_filter_expenses_by_date_range(self):
-        """Test filtering expenses by category (date filtering not implemented)"""
+        """Test filtering expenses by an inclusive date range"""
         self.controller.add_expense(50.00, "Groceries", "2025-10-20", "Shopping")
         self.controller.add_expense(25.00, "Food", "2025-10-25", "Lunch")
         self.controller.add_expense(30.00, "Groceries", "2025-10-30", "More shopping")
         
-        # Filter by category (date filtering is not implemented in controller)
-        filtered = self.controller.filter_expenses(category="Groceries")
+        filtered = self.controller.filter_expenses(date_from="2025-10-20", date_to="2025-10-25")
+        self.assertEqual([e.description for e in filtered], ["Shopping", "Lunch"])
         
-        # Should include both Groceries items
-        self.assertEqual(len(filtered), 2)
-        for expense in filtered:
-            self.assertEqual(expense.category, "Groceries")
+        # Open-ended ranges
+        self.assertEqual(len(self.controller.filter_expenses(date_from="2025-10-21")), 2)
+        self.assertEqual(len(self.controller.filter_expenses(date_to="2025-10-20")), 1)
+    
+    def test_filter_expenses_by_category_and_date(self):
+        """Test category and date filters combine"""
+        self.controller.add_expense(50.00, "Groceries", "2025-10-20", "Shopping")
+        self.controller.add_expense(25.00, "Food", "2025-10-25", "Lunch")
+        self.controller.add_expense(30.00, "Groceries", "2025-10-30", "More shopping")
+        
+        filtered = self.controller.filter_expenses(category="groceries", date_from="2025-10-21")
+        self.assertEqual([e.description for e in filtered], ["More shopping"])
+    
+    def test_filter_tracks_updated_dates(self):
+        """Test the date filter reflects date changes and deletions"""
+        moved = self.controller.add_expense(50.00, "Groceries", "2025-10-20", "Shopping")
+        removed = self.controller.add_expense(25.00, "Food", "2025-10-21", "Lunch")
+        
+        self.controller.update_expense(moved.id, date="2025-11-02")
+        self.controller.delete_expense(removed.id)
+        
+        self.assertEqual(self.controller.filter_expenses(date_from="2025-10-01", date_to="2025-10-31"), [])
+        november = self.controller.filter_expenses(date_from="2025-11-01", date_to="2025-11-30")
+        self.assertEqual([e.id for e in november], [moved.id])
+    
+    def test_filter_rejects_invalid_date(self):
+        """Test malformed date bounds raise ValueError"""
+        with self.assertRaises(ValueError):
+            self.controller.filter_expenses(date_from="10/20/2025")
+    
+    def test_get_category_counts(self):
+        """Test distinct categories are listed with counts"""
+        self.controller.add_expense(50.00, "Groceries", "2025-10-24", "Shopping")
+        self.controller.add_expense(25.00, "Food", "2025-10-24", "Lunch")
+        self.controller.add_expense(30.00, "groceries", "2025-10-25", "More shopping")
+        
+        counts = self.controller.get_category_counts()
+        self.assertEqual(counts, [
+            {'category': 'Food', 'count': 1},
+            {'category': 'Groceries', 'count': 2}
+        ])
+    
+    def test_spending_totals_follow_mutations(self):
+        """Test rollup-backed totals reflect adds, updates and deletes"""
+        lunch = self.controller.add_expense(25.00, "Food", "2025-10-24", "Lunch")
+        rent = self.controller.add_expense(900.00, "Rent", "2025-10-01", "October rent")
+        self.controller.add_expense(40.00, "Food", "2025-11-02", "Dinner")
+        
+        self.controller.update_expense(lunch.id, amount=30.00, date="2025-11-01")
+        self.controller.delete_expense(rent.id)
+        
+        self.assertEqual(self.controller.get_monthly_totals(), {"2025-11": 70.00})
+        self.assertEqual(self.controller.get_category_totals("2025-11"), {"Food": 70.00})
+        self.assertEqual(self.controller.get_daily_totals("2025-11"),
+                         {"2025-11-01": 30.00, "2025-11-02": 40.00})
+        
+        stats = self.controller.get_spending_statistics()
+        self.assertEqual(stats['total'], 70.00)
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['by_category'], {"Food": 70.00})
+    
+    def test_add_expenses_reports_bad_rows(self):
+        """Test bulk inserts keep valid rows and report rejected ones by index"""
+        created, errors = self.controller.add_expenses([
+            {"amount": 10.0, "category": "Food", "date": "2025-10-24", "description": "Lunch"},
+            {"amount": -5, "category": "Food"},
+            {"category": "Food"},
+            {"amount": 3, "category": "Rent", "date": "24/10/2025"},
+            "not a row",
+            {"amount": 20, "category": "Food", "date": "2025-10-25"}
+        ])
+        
+        self.assertEqual([record.amount for record in created], [10.0, 20.0])
+        self.assertEqual(created[1].description, "")
+        self.assertEqual([error['index'] for error in errors], [1, 2, 3, 4])
+        self.assertIn("'amount'", errors[1]['error'])
+        self.assertEqual(self.controller.get_category_totals('2025-10'), {"Food": 30.0})
+        self.assertEqual(self.controller.get_expense_by_id(created[0].id).description, "Lunch")
+    
+    def test_delete_where_month(self):
+        """Test clearing a month removes only that month's expenses"""
+        self.controller.add_expense(10.0, "Food", "2025-09-30", "September")
+        self.controller.add_expense(20.0, "Food", "2025-10-01", "October start")
+        self.controller.add_expense(30.0, "Rent", "2025-10-31", "October end")
+        
+        self.assertEqual(self.controller.delete_where(month="2025-10"), 2)
+        self.assertEqual([e.description for e in self.controller.get_all_expenses()], ["September"])
+        self.assertEqual(self.controller.get_monthly_totals(), {"2025-09": 10.0})
+    
+    def test_delete_where_requires_valid_criteria(self):
+        """Test range deletes refuse empty, malformed or conflicting criteria"""
+        self.controller.add_expense(10.0, "Food", "2025-10-01", "kept")
+        for criteria in ({}, {'month': '2025-13'}, {'month': 'October'},
+                         {'month': '2025-10', 'date_from': '2025-10-01'}):
+            with self.assertRaises(ValueError):
+                self.controller.delete_where(**criteria)
+        self.assertEqual(len(self.controller.get_all_expenses()), 1)
     
     def test_export_to_csv(self):
         """Test CSV export functionality"""
@@ -172,6 +306,145 @@ class TestSpendController(unittest.TestCase):
         self.assertIn("Groceries", csv_data)
         self.assertIn("Food", csv_data)
     
+    def test_iter_csv_streams_filtered_pages(self):
+        """Test the streamed export yields the header first, then filtered rows by date"""
+        self.controller.add_expense(30.0, "Food", "2025-10-03", "Third")
+        self.controller.add_expense(10.0, "Food", "2025-10-01", "First")
+        self.controller.add_expense(20.0, "Rent", "2025-10-02", "Rent")
+        
+        chunks = self.controller.iter_csv(category="food")
+        self.assertEqual(next(chunks), b"ID,Amount,Category,Date,Description,Created At\r\n")
+        lines = b"".join(chunks).decode("utf-8").splitlines()
+        self.assertEqual([line.split(",")[4] for line in lines], ["First", "Third"])
+        
+        with self.assertRaises(ValueError):
+            self.controller.iter_csv(date_from="2025/10/01")
+    
+    def test_import_csv_commits_chunks_and_reports_errors(self):
+        """Test CSV import validates every row, commits in chunks and reports bad lines"""
+        upload = io.BytesIO(
+            "\ufeffAmount,Category,Date,Description\n"
+            "12.50,Food,2025-10-01,Lunch\n"
+            "abc,Food,2025-10-01,Bad amount\n"
+            "5,,2025-10-02,No category\n"
+            "\n"
+            "nan,Food,2025-10-02,Not a number\n"
+            "7,Rent,2025-10-03,\"Multi\nline\"\n"
+            "3,Food,2025-10-04\n".encode("utf-8")
+        )
+        report = self.controller.import_csv(upload, chunk_size=1)
+        
+        self.assertEqual((report['rows'], report['inserted'], report['failed'], report['chunks']), (6, 3, 3, 3))
+        self.assertEqual([error['line'] for error in report['errors']], [3, 4, 6])
+        self.assertFalse(report['errors_truncated'])
+        self.assertEqual(self.controller.get_category_totals("2025-10"), {"Food": 15.5, "Rent": 7.0})
+        self.assertEqual(self.controller.filter_expenses(category="rent")[0].description, "Multi\nline")
+    
+    def test_import_csv_round_trips_export(self):
+        """Test a file produced by export_to_csv imports into a fresh ledger"""
+        self.controller.add_expense(50.0, "Groceries", "2025-10-24", "Shopping, weekly")
+        copy = SpendController()
+        report = copy.import_csv(io.StringIO(self.controller.export_to_csv(), newline=""))
+        
+        self.assertEqual(report['inserted'], 1)
+        self.assertEqual(copy.get_all_expenses()[0].description, "Shopping, weekly")
+        with self.assertRaises(ValueError):
+            copy.import_csv(io.BytesIO(b"Date,Description\n2025-10-01,x\n"))
+    
+    def test_version_bumps_on_mutations_only(self):
+        """Test the version advances after each change and stays put for reads and misses"""
+        record = self.controller.add_expense(10.0, "Food", "2025-10-01", "Lunch")
+        self.controller.add_expenses([{"amount": 5.0, "category": "Food", "date": "2025-10-02"}])
+        self.assertEqual(self.controller.version, 2)
+        
+        self.controller.get_all_expenses()
+        self.controller.get_spending_statistics()
+        self.assertIsNone(self.controller.update_expense("ffffffff", amount=1.0))
+        self.assertEqual(self.controller.delete_where(month="2024-01"), 0)
+        self.assertEqual(self.controller.version, 2)
+        
+        self.controller.update_expense(record.id, amount=12.0)
+        self.controller.delete_expense(record.id)
+        self.controller.delete_where(month="2025-10")
+        self.assertEqual(self.controller.version, 5)
+    
+    def test_dashboard_snapshot(self):
+        """Test get_dashboard summarizes one month with its page, stats and history"""
+        self.controller.add_expenses([
+            {"amount": 30.0, "category": "Rent", "date": "2025-01-03"},
+            {"amount": 5.0, "category": "Food", "date": "2025-01-09"},
+            {"amount": 20.0, "category": "Food", "date": "2024-12-31"},
+            {"amount": 1.0, "category": "Food", "date": "2025-02-01"}
+        ])
+        
+        dashboard = self.controller.get_dashboard("2025-1", limit=1)
+        self.assertEqual(dashboard['month'], "2025-01")
+        self.assertEqual(dashboard['version'], 1)
+        self.assertEqual([e.date for e in dashboard['expenses']], ["2025-01-03"])
+        self.assertIsNotNone(dashboard['next_cursor'])
+        self.assertEqual(dashboard['stats'], {'total': 35.0, 'count': 2, 'days_in_month': 31, 'previous_total': 20.0})
+        self.assertEqual(list(dashboard['categories']), ["Rent", "Food"])
+        
+        history = dashboard['history']
+        self.assertEqual([h['month'] for h in history], ["2024-08", "2024-09", "2024-10", "2024-11", "2024-12", "2025-01"])
+        self.assertEqual((history[-2]['total'], history[-2]['count']), (20.0, 1))
+        self.assertEqual(history[-1]['categories'], {"Rent": 30.0, "Food": 5.0})
+        with self.assertRaises(ValueError):
+            self.controller.get_dashboard("January")
+    
+    def test_listeners_receive_change_events(self):
+        """Test every mutation notifies listeners with its version, details and new month rollups"""
+        events = []
+        self.controller.add_listener(events.append)
+        
+        record = self.controller.add_expense(10.0, "Food", "2025-10-01", "Lunch")
+        self.controller.update_expense(record.id[:8], amount=12.0, date="2025-11-01")
+        self.controller.add_expenses([{"amount": 3.0, "category": "Fuel", "date": "2025-11-05"}])
+        self.controller.delete_expense(record.id)
+        self.controller.delete_where(category="fuel")
+        
+        self.assertEqual([(e['version'], e['op'], e['count']) for e in events],
+                         [(1, 'add', 1), (2, 'update', 1), (3, 'add', 1), (4, 'delete', 1), (5, 'delete_where', 1)])
+        self.assertEqual(events[0]['expenses'][0]['id'], record.id)
+        self.assertEqual(events[1]['ids'], [record.id])
+        self.assertEqual(events[1]['changes'], {'amount': 12.0, 'date': '2025-11-01'})
+        self.assertEqual([m['month'] for m in events[1]['rollups']['months']], ["2025-10", "2025-11"])
+        self.assertEqual(events[2]['rollups']['months'][0],
+                         {'month': "2025-11", 'total': 15.0, 'count': 2, 'categories': {"Food": 12.0, "Fuel": 3.0}})
+        self.assertEqual(events[4]['filters'], {'category': "fuel", 'date_from': None, 'date_to': None})
+        self.assertEqual((events[4]['rollups']['total'], events[4]['rollups']['count']), (0.0, 0))
+    
+    def test_listeners_run_outside_write_lock(self):
+        """Test events are summarized for the affected months only, after the write lock is released"""
+        for date in ("2025-01-10", "2025-02-10", "2025-03-10"):
+            self.controller.add_expense(5.0, "Food", date)
+        self.controller.add_expense(7.0, "Rent", "2025-02-11")
+        
+        lock_free = []
+        def probe():
+            acquired = self.controller._write_lock.acquire(blocking=False)
+            lock_free.append(acquired)
+            if acquired:
+                self.controller._write_lock.release()
+        
+        def listener(event):
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+        
+        events = []
+        self.controller.add_listener(listener)
+        self.controller.add_listener(events.append)
+        rollup = self.controller._expense_ledger.rollup
+        with patch.object(rollup, 'monthly_totals', side_effect=AssertionError("scanned every month")):
+            self.controller.delete_where(category="rent")
+            self.controller.add_expense(1.0, "Food", "2025-03-01")
+        
+        self.assertEqual(lock_free, [True, True])
+        self.assertEqual(events[0]['rollups']['months'],
+                         [{'month': "2025-02", 'total': 5.0, 'count': 1, 'categories': {"Food": 5.0}}])
+        self.assertEqual([m['month'] for m in events[1]['rollups']['months']], ["2025-03"])
+    
     def test_empty_expenses_list(self):
         """Test controller with no expenses"""
         expenses = self.controller.get_all_expenses()
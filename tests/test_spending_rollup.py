@@ -0,0 +1,86 @@
+"""
+Unit tests for SpendingRollup running totals
+"""
+import unittest
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from models.spending_rollup import SpendingRollup, month_of_day
+
+
+def day(value):
+    """Helper to turn a YYYY-MM-DD string into a day ordinal"""
+    return date.fromisoformat(value).toordinal()
+
+
+class TestSpendingRollup(unittest.TestCase):
+    """Test cases for SpendingRollup"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.rollup = SpendingRollup()
+        self.rollup.add(day("2025-10-01"), "Food", 10.0)
+        self.rollup.add(day("2025-10-01"), "Rent", 500.0)
+        self.rollup.add(day("2025-11-03"), "Food", 20.0)
+    
+    def test_totals(self):
+        """Test overall total and count"""
+        self.assertEqual(self.rollup.total, 530.0)
+        self.assertEqual(self.rollup.count, 3)
+    
+    def test_monthly_totals_are_chronological(self):
+        """Test monthly totals come back in month order"""
+        self.rollup.add(day("2025-09-15"), "Food", 5.0)
+        self.assertEqual(list(self.rollup.monthly_totals().items()),
+                         [("2025-09", 5.0), ("2025-10", 510.0), ("2025-11", 20.0)])
+    
+    def test_category_totals_by_month(self):
+        """Test category totals for one month and across all months"""
+        self.assertEqual(self.rollup.category_totals("2025-10"), {"Food": 10.0, "Rent": 500.0})
+        self.assertEqual(self.rollup.category_totals(), {"Food": 30.0, "Rent": 500.0})
+        self.assertEqual(self.rollup.category_totals("2024-01"), {})
+    
+    def test_daily_totals(self):
+        """Test day totals overall and restricted to a month"""
+        self.assertEqual(self.rollup.daily_totals(), {"2025-10-01": 510.0, "2025-11-03": 20.0})
+        self.assertEqual(self.rollup.daily_totals("2025-11"), {"2025-11-03": 20.0})
+        self.assertEqual(self.rollup.daily_totals("2025-12"), {})
+    
+    def test_remove_drops_empty_buckets(self):
+        """Test removing the last row of a bucket removes the bucket entirely"""
+        self.rollup.remove(day("2025-11-03"), "Food", 20.0)
+        
+        self.assertNotIn("2025-11", self.rollup.monthly_totals())
+        self.assertEqual(self.rollup.category_totals("2025-11"), {})
+        self.assertEqual(self.rollup.category_totals(), {"Food": 10.0, "Rent": 500.0})
+    
+    def test_remove_many_matches_individual_removes(self):
+        """Test a batched withdrawal leaves the same totals as one remove per row"""
+        self.rollup.remove_many([(day("2025-10-01"), "Food", 10.0), (day("2025-10-01"), "Rent", 500.0)])
+        
+        self.assertEqual(self.rollup.total, 20.0)
+        self.assertEqual(self.rollup.count, 1)
+        self.assertEqual(self.rollup.monthly_totals(), {"2025-11": 20.0})
+    
+    def test_empty_rollup_resets_to_zero(self):
+        """Test removing every row leaves an exact zero total"""
+        rollup = SpendingRollup()
+        rollup.add(day("2025-10-01"), "Food", 0.1)
+        rollup.add(day("2025-10-01"), "Food", 0.2)
+        rollup.remove(day("2025-10-01"), "Food", 0.1)
+        rollup.remove(day("2025-10-01"), "Food", 0.2)
+        
+        self.assertEqual(rollup.total, 0.0)
+        self.assertEqual(rollup.monthly_totals(), {})
+    
+    def test_month_of_day(self):
+        """Test month labels are zero padded"""
+        self.assertEqual(month_of_day(day("2025-03-09")), "2025-03")
+
+
+if __name__ == '__main__':
+    unittest.main()
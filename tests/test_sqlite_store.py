@@ -0,0 +1,208 @@
+"""
+Unit tests for the SQLite storage backend
+"""
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from storage.sqlite_store import SQLiteStorage
+from models.columnar_ledger import AmbiguousIdError
+from controllers.spend_controller import SpendController
+from controllers.sense_controller import SenseController
+
+
+class TestSQLiteLedger(unittest.TestCase):
+    """Test cases for SQLiteLedger behind SpendController"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.directory.name) / 'spendsense.db')
+        self.storage = SQLiteStorage(self.path)
+        self.controller = SpendController(self.storage.ledger)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.storage.close()
+        self.directory.cleanup()
+    
+    def reopen(self) -> SpendController:
+        """Close the database and open it again, as a restart would"""
+        self.storage.close()
+        self.storage = SQLiteStorage(self.path)
+        return SpendController(self.storage.ledger)
+    
+    def test_expenses_survive_restart(self):
+        """Test added expenses are read back after reopening the database"""
+        record = self.controller.add_expense(42.5, "Food", "2025-10-24", "Lunch")
+        
+        controller = self.reopen()
+        restored = controller.get_expense_by_id(record.id)
+        self.assertEqual(restored.to_dict(), record.to_dict())
+    
+    def test_data_version_tracks_other_connections(self):
+        """Test the data version moves on commits from another connection but not on its own"""
+        before = self.storage.data_version
+        self.controller.add_expense(1.0, "Food", "2025-10-24", "own write")
+        self.assertEqual(self.storage.data_version, before)
+        
+        other = SQLiteStorage(self.path)
+        try:
+            SpendController(other.ledger).add_expense(2.0, "Food", "2025-10-24", "other process")
+        finally:
+            other.close()
+        self.assertNotEqual(self.storage.data_version, before)
+    
+    def test_uses_wal_journal(self):
+        """Test the database is opened in WAL mode"""
+        self.assertEqual(self.storage.query("PRAGMA journal_mode")[0][0], "wal")
+    
+    def test_update_and_delete(self):
+        """Test partial updates and deletes are persisted"""
+        first = self.controller.add_expense(10.0, "Food", "2025-10-24", "Lunch")
+        second = self.controller.add_expense(20.0, "Rent", "2025-10-01", "October")
+        
+        self.controller.update_expense(first.id[:8], category="Dining")
+        self.assertTrue(self.controller.delete_expense(second.id))
+        
+        controller = self.reopen()
+        remaining = controller.get_all_expenses()
+        self.assertEqual(len(remaining), 1)
+        self.assertEqual(remaining[0].category, "Dining")
+        self.assertEqual(remaining[0].amount, 10.0)
+        self.assertFalse(controller.delete_expense(second.id))
+    
+    def test_ambiguous_prefix_is_reported(self):
+        """Test a prefix shared by two rows raises instead of picking one"""
+        self.storage.ledger.add(1.0, "Food", "2025-10-24", "a", transaction_id="abcd0000-0000-4000-8000-000000000001")
+        self.storage.ledger.add(1.0, "Food", "2025-10-24", "b", transaction_id="abcd0000-0000-4000-8000-000000000002")
+        
+        with self.assertRaises(AmbiguousIdError):
+            self.controller.get_expense_by_id("abcd")
+        self.assertIsNone(self.controller.get_expense_by_id("ffff"))
+    
+    def test_filters_match_in_memory_ledger(self):
+        """Test SQL filters return the same rows as the columnar ledger"""
+        memory = SpendController()
+        for day in range(1, 29):
+            category = "Food" if day % 7 else "RENT"
+            for controller in (self.controller, memory):
+                controller.add_expense(float(day), category, f"2025-10-{day:02d}", str(day))
+        
+        for criteria in ({'category': 'rent'},
+                         {'date_from': '2025-10-06', 'date_to': '2025-10-08'},
+                         {'category': 'food', 'date_from': '2025-10-20'}):
+            expected = [record.description for record in memory.filter_expenses(**criteria)]
+            actual = [record.description for record in self.controller.filter_expenses(**criteria)]
+            self.assertEqual(actual, expected)
+    
+    def test_pages_match_in_memory_ledger(self):
+        """Test keyset pages come back in the same (date, ID) order as the columnar ledger"""
+        for index in range(12):
+            self.controller.add_expense(1.0, "Food", f"2025-10-0{index % 4 + 1}", str(index))
+        # Copy the rows with their IDs so both ledgers order identically
+        memory = SpendController()
+        for record in self.controller.get_all_expenses():
+            memory._expense_ledger.add(record.amount, record.category, record.date, record.description,
+                                       transaction_id=record.id)
+        
+        def walk(controller):
+            seen, cursor = [], None
+            while True:
+                page, cursor = controller.page_expenses(limit=5, cursor=cursor, date_from="2025-10-02")
+                seen.append([record.id for record in page])
+                if cursor is None:
+                    return seen
+        
+        self.assertEqual(walk(self.controller), walk(memory))
+        self.assertEqual(sum(len(page) for page in walk(self.controller)), 9)
+    
+    def test_add_many_survives_restart(self):
+        """Test bulk inserts are written in one batch and read back after reopening"""
+        created, errors = self.controller.add_expenses(
+            [{'amount': float(day), 'category': 'Food', 'date': f'2025-10-{day:02d}'} for day in range(1, 11)]
+        )
+        self.assertEqual(errors, [])
+        
+        controller = self.reopen()
+        self.assertEqual([record.id for record in controller.get_all_expenses()], [record.id for record in created])
+        self.assertEqual(controller.get_spending_statistics()['total'], 55.0)
+    
+    def test_delete_where_matches_in_memory_ledger(self):
+        """Test filtered deletes remove the same rows as the columnar ledger"""
+        memory = SpendController()
+        for day in range(1, 29):
+            for controller in (self.controller, memory):
+                controller.add_expense(float(day), "Food" if day % 7 else "Rent", f"2025-10-{day:02d}", str(day))
+        
+        for controller in (self.controller, memory):
+            self.assertEqual(controller.delete_where(category="food", date_from="2025-10-10"), 16)
+        
+        controller = self.reopen()
+        self.assertEqual([e.description for e in controller.get_all_expenses()],
+                         [e.description for e in memory.get_all_expenses()])
+        self.assertEqual(controller.get_category_totals(), memory.get_category_totals())
+    
+    def test_invalid_filter_date_raises(self):
+        """Test malformed date bounds raise ValueError"""
+        with self.assertRaises(ValueError):
+            self.controller.filter_expenses(date_from="10/01/2025")
+    
+    def test_aggregates_pushed_down(self):
+        """Test statistics and totals are computed by the database"""
+        self.controller.add_expense(10.0, "Food", "2025-09-30", "a")
+        self.controller.add_expense(15.0, "Food", "2025-10-01", "b")
+        self.controller.add_expense(5.0, "food", "2025-10-01", "c")
+        
+        stats = self.controller.get_spending_statistics()
+        self.assertEqual(stats['total'], 30.0)
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(stats['by_date'], {'2025-09-30': 10.0, '2025-10-01': 20.0})
+        self.assertEqual(self.controller.get_monthly_totals(), {'2025-09': 10.0, '2025-10': 20.0})
+        self.assertEqual(self.storage.ledger.rollup.monthly_total('2025-10'), 20.0)
+        self.assertEqual(self.storage.ledger.rollup.monthly_total('2025-11'), 0)
+        self.assertEqual(self.controller.get_category_totals('2025-10'), {'Food': 15.0, 'food': 5.0})
+        self.assertEqual(self.controller.get_category_counts(), [{'category': 'Food', 'count': 3}])
+    
+    def test_batch_rolls_back_on_error(self):
+        """Test a failed batch leaves no partial writes behind"""
+        with self.assertRaises(ValueError):
+            with self.controller.batch():
+                self.controller.add_expense(1.0, "Food", "2025-10-24", "kept?")
+                self.controller.add_expense(1.0, "Food", "not-a-date", "bad")
+        
+        self.assertEqual(self.controller.get_all_expenses(), [])
+
+
+class TestSQLiteBudgetStore(unittest.TestCase):
+    """Test cases for budget persistence through SenseController"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.storage = SQLiteStorage(':memory:')
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.storage.close()
+    
+    def test_budgets_written_through(self):
+        """Test created, updated and deleted budgets are mirrored to the store"""
+        controller = SenseController(self.storage.budgets)
+        overall = controller.set_budget(2000.0, "2025-10")
+        controller.set_budget(400.0, "2025-10", "Food")
+        controller.set_budget(450.0, "2025-10", "Food")
+        controller.delete_budget(overall.id)
+        
+        restored = SenseController(self.storage.budgets)
+        budgets = restored.get_budgets_by_month("2025-10")
+        self.assertEqual(len(budgets), 1)
+        self.assertEqual(restored.get_budget("2025-10", "Food").amount, 450.0)
+        self.assertIsNone(restored.get_budget("2025-10"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -86,6 +86,36 @@ class TestTransaction(unittest.TestCase):
         self.assertIsNotNone(minimal_transaction.id)
         self.assertEqual(minimal_transaction.description, "")
     
+    def test_transaction_has_no_instance_dict(self):
+        """Test transactions are slotted and reject unknown attributes"""
+        self.assertFalse(hasattr(self.transaction, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.transaction.tags = ["food"]
+    
+    def test_transaction_id_is_canonical_uuid(self):
+        """Test generated IDs render as version 4 UUID strings"""
+        transaction_id = self.transaction.id
+        self.assertEqual(len(transaction_id), 36)
+        self.assertEqual(transaction_id[14], '4')
+        self.assertEqual(transaction_id, self.transaction.id)
+    
+    def test_transaction_created_at_from_epoch(self):
+        """Test epoch creation times render as ISO timestamps"""
+        transaction = Transaction(1.0, "Food", "2025-10-24", "Snack", created_at=0.0)
+        self.assertEqual(transaction.created_at, datetime.fromtimestamp(0.0).isoformat())
+    
+    def test_to_dict_tracks_setters(self):
+        """Test every serialized form is a fresh dict reflecting property changes"""
+        first = self.transaction.to_dict()
+        first['amount'] = -1
+        self.assertEqual(self.transaction.to_dict()['amount'], 50.99)
+        
+        self.transaction.amount = 12.00
+        self.transaction.description = "Snacks"
+        serialized = self.transaction.to_dict()
+        self.assertEqual(serialized['amount'], 12.00)
+        self.assertEqual(serialized['description'], "Snacks")
+    
     def test_transaction_properties_are_read_only(self):
         """Test that id and created_at cannot be directly modified"""
         with self.assertRaises(AttributeError):
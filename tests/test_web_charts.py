@@ -0,0 +1,109 @@
+"""
+Unit tests for the templated web chart renderers
+"""
+import unittest
+import struct
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from views import web_charts
+from views.web_charts import render_chart
+
+PNG_SIGNATURE = b'\x89PNG'
+
+
+class TestWebCharts(unittest.TestCase):
+    """Test cases for the web chart templates"""
+    
+    def test_charts_render_png(self):
+        """Test every chart kind and its empty state renders a PNG"""
+        for kind, data in web_charts.WARM_UP_DATA.items():
+            self.assertTrue(render_chart(kind, data).startswith(PNG_SIGNATURE))
+        
+        empty_states = {
+            'category': {'categories': {}, 'title': 'Spending by Category'},
+            'budget': {'total_spent': 0, 'total_budget': 0, 'total_remaining': 0, 'categories': {}},
+            'monthly-trend': {'periods': [], 'spent': [], 'budget': []}
+        }
+        for kind, data in empty_states.items():
+            self.assertTrue(render_chart(kind, data).startswith(PNG_SIGNATURE))
+        
+        with self.assertRaises(ValueError):
+            render_chart('unknown', {})
+        with self.assertRaises(ValueError):
+            render_chart('category', web_charts.WARM_UP_DATA['category'], fmt='gif')
+    
+    def test_formats_and_geometry(self):
+        """Test SVG and WebP output and that size * dpi sets the pixel dimensions"""
+        data = web_charts.WARM_UP_DATA['monthly-trend']
+        self.assertIn(b'<svg', render_chart('monthly-trend', data, fmt='svg'))
+        webp = render_chart('monthly-trend', data, fmt='webp')
+        self.assertEqual((webp[:4], webp[8:12]), (b'RIFF', b'WEBP'))
+        
+        thumbnail = render_chart('monthly-trend', data, size=(12, 6), dpi=20)
+        self.assertEqual(struct.unpack('>II', thumbnail[16:24]), (240, 120))
+        # The template returns to its default size when none is given
+        default = render_chart('monthly-trend', data)
+        self.assertEqual(struct.unpack('>II', default[16:24]), (1200, 600))
+    
+    def test_template_reused_without_leftover_artists(self):
+        """Test repeat renders reuse one figure and replace only the data artists"""
+        def budget(names):
+            return {'total_spent': 50.0, 'total_budget': 100.0, 'total_remaining': 50.0,
+                    'categories': {name: {'budget': 20.0, 'spent': 10.0} for name in names}}
+        
+        render_chart('budget', budget(['Food', 'Rent', 'Fun']))
+        template = web_charts._templates['budget']
+        figure = template.figure
+        self.assertEqual(len(template.compare_axes.patches), 6)
+        
+        render_chart('budget', budget(['Food']))
+        self.assertIs(web_charts._templates['budget'].figure, figure)
+        self.assertEqual(len(template.compare_axes.patches), 2)
+        self.assertEqual([label.get_text() for label in template.compare_axes.get_xticklabels()], ['Food'])
+        
+        render_chart('budget', budget([]))
+        self.assertEqual(len(template.compare_axes.patches), 0)
+        self.assertFalse(template.compare_axes.axison)
+    
+    def test_category_skips_non_positive_wedges(self):
+        """Test refunds, zeros and NaN sums are left out of the pie instead of failing the render"""
+        render_chart('category', {'categories': {'Food': 30.0, 'Refunds': -12.5, 'Rent': 0.0, 'Odd': float('nan')},
+                                  'title': 'Spending by Category'})
+        template = web_charts._templates['category']
+        self.assertEqual([text.get_text() for text in template.axes.texts if '%' not in text.get_text()], ['Food'])
+        
+        # With nothing left to draw, the empty-state message is shown instead
+        message = render_chart('category', {'categories': {}, 'title': 'Spending by Category'})
+        self.assertEqual(render_chart('category', {'categories': {'Refunds': -5.0}, 'title': 'Spending by Category'}),
+                         message)
+    
+    def test_failed_draw_does_not_break_later_renders(self):
+        """Test a render that raises mid-draw leaves the template usable"""
+        data = web_charts.WARM_UP_DATA['category']
+        render_chart('category', data)
+        template = web_charts._templates['category']
+        with patch.object(template.axes, 'pie', side_effect=RuntimeError("draw failed")):
+            with self.assertRaises(RuntimeError):
+                render_chart('category', data)
+        self.assertTrue(render_chart('category', data).startswith(PNG_SIGNATURE))
+        self.assertEqual(len(template.axes.patches), len(data['categories']))
+    
+    def test_trend_shades_only_overspent_periods(self):
+        """Test overspending spans follow the latest series"""
+        render_chart('monthly-trend', {'periods': ['2024-01', '2024-02', '2024-03'],
+                                       'spent': [120, 80, 130], 'budget': [100, 100, 100]})
+        template = web_charts._templates['monthly-trend']
+        self.assertEqual(len(template.axes.patches), 2)
+        
+        render_chart('monthly-trend', {'periods': ['2024-04'], 'spent': [50], 'budget': [100]})
+        self.assertEqual(len(template.axes.patches), 0)
+        self.assertEqual(list(template.axes.lines[0].get_xdata()), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()